@@ -0,0 +1,475 @@
+# Tìm kiếm trên đồ thị: bản Python của BTTH1_BFSvaAstar.cpp (BFS, A*) cho đồ thị lớn.
+#   python BTTH1_BFSvaAstar.py                                  (nhập từ bàn phím như chương trình C++)
+#   python BTTH1_BFSvaAstar.py canh.txt --algorithm astar --heuristic h.txt --source 0 --target 5
+#   python BTTH1_BFSvaAstar.py canh.txt --algorithm bidirectional --source 0 --target 5
+#   python BTTH1_BFSvaAstar.py canh.txt --queries truy_van.txt --workers 4   (mỗi dòng "nguồn đích")
+#   python BTTH1_BFSvaAstar.py canh.txt --save do_thi.csr                    (lần sau đọc do_thi.csr)
+# Tệp cạnh: mỗi dòng "u v" hoặc "u v w" (w là trọng số), dòng bắt đầu bằng # hoặc % là chú thích.
+# Đồ thị được lưu dạng CSR: offsets[v]..offsets[v + 1] là đoạn các cạnh ra của v trong targets (và weights),
+# tất cả là array phẳng (4 byte mỗi cạnh, thêm 8 byte nếu có trọng số), không có list/dict cho từng đỉnh.
+# So với bản C++: có trọng số cạnh, A* có tập đóng và dừng ngay khi lấy đích ra khỏi hàng đợi,
+# có BFS hai chiều, và nhiều truy vấn dùng chung một đồ thị đã nạp (mỗi nguồn chỉ duyệt một lần).
+import argparse
+import collections
+import heapq
+import itertools
+import multiprocessing
+import sys
+from array import array
+
+# Kích thước mỗi khối đọc tệp cạnh
+READ_CHUNK = 1 << 20
+
+CSR_MAGIC = b"CSR1"
+
+class Graph:
+    def __init__(self, offsets, targets, weights=None, directed=False):
+        self.offsets = offsets      # array('q'), n + 1 phần tử
+        self.targets = targets      # array('i'), đỉnh cuối của từng cạnh
+        self.weights = weights      # array('d') hoặc None (mọi cạnh có chi phí 1)
+        self.directed = directed
+        self.reversed = None        # đồ thị cạnh ngược, dựng khi cần (BFS hai chiều trên đồ thị có hướng)
+
+    @property
+    def num_vertices(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    # Dựng CSR từ các mảng cạnh bằng sắp xếp đếm theo đỉnh đầu (giữ thứ tự cạnh trong tệp).
+    # Đồ thị vô hướng lưu mỗi cạnh theo cả hai chiều như G[x], G[y] của bản C++
+    @classmethod
+    def from_edges(cls, num_vertices, sources, targets, weights=None, directed=False):
+        if len(sources) != len(targets) or (weights is not None and len(weights) != len(sources)):
+            raise ValueError("Các mảng cạnh không cùng độ dài")
+        if sources and (min(min(sources), min(targets)) < 0
+                        or max(max(sources), max(targets)) >= num_vertices):
+            raise ValueError(f"Có đỉnh nằm ngoài khoảng 0..{num_vertices - 1}")
+        edges = [(sources, targets, weights)]
+        if not directed:
+            edges.append((targets, sources, weights))
+        degrees = [0] * num_vertices
+        for part_sources, _, _ in edges:
+            for u in part_sources:
+                degrees[u] += 1
+        offsets = array("q", itertools.accumulate(degrees, initial=0))
+        position = degrees   # dùng lại làm vị trí ghi tiếp theo của từng đỉnh
+        position[:] = offsets[:-1]
+        adjacency = array("i", bytes(4 * offsets[-1]))
+        costs = None if weights is None else array("d", bytes(8 * offsets[-1]))
+        for part_sources, part_targets, part_weights in edges:
+            if costs is None:
+                for u, v in zip(part_sources, part_targets):
+                    adjacency[position[u]] = v
+                    position[u] += 1
+            else:
+                for u, v, w in zip(part_sources, part_targets, part_weights):
+                    i = position[u]
+                    adjacency[i] = v
+                    costs[i] = w
+                    position[u] = i + 1
+        return cls(offsets, adjacency, costs, directed)
+
+    # Các cạnh ra của v: (đoạn đỉnh kề, đoạn trọng số hoặc None)
+    def neighbors(self, v):
+        start, stop = self.offsets[v], self.offsets[v + 1]
+        return self.targets[start:stop], None if self.weights is None else self.weights[start:stop]
+
+    # Mảng đỉnh đầu của từng cạnh (khôi phục từ offsets)
+    def sources(self):
+        offsets = self.offsets
+        return array("i", itertools.chain.from_iterable(
+            itertools.repeat(v, offsets[v + 1] - offsets[v]) for v in range(self.num_vertices)))
+
+    # Đồ thị với mọi cạnh đổi chiều; đồ thị vô hướng là chính nó
+    def reverse(self):
+        if not self.directed:
+            return self
+        if self.reversed is None:
+            self.reversed = Graph.from_edges(self.num_vertices, self.targets, self.sources(), self.weights,
+                                             directed=True)
+        return self.reversed
+
+    # Tệp nhị phân: CSR_MAGIC, cờ (bit 0: có hướng, bit 1: có trọng số, 4 byte), n, m (8 byte mỗi số),
+    # rồi offsets, targets, weights (little-endian); đọc lại bằng fromfile, không phải phân tích văn bản
+    def save(self, path):
+        flags = int(self.directed) | (self.weights is not None) << 1
+        arrays = [self.offsets, self.targets] + ([self.weights] if self.weights is not None else [])
+        with open(path, "wb") as file:
+            file.write(CSR_MAGIC + flags.to_bytes(4, "little") + self.num_vertices.to_bytes(8, "little")
+                       + self.num_edges.to_bytes(8, "little"))
+            for data in arrays:
+                if sys.byteorder != "little":
+                    data = array(data.typecode, data)
+                    data.byteswap()
+                data.tofile(file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            header = file.read(24)
+            if header[:4] != CSR_MAGIC:
+                raise ValueError(f"Tệp {path} không phải đồ thị CSR")
+            flags = int.from_bytes(header[4:8], "little")
+            num_vertices = int.from_bytes(header[8:16], "little")
+            num_edges = int.from_bytes(header[16:24], "little")
+            arrays = []
+            for typecode, count in (("q", num_vertices + 1), ("i", num_edges), ("d", num_edges)):
+                if typecode == "d" and not flags & 2:
+                    arrays.append(None)
+                    continue
+                data = array(typecode)
+                data.fromfile(file, count)
+                if sys.byteorder != "little":
+                    data.byteswap()
+                arrays.append(data)
+        return cls(*arrays, directed=bool(flags & 1))
+
+# Đọc tệp cạnh theo từng khối byte. Số cột (2 hoặc 3) lấy theo dòng dữ liệu đầu tiên;
+# số đỉnh mặc định là đỉnh lớn nhất + 1
+def read_edges(path, num_vertices=None, directed=False, chunk_size=READ_CHUNK):
+    sources = array("i")
+    targets = array("i")
+    weights = None
+    columns = None
+    with open(path, "rb") as file:
+        rest = b""
+        while True:
+            chunk = file.read(chunk_size)
+            block = rest + chunk
+            if chunk:
+                cut = block.rfind(b"\n") + 1
+                block, rest = block[:cut], block[cut:]
+            if b"#" in block or b"%" in block:
+                block = b"\n".join(line for line in block.split(b"\n") if line.lstrip()[:1] not in (b"#", b"%"))
+            tokens = block.split()
+            if columns is None and tokens:
+                columns = len(block.lstrip().split(b"\n", 1)[0].split())
+                if columns not in (2, 3):
+                    raise ValueError("Mỗi dòng cạnh phải có dạng 'u v' hoặc 'u v w'")
+                if columns == 3:
+                    weights = array("d")
+            if tokens:
+                if len(tokens) % columns:
+                    raise ValueError(f"Các dòng cạnh phải cùng có {columns} cột")
+                sources.extend(map(int, tokens[0::columns]))
+                targets.extend(map(int, tokens[1::columns]))
+                if weights is not None:
+                    weights.extend(map(float, tokens[2::columns]))
+            if not chunk:
+                break
+    if num_vertices is None:
+        num_vertices = max(max(sources), max(targets)) + 1 if sources else 0
+    return Graph.from_edges(num_vertices, sources, targets, weights, directed)
+
+def load_graph(path, num_vertices=None, directed=False):
+    if str(path).endswith(".csr"):
+        return Graph.load(path)
+    return read_edges(path, num_vertices, directed)
+
+# Giá trị heuristic của từng đỉnh, mỗi số cách nhau bởi khoảng trắng (như phần nhập H của bản C++)
+def read_heuristic(path):
+    with open(path, "rb") as file:
+        return array("d", map(float, file.read().split()))
+
+# Kết quả tìm kiếm từ một (hoặc nhiều) nguồn: mảng khoảng cách và đỉnh cha theo đỉnh,
+# -1 là chưa gặp (đỉnh nguồn cũng có cha -1)
+class SearchResult:
+    def __init__(self, distance, parent, expanded):
+        self.distance = distance    # số cạnh với BFS, tổng trọng số với A*
+        self.parent = parent
+        self.expanded = expanded    # số đỉnh đã lấy ra để mở rộng
+
+    def reached(self, v):
+        return self.distance[v] >= 0
+
+    def cost(self, v):
+        return self.distance[v] if self.distance[v] >= 0 else None
+
+    # Đường đi từ nguồn đến target, None nếu chưa gặp target
+    def path(self, target):
+        if not self.reached(target):
+            return None
+        path = []
+        x = target
+        while x != -1:
+            path.append(x)
+            x = self.parent[x]
+        path.reverse()
+        return path
+
+def as_sources(source):
+    return [source] if isinstance(source, int) else list(source)
+
+# BFS theo từng tầng (không xét trọng số), source là một đỉnh hoặc dãy đỉnh (BFS nhiều nguồn).
+# Có targets (một đỉnh hoặc dãy đỉnh) thì dừng sau tầng đã gặp đủ các đích.
+# Đánh dấu bằng bytearray và mảng phẳng thay cho dict: vòng lặp trong chỉ đọc seen[u]
+def bfs(graph, source, targets=None):
+    offsets, adjacency = graph.offsets, graph.targets
+    n = graph.num_vertices
+    seen = bytearray(n)
+    distance = array("i", [-1]) * n
+    parent = array("i", [-1]) * n
+    frontier = as_sources(source)
+    for v in frontier:
+        seen[v] = 1
+        distance[v] = 0
+    remaining = None if targets is None else {t for t in as_sources(targets) if not seen[t]}
+    expanded = 0
+    depth = 0
+    while frontier and remaining != set():
+        depth += 1
+        next_frontier = []
+        for v in frontier:
+            for u in adjacency[offsets[v]:offsets[v + 1]]:
+                if not seen[u]:
+                    seen[u] = 1
+                    distance[u] = depth
+                    parent[u] = v
+                    next_frontier.append(u)
+        expanded += len(frontier)
+        if remaining:
+            remaining.difference_update(next_frontier)
+        frontier = next_frontier
+    return SearchResult(distance, parent, expanded)
+
+# A* với tập đóng: mỗi đỉnh được mở rộng nhiều nhất một lần và tìm kiếm dừng ngay khi lấy target
+# ra khỏi hàng đợi. heuristic là dãy giá trị theo đỉnh, hàm của đỉnh, hoặc None (thành Dijkstra).
+# Trọng số phải không âm; kết quả tối ưu khi heuristic nhất quán: h(v) <= w(v, u) + h(u) với mọi cạnh
+def astar(graph, source, target=None, heuristic=None):
+    offsets, adjacency, weights = graph.offsets, graph.targets, graph.weights
+    n = graph.num_vertices
+    if heuristic is None:
+        h = lambda v: 0
+    elif callable(heuristic):
+        h = heuristic
+    else:
+        h = heuristic.__getitem__
+    closed = bytearray(n)
+    distance = array("d", [-1.0]) * n
+    parent = array("i", [-1]) * n
+    sources = as_sources(source)
+    for v in sources:
+        distance[v] = 0
+    # (f, -g, đỉnh): cùng f thì ưu tiên đỉnh đã đi xa hơn (gần đích hơn)
+    queue = [(h(v), 0, v) for v in sources]
+    heapq.heapify(queue)
+    expanded = 0
+    while queue:
+        _, g, v = heapq.heappop(queue)
+        if closed[v]:
+            continue    # bản ghi cũ của đỉnh đã được mở rộng với chi phí tốt hơn
+        closed[v] = 1
+        expanded += 1
+        if v == target:
+            break
+        g = -g
+        start, stop = offsets[v], offsets[v + 1]
+        if weights is None:
+            edges = zip(adjacency[start:stop], itertools.repeat(1))
+        else:
+            edges = zip(adjacency[start:stop], weights[start:stop])
+        for u, w in edges:
+            if closed[u]:
+                continue
+            cost = g + w
+            known = distance[u]
+            if known < 0 or cost < known:
+                distance[u] = cost
+                parent[u] = v
+                heapq.heappush(queue, (cost + h(u), -cost, u))
+    return SearchResult(distance, parent, expanded)
+
+# BFS hai chiều: mỗi bước mở rộng trọn một tầng của phía có biên nhỏ hơn (phía đích đi trên đồ thị
+# ngược); khi hai phía gặp nhau, đường ngắn nhất là đường tốt nhất qua các đỉnh gặp trong tầng đó.
+# Trả về (đường đi hoặc None, số đỉnh đã mở rộng)
+def bidirectional_bfs(graph, source, target):
+    if source == target:
+        return [source], 0
+    sides = [(graph.offsets, graph.targets, {source: -1}, {source: 0}),
+             (graph.reverse().offsets, graph.reverse().targets, {target: -1}, {target: 0})]
+    frontiers = [[source], [target]]
+    expanded = 0
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        offsets, adjacency, parent, distance = sides[side]
+        _, _, other_parent, other_distance = sides[1 - side]
+        best = None
+        next_frontier = []
+        for v in frontiers[side]:
+            depth = distance[v] + 1
+            for u in adjacency[offsets[v]:offsets[v + 1]]:
+                if u not in parent:
+                    parent[u] = v
+                    distance[u] = depth
+                    next_frontier.append(u)
+                    if u in other_parent and (best is None or depth + other_distance[u] < best[0]):
+                        best = (depth + other_distance[u], u)
+        expanded += len(frontiers[side])
+        frontiers[side] = next_frontier
+        if best is not None:
+            meet = best[1]
+            forward, backward = sides[0][2], sides[1][2]
+            path = []
+            x = meet
+            while x != -1:
+                path.append(x)
+                x = forward[x]
+            path.reverse()
+            x = backward[meet]
+            while x != -1:
+                path.append(x)
+                x = backward[x]
+            return path, expanded
+    return None, expanded
+
+# ---- Nhiều truy vấn trên cùng một đồ thị ----
+
+# Đồ thị và heuristic của mỗi tiến trình con, gán một lần trong init_worker
+WORKER = {}
+
+def init_worker(graph, algorithm, heuristic):
+    WORKER["graph"] = graph
+    WORKER["algorithm"] = algorithm
+    WORKER["heuristic"] = heuristic
+
+# Trả lời mọi truy vấn có cùng nguồn source: BFS duyệt một lần đến khi gặp đủ các đích,
+# A* và BFS hai chiều chạy riêng từng đích. Trả về danh sách (đích, khoảng cách, đường đi)
+def answer_source(graph, algorithm, heuristic, source, targets):
+    answers = []
+    if algorithm == "bfs":
+        result = bfs(graph, source, targets)
+        for target in targets:
+            answers.append((target, result.cost(target), result.path(target)))
+    elif algorithm == "astar":
+        for target in targets:
+            result = astar(graph, source, target, heuristic)
+            answers.append((target, result.cost(target), result.path(target)))
+    else:
+        for target in targets:
+            path, _ = bidirectional_bfs(graph, source, target)
+            answers.append((target, None if path is None else len(path) - 1, path))
+    return answers
+
+def source_task(item):
+    source, targets = item
+    return source, answer_source(WORKER["graph"], WORKER["algorithm"], WORKER["heuristic"], source, targets)
+
+# Trả lời các truy vấn (nguồn, đích) theo thứ tự; các truy vấn được gom theo nguồn.
+# "bfs" hợp với nhiều đích trên mỗi nguồn (một lần duyệt cho cả nhóm); các cặp rải rác trên đồ thị lớn
+# nên dùng "bidirectional", chỉ chạm một phần nhỏ đồ thị cho mỗi cặp.
+# workers > 1 chia các nguồn cho nhóm tiến trình, đồ thị được gửi sang mỗi tiến trình một lần
+def batch_queries(graph, queries, algorithm="bfs", heuristic=None, workers=None):
+    queries = list(queries)
+    groups = collections.defaultdict(list)
+    for source, target in queries:
+        groups[source].append(target)
+    if workers is not None and workers > 1:
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(graph, algorithm, heuristic)) as pool:
+            answered = dict(pool.imap_unordered(source_task, groups.items()))
+    else:
+        answered = {source: answer_source(graph, algorithm, heuristic, source, targets)
+                    for source, targets in groups.items()}
+    lookup = {}
+    for source, answers in answered.items():
+        for target, cost, path in answers:
+            lookup[source, target] = (cost, path)
+    return [(source, target) + lookup[source, target] for source, target in queries]
+
+def read_queries(path):
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            fields = line.split()
+            if fields and not fields[0].startswith("#"):
+                yield int(fields[0]), int(fields[1])
+
+def format_cost(cost):
+    return str(int(cost)) if cost == int(cost) else f"{cost:g}"
+
+def print_path(path):
+    if path is None:
+        print("NO path")
+    else:
+        print(" ".join(map(str, path)))
+
+# ---- Nhập từ bàn phím như BTTH1_BFSvaAstar.cpp ----
+
+def input_tokens():
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            return
+        yield from line.split()
+
+def interactive(source, target):
+    tokens = input_tokens()
+
+    def ask(prompt):
+        print(prompt, end="", flush=True)
+        return int(next(tokens))
+
+    n = ask("Nhập số đỉnh: ")
+    edges = ask("Nhập số cạnh: ")
+    print("Nhập vào danh sách các cạnh:")
+    pairs = array("i", (int(next(tokens)) for _ in range(2 * edges)))
+    graph = Graph.from_edges(n, pairs[0::2], pairs[1::2])
+    choice = ask("Chọn thuật toán tìm kiếm (1 - BFS, 2 - A*): ")
+    if choice == 1:
+        result = bfs(graph, source)
+    elif choice == 2:
+        print("Nhập giá trị heuristic cho từng đỉnh:")
+        heuristic = array("d", (float(next(tokens)) for _ in range(n)))
+        result = astar(graph, source, target, heuristic)
+    else:
+        print("Lựa chọn không hợp lệ!")
+        return
+    print(" ".join(map(format_cost, result.distance)))
+    print_path(result.path(target))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BFS, A* và BFS hai chiều trên đồ thị CSR")
+    parser.add_argument("graph", nargs="?", help="tệp cạnh hoặc tệp .csr (bỏ trống để nhập từ bàn phím)")
+    parser.add_argument("--directed", action="store_true", help="cạnh có hướng u -> v")
+    parser.add_argument("--vertices", type=int, default=None, help="số đỉnh (mặc định đỉnh lớn nhất + 1)")
+    parser.add_argument("--algorithm", default="bfs", choices=["bfs", "astar", "bidirectional"])
+    parser.add_argument("--heuristic", help="tệp giá trị heuristic của từng đỉnh cho A*")
+    parser.add_argument("--source", type=int, default=0)
+    parser.add_argument("--target", type=int, default=5)
+    parser.add_argument("--queries", help="tệp truy vấn, mỗi dòng 'nguồn đích'")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình cho các truy vấn")
+    parser.add_argument("--save", help="ghi đồ thị đã nạp ra tệp .csr")
+    args = parser.parse_args(argv)
+
+    if args.graph is None:
+        interactive(args.source, args.target)
+        return
+    graph = load_graph(args.graph, args.vertices, args.directed)
+    if args.save:
+        graph.save(args.save)
+        print(f"Đã ghi {graph.num_vertices} đỉnh, {graph.num_edges} cạnh vào {args.save}")
+        return
+    heuristic = read_heuristic(args.heuristic) if args.heuristic else None
+    if args.queries:
+        for source, target, cost, path in batch_queries(graph, read_queries(args.queries), args.algorithm,
+                                                        heuristic, args.workers):
+            if path is None:
+                print(f"{source} {target}: NO path")
+            else:
+                print(f"{source} {target}: {format_cost(cost)}: {' '.join(map(str, path))}")
+        return
+    if args.algorithm == "bidirectional":
+        path, _ = bidirectional_bfs(graph, args.source, args.target)
+        print_path(path)
+        return
+    if args.algorithm == "bfs":
+        result = bfs(graph, args.source, args.target)
+    else:
+        result = astar(graph, args.source, args.target, heuristic)
+    print(format_cost(result.distance[args.target]) if result.reached(args.target) else "NO path")
+    print_path(result.path(args.target))
+
+if __name__ == "__main__":
+    main()
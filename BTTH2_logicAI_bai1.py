@@ -1,84 +1,21 @@
-# Các lớp và hàm định nghĩa logic mệnh đề
-class Proposition:
-    def evaluate(self, **assignments):
-        raise NotImplementedError()
-
-class Variable(Proposition):
-    def __init__(self, name):
-        self.name = name
-
-    def evaluate(self, **assignments):
-        return assignments[self.name]
-
-    def __str__(self):
-        return self.name
-
-class Not(Proposition):
-    def __init__(self, child):
-        self.child = child
-
-    def evaluate(self, **assignments):
-        return not self.child.evaluate(**assignments)
-
-    def __str__(self):
-        return f"¬{self.child}"
-
-class And(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) and self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∧ {self.right})"
-
-class Or(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∨ {self.right})"
-
-class Implies(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return not self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} → {self.right})"
-
-# Hàm phân tích biểu thức logic từ chuỗi
-def parse_expression(expr_str):
-    expr_str = expr_str.replace(" ", "")  # Xóa khoảng trắng
-    stack = []
-    operators = {"¬": Not, "∧": And, "∨": Or, "→": Implies}
-
-    i = 0
-    while i < len(expr_str):
-        if expr_str[i].isalpha():  # Biến logic (A, B, C, ...)
-            stack.append(Variable(expr_str[i]))
-        elif expr_str[i] in operators:  # Toán tử logic
-            op = operators[expr_str[i]]
-            if expr_str[i] == "¬":  # Toán tử một ngôi
-                operand = stack.pop()
-                stack.append(op(operand))
-            else:  # Toán tử hai ngôi
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(op(left, right))
-        elif expr_str[i] == "(" or expr_str[i] == ")":
-            pass  # Bỏ qua dấu ngoặc (đã xử lý trong chuỗi)
-        i += 1
-    return stack.pop()
+import csv
+import os
+from itertools import islice
+
+# Các lớp logic mệnh đề và hàm phân tích biểu thức dùng chung nằm trong BTTH2_logicAI_core
+from BTTH2_logicAI_core import Constant, Variable, Not, And, Or, Implies, parse_expression
+
+# NumPy là tùy chọn: có thì các cột là mảng bool, không có thì đóng gói cột thành số nguyên
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Số dòng xử lý trong mỗi khối của evaluate_batch (giới hạn bộ nhớ dùng cùng lúc)
+BATCH_CHUNK_ROWS = 1 << 16
+
+# Các chuỗi được hiểu là True khi đọc cột từ tệp CSV
+TRUE_STRINGS = {"1", "true", "t", "yes", "y"}
 
 # Hàm tính giá trị biểu thức với các giá trị đầu vào
 def evaluate_expression(expr_str, assignments):
@@ -88,6 +25,104 @@ def evaluate_expression(expr_str, assignments):
     except Exception as e:
         return f"Lỗi khi đánh giá biểu thức: {e}"
 
+# Tính giá trị biểu thức trên cả một khối cột cùng lúc: mỗi nút (dùng chung thì chỉ một lần)
+# được tính bằng một phép toán vector &, |, phủ định trên toàn bộ cột.
+# constant(value) tạo cột hằng cùng độ dài với khối (khối có thể không có cột nào khi biểu thức chỉ có hằng)
+def evaluate_columns(expr, columns, negate, constant):
+    values = {}
+    stack = [expr]
+    while stack:
+        node = stack[-1]
+        if node in values:
+            stack.pop()
+            continue
+        if isinstance(node, Variable):
+            values[node] = columns[node.name]
+            stack.pop()
+            continue
+        if isinstance(node, Constant):
+            values[node] = constant(node.value)
+            stack.pop()
+            continue
+        children = [node.child] if isinstance(node, Not) else [node.left, node.right]
+        pending = [child for child in children if child not in values]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if isinstance(node, Not):
+            values[node] = negate(values[node.child])
+        elif isinstance(node, And):
+            values[node] = values[node.left] & values[node.right]
+        elif isinstance(node, Or):
+            values[node] = values[node.left] | values[node.right]
+        elif isinstance(node, Implies):
+            values[node] = negate(values[node.left]) | values[node.right]
+    return values[expr]
+
+# Đọc tệp CSV (dòng đầu là tên biến) thành từng khối cột, chỉ giữ các cột cần dùng.
+# Trả về lần lượt (số dòng của khối, dict cột)
+def read_csv_chunks(path, names, chunk_size):
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        missing = [name for name in names if name not in header]
+        if missing:
+            raise KeyError(f"Tệp {path} thiếu cột {missing}")
+        positions = [header.index(name) for name in names]
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield len(rows), {name: [row[p].strip().lower() in TRUE_STRINGS for row in rows]
+                              for name, p in zip(names, positions)}
+
+# Cắt các cột trong bộ nhớ thành từng khối (số dòng của khối, dict cột).
+# Số dòng là rows nếu có, nếu không thì lấy theo các cột đầu vào (kể cả cột biểu thức không dùng)
+def slice_columns(columns, names, chunk_size, rows=None):
+    if rows is None:
+        if not columns:
+            raise ValueError("Không có cột nào để xác định số dòng, hãy truyền rows")
+        rows = len(next(iter(columns.values())))
+    for name in names:
+        if len(columns[name]) != rows:
+            raise ValueError(f"Cột {name} có {len(columns[name])} dòng, cần {rows} dòng")
+    for start in range(0, rows, chunk_size):
+        yield min(chunk_size, rows - start), {name: columns[name][start:start + chunk_size] for name in names}
+
+# Tính biểu thức trên một khối: dùng mảng NumPy nếu có, nếu không thì đóng gói mỗi cột
+# thành một số nguyên (bit i là dòng i) và dùng phép toán bit của Python
+def evaluate_chunk(expr, length, chunk):
+    if np is not None:
+        columns = {name: np.asarray(column, dtype=bool) for name, column in chunk.items()}
+        return evaluate_columns(expr, columns, np.logical_not, lambda value: np.full(length, value, dtype=bool))
+    full = (1 << length) - 1
+    columns = {name: int("".join("1" if value else "0" for value in reversed(column)) or "0", 2)
+               for name, column in chunk.items()}
+    result = evaluate_columns(expr, columns, lambda value: full ^ value, lambda value: full if value else 0)
+    return [bit == "1" for bit in bin(result)[2:].zfill(length)[::-1]]
+
+# Tính biểu thức cho từng dòng của bảng cột, trả về lần lượt kết quả của từng khối.
+# columns là dict tên biến -> dãy giá trị True/False (list hoặc mảng NumPy) hoặc đường dẫn tệp CSV;
+# với tệp, mỗi lúc chỉ một khối nằm trong bộ nhớ. rows: số dòng khi columns không có cột nào
+def iter_evaluate_batch(expr, columns, chunk_size=BATCH_CHUNK_ROWS, rows=None):
+    if isinstance(expr, str):
+        expr = parse_expression(expr)
+    names = sorted(expr.variables())
+    if isinstance(columns, (str, os.PathLike)):
+        chunks = read_csv_chunks(columns, names, chunk_size)
+    else:
+        chunks = slice_columns(columns, names, chunk_size, rows)
+    for length, chunk in chunks:
+        yield evaluate_chunk(expr, length, chunk)
+
+# Tính biểu thức trên cả bảng cột, trả về mảng kết quả (mảng NumPy hoặc list)
+def evaluate_batch(expr, columns, chunk_size=BATCH_CHUNK_ROWS, rows=None):
+    results = list(iter_evaluate_batch(expr, columns, chunk_size, rows))
+    if np is not None:
+        return np.concatenate(results) if results else np.zeros(0, dtype=bool)
+    return [value for chunk in results for value in chunk]
+
 # Chương trình chính
 def main():
     # Nhập biểu thức logic
@@ -102,7 +137,7 @@ def main():
         return
 
     # Nhập các giá trị cho biến logic
-    variables = sorted({char for char in expr_str if char.isalpha()})  # Sắp xếp thứ tự chữ cái
+    variables = sorted(expression.variables())  # Sắp xếp thứ tự chữ cái
     print(f"Các biến trong biểu thức: {variables}")
     assignments = {}
     for var in variables:
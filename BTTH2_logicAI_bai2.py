@@ -1,114 +1,146 @@
+import sys
 from itertools import product
 
-# Các lớp và hàm định nghĩa logic mệnh đề
-class Proposition:
-    def evaluate(self, **assignments):
-        raise NotImplementedError()
-
-class Variable(Proposition):
-    def __init__(self, name):
-        self.name = name
-
-    def evaluate(self, **assignments):
-        return assignments[self.name]
-
-    def __str__(self):
-        return self.name
-
-class Not(Proposition):
-    def __init__(self, child):
-        self.child = child
-
-    def evaluate(self, **assignments):
-        return not self.child.evaluate(**assignments)
-
-    def __str__(self):
-        return f"¬{self.child}"
-
-class And(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) and self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∧ {self.right})"
-
-class Or(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∨ {self.right})"
-
-class Implies(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return not self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} → {self.right})"
-
-# Hàm phân tích biểu thức logic từ chuỗi
-def parse_expression(expr_str):
-    expr_str = expr_str.replace(" ", "")  # Xóa khoảng trắng
-    stack = []
-    operators = {"¬": Not, "∧": And, "∨": Or, "→": Implies}
-
-    i = 0
-    while i < len(expr_str):
-        if expr_str[i].isalpha():  # Biến logic (A, B, C, ...)
-            stack.append(Variable(expr_str[i]))
-        elif expr_str[i] in operators:  # Toán tử logic
-            op = operators[expr_str[i]]
-            if expr_str[i] == "¬":  # Toán tử một ngôi
-                operand = stack.pop()
-                stack.append(op(operand))
-            else:  # Toán tử hai ngôi
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(op(left, right))
-        elif expr_str[i] == "(" or expr_str[i] == ")":
-            pass  # Bỏ qua dấu ngoặc (đã xử lý trong chuỗi)
-        i += 1
-    return stack.pop()
-
-# Hàm tạo bảng chân trị
-def truth_table(expr_str):
+from BTTH2_logicAI_bdd import BDD
+from BTTH2_logicAI_core import assignment_blocks, block_layout, parse_expression
+from BTTH2_logicAI_parallel import parallel_truth_table
+from BTTH2_logicAI_simplify import simplify_logged
+
+# Tính kết quả của mọi dòng trong bảng chân trị, mỗi khối một lượt duyệt cây:
+# các biến đầu được cố định cho cả khối (cột toàn 1 hoặc toàn 0), các biến cuối là cột bit.
+# Trả về lần lượt (giá trị các biến đầu, số dòng của khối, kết quả đóng gói thành số nguyên)
+def truth_table_blocks(expression, variables, start=0, stop=None):
+    for high_values, full, columns in assignment_blocks(variables, start, stop):
+        yield high_values, full.bit_length(), expression.bitmask(columns, full)
+
+# ---- Nơi ghi bảng chân trị (sink) ----
+# Mỗi sink nhận lần lượt từng khối kết quả và ghi cả khối bằng một lần write có bộ đệm,
+# nên bộ nhớ chỉ phụ thuộc kích thước khối chứ không phụ thuộc số biến.
+# Giao diện: begin(variables), write_block(high_values, size, result), end()
+
+# Kích thước bộ đệm khi ghi ra tệp
+WRITE_BUFFER = 1 << 20
+
+# Tạo sẵn phần giá trị của các biến cuối (giống nhau ở mọi khối) với ký hiệu và dấu phân cách cho trước
+def low_cells(count, true_text, false_text, separator):
+    return [separator.join(true_text if v else false_text for v in values)
+            for values in product([True, False], repeat=count)]
+
+# Chuyển kết quả của khối sang chuỗi bit, ký tự thứ r là kết quả của dòng r
+def result_bits(result, size):
+    return bin(result)[2:].zfill(size)[::-1]
+
+# Bảng dạng văn bản T/F như khi in ra màn hình
+class TextSink:
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+
+    def begin(self, variables):
+        self.stream.write(" ".join(variables) + " Kết quả\n")
+        self.stream.write("-" * (len(variables) * 2 + 8) + "\n")
+        self.cells = []
+
+    def write_block(self, high_values, size, result):
+        if len(self.cells) != size:
+            self.cells = low_cells(size.bit_length() - 1, "T", "F", " ")
+        high_cells = "".join("T " if v else "F " for v in high_values)
+        rows = [f"{high_cells}{cells} {'T' if bit == '1' else 'F'}".strip()
+                for cells, bit in zip(self.cells, result_bits(result, size))]
+        rows.append("")
+        self.stream.write("\n".join(rows))
+
+    def end(self):
+        self.stream.flush()
+
+# Tệp CSV: dòng đầu là tên biến và cột result, giá trị ghi bằng 1/0
+class CSVSink(TextSink):
+    def __init__(self, path):
+        self.path = path
+
+    def begin(self, variables):
+        self.stream = open(self.path, "w", encoding="utf-8", buffering=WRITE_BUFFER)
+        self.stream.write(",".join(variables + ["result"]) + "\n")
+        self.cells = []
+
+    def write_block(self, high_values, size, result):
+        if len(self.cells) != size:
+            self.cells = low_cells(size.bit_length() - 1, "1", "0", ",")
+        high_cells = "".join("1," if v else "0," for v in high_values)
+        rows = [f"{high_cells}{cells},{bit}".lstrip(",")
+                for cells, bit in zip(self.cells, result_bits(result, size))]
+        rows.append("")
+        self.stream.write("\n".join(rows))
+
+    def end(self):
+        self.stream.close()
+
+# Tệp nhị phân gọn: chỉ lưu cột kết quả, mỗi dòng một bit (dòng r ở bit r % 8 của byte r // 8).
+# Phần đầu tệp: PACKED_MAGIC, số byte của danh sách tên biến (4 byte little-endian),
+# rồi tên biến nối bằng dấu xuống dòng (UTF-8)
+PACKED_MAGIC = b"TTB1"
+
+class PackedBitSink:
+    def __init__(self, path):
+        self.path = path
+
+    def begin(self, variables):
+        names = "\n".join(variables).encode("utf-8")
+        self.stream = open(self.path, "wb", buffering=WRITE_BUFFER)
+        self.stream.write(PACKED_MAGIC + len(names).to_bytes(4, "little") + names)
+
+    def write_block(self, high_values, size, result):
+        self.stream.write(result.to_bytes((size + 7) // 8, "little"))
+
+    def end(self):
+        self.stream.close()
+
+# Đọc lại tệp của PackedBitSink: trả về (danh sách biến, bytes chứa cột kết quả)
+def read_packed_table(path):
+    with open(path, "rb") as file:
+        if file.read(4) != PACKED_MAGIC:
+            raise ValueError(f"{path} không phải tệp bảng chân trị nén")
+        length = int.from_bytes(file.read(4), "little")
+        names = file.read(length).decode("utf-8")
+        return (names.split("\n") if names else []), file.read()
+
+# Hàm tạo bảng chân trị.
+# backend="bits": tính trực tiếp trên cây bằng phép toán bit;
+# backend="bdd": dựng BDD theo thứ tự các cột rồi đọc kết quả từ BDD.
+# sink: nơi ghi bảng (mặc định in ra màn hình dạng T/F).
+# workers: số tiến trình tính song song các khối (chỉ với backend="bits")
+# simplify=True: rút gọn biểu thức trước khi tính (các cột biến vẫn giữ nguyên); số nút trước/sau
+# được ghi vào logger của BTTH2_logicAI_simplify
+def truth_table(expr_str, backend="bits", sink=None, workers=None, simplify=False):
     try:
         expression = parse_expression(expr_str)
     except Exception as e:
         return f"Lỗi khi phân tích biểu thức: {e}"
 
     # Tìm tất cả các biến logic
-    variables = sorted({char for char in expr_str if char.isalpha()})
-
-    # Tạo tất cả các tổ hợp giá trị True/False cho các biến
-    truth_values = list(product([True, False], repeat=len(variables)))
-
-    # In tiêu đề bảng
-    print(" ".join(variables) + " Kết quả")
-    print("-" * (len(variables) * 2 + 8))
-
-    # Tính kết quả cho từng tổ hợp giá trị
-    for values in truth_values:
-        assignments = dict(zip(variables, values))
-        try:
-            result = expression.evaluate(**assignments)
-            # Chuyển True/False sang T/F
-            row = " ".join("T" if v else "F" for v in values) + " " + ("T" if result else "F")
-            print(row)
-        except Exception as e:
-            print(f"Lỗi khi đánh giá biểu thức: {e}")
+    variables = sorted(expression.variables())
+
+    if simplify:
+        expression = simplify_logged(expression)
+
+    if sink is None:
+        sink = TextSink()
+    sink.begin(variables)
+
+    # Tính kết quả cho cả khối dòng cùng lúc bằng các phép toán bit và ghi từng khối
+    try:
+        if workers is not None and workers > 1 and backend != "bdd":
+            blocks = parallel_truth_table(expression, variables, workers)
+        elif backend == "bdd":
+            manager = BDD(variables)
+            blocks = manager.truth_table_blocks(manager.build(expression), block_layout(len(variables))[1])
+        else:
+            blocks = truth_table_blocks(expression, variables)
+        for high_values, size, result in blocks:
+            sink.write_block(high_values, size, result)
+    except Exception as e:
+        print(f"Lỗi khi đánh giá biểu thức: {e}")
+    finally:
+        sink.end()
 
 # Chương trình chính
 def main():
@@ -1,30 +1,69 @@
+import csv
+import re
+import sys
+from array import array
 from itertools import product
 
+from BTTH2_logicAI_core import NOT_PRECEDENCE, OPERATOR_NAMES
+
+# Bảng chuyển byte 0/1 thành chữ số '0'/'1' để đóng gói một dãy giá trị bool thành số nguyên
+BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+# Đóng gói dãy cờ (bytes, mỗi byte 0 hoặc 1) thành số nguyên: bit i là cờ thứ i
+def pack_flags(flags):
+    return int(flags[::-1].translate(BIT_DIGITS) or b"0", 2)
+
+# Đánh dấu biến chưa được gán trước khi vào lượng từ (để khôi phục phép gán của biến cùng tên bên ngoài)
+UNBOUND = object()
+
+def restore(assignments, variable, saved):
+    if saved is UNBOUND:
+        assignments.pop(variable, None)
+    else:
+        assignments[variable] = saved
+
 # Lớp đại diện cho các công thức logic
 class Formula:
     def evaluate(self, domain, predicates):
         raise NotImplementedError()
 
+# Vị từ n ngôi, ví dụ P(x) hoặc Edge(x, y); một biến có thể xuất hiện nhiều lần như Edge(x, x)
 class Predicate(Formula):
-    def __init__(self, name, variable):
+    def __init__(self, name, *arguments):
         self.name = name
-        self.variable = variable
+        self.arguments = arguments
+        self.free = frozenset(arguments)
 
     def evaluate(self, domain, predicates, assignments):
         func = predicates[self.name]
-        value = assignments[self.variable]
-        return func(value)
+        return func(*[assignments[argument] for argument in self.arguments])
+
+    # Chế độ vector: trả về tập bit theo biến var nếu var là đối số của vị từ,
+    # nếu không thì giá trị bool tại các phần tử đã gán cho các đối số
+    def evaluate_vector(self, context, bindings, var):
+        if var not in self.free:
+            return context.holds(self, bindings)
+        if self.arguments == (var,):
+            return context.extension(self.name)[0]
+        return context.predicate_bits(self, bindings, var)
 
     def __str__(self):
-        return f"{self.name}({self.variable})"
+        return f"{self.name}({', '.join(self.arguments)})"
 
 class Not(Formula):
     def __init__(self, child):
         self.child = child
+        self.free = child.free
 
     def evaluate(self, domain, predicates, assignments):
         return not self.child.evaluate(domain, predicates, assignments)
 
+    def evaluate_vector(self, context, bindings, var):
+        value = context.value(self.child, bindings, var)
+        if type(value) is bool:
+            return not value
+        return context.full ^ value
+
     def __str__(self):
         return f"¬{self.child}"
 
@@ -32,10 +71,22 @@ class And(Formula):
     def __init__(self, left, right):
         self.left = left
         self.right = right
+        self.free = left.free | right.free
 
     def evaluate(self, domain, predicates, assignments):
         return self.left.evaluate(domain, predicates, assignments) and self.right.evaluate(domain, predicates, assignments)
 
+    def evaluate_vector(self, context, bindings, var):
+        left = context.value(self.left, bindings, var)
+        if left is False:
+            return False
+        right = context.value(self.right, bindings, var)
+        if left is True:
+            return right
+        if type(right) is bool:
+            return left if right else False
+        return left & right
+
     def __str__(self):
         return f"({self.left} ∧ {self.right})"
 
@@ -43,10 +94,22 @@ class Or(Formula):
     def __init__(self, left, right):
         self.left = left
         self.right = right
+        self.free = left.free | right.free
 
     def evaluate(self, domain, predicates, assignments):
         return self.left.evaluate(domain, predicates, assignments) or self.right.evaluate(domain, predicates, assignments)
 
+    def evaluate_vector(self, context, bindings, var):
+        left = context.value(self.left, bindings, var)
+        if left is True:
+            return True
+        right = context.value(self.right, bindings, var)
+        if left is False:
+            return right
+        if type(right) is bool:
+            return True if right else left
+        return left | right
+
     def __str__(self):
         return f"({self.left} ∨ {self.right})"
 
@@ -54,10 +117,22 @@ class Implies(Formula):
     def __init__(self, left, right):
         self.left = left
         self.right = right
+        self.free = left.free | right.free
 
     def evaluate(self, domain, predicates, assignments):
         return not self.left.evaluate(domain, predicates, assignments) or self.right.evaluate(domain, predicates, assignments)
 
+    def evaluate_vector(self, context, bindings, var):
+        left = context.value(self.left, bindings, var)
+        if left is False:
+            return True
+        right = context.value(self.right, bindings, var)
+        if left is True:
+            return right
+        if type(right) is bool:
+            return True if right else context.full ^ left
+        return (context.full ^ left) | right
+
     def __str__(self):
         return f"({self.left} → {self.right})"
 
@@ -65,13 +140,35 @@ class ForAll(Formula):
     def __init__(self, variable, child):
         self.variable = variable
         self.child = child
+        self.free = child.free - {variable}
 
     def evaluate(self, domain, predicates, assignments):
-        for value in domain:
-            assignments[self.variable] = value
-            if not self.child.evaluate(domain, predicates, assignments):
-                return False
-        return True
+        saved = assignments.get(self.variable, UNBOUND)
+        try:
+            for value in domain:
+                assignments[self.variable] = value
+                if not self.child.evaluate(domain, predicates, assignments):
+                    return False
+            return True
+        finally:
+            restore(assignments, self.variable, saved)
+
+    # Lượng từ trở thành phép rút gọn all() trên tập bit của thân theo biến bị lượng hóa.
+    # Thân dạng R(.., x, ..) → A với R là quan hệ có đối số đã gán: chỉ duyệt các x tra được từ chỉ mục của R.
+    # Nếu biến var cần trả về vẫn tự do trong công thức thì tính lần lượt tại từng phần tử;
+    # lượng từ không ràng buộc biến nào trong thân chỉ là chính thân đó (trừ khi miền rỗng)
+    def evaluate_vector(self, context, bindings, var):
+        if self.variable not in self.child.free:
+            return context.value(self.child, bindings, var) if context.elements else True
+        if var is not None and var != self.variable and var in self.free:
+            return context.join(self, bindings, var)
+        guard = context.guard(self, bindings)
+        if guard is not None:
+            return all(context.over_candidates(self, guard, bindings))
+        value = context.value(self.child, bindings, self.variable)
+        if type(value) is bool:
+            return value if context.elements else True
+        return value == context.full
 
     def __str__(self):
         return f"∀{self.variable} {self.child}"
@@ -80,57 +177,546 @@ class Exists(Formula):
     def __init__(self, variable, child):
         self.variable = variable
         self.child = child
+        self.free = child.free - {variable}
 
     def evaluate(self, domain, predicates, assignments):
-        for value in domain:
-            assignments[self.variable] = value
-            if self.child.evaluate(domain, predicates, assignments):
-                return True
-        return False
+        saved = assignments.get(self.variable, UNBOUND)
+        try:
+            for value in domain:
+                assignments[self.variable] = value
+                if self.child.evaluate(domain, predicates, assignments):
+                    return True
+            return False
+        finally:
+            restore(assignments, self.variable, saved)
+
+    # Lượng từ trở thành phép rút gọn any() trên tập bit của thân theo biến bị lượng hóa.
+    # Thân dạng R(.., x, ..) ∧ A với R là quan hệ có đối số đã gán: chỉ duyệt các x tra được từ chỉ mục của R.
+    # Nếu biến var cần trả về vẫn tự do trong công thức thì tính lần lượt tại từng phần tử;
+    # lượng từ không ràng buộc biến nào trong thân chỉ là chính thân đó (trừ khi miền rỗng)
+    def evaluate_vector(self, context, bindings, var):
+        if self.variable not in self.child.free:
+            return context.value(self.child, bindings, var) if context.elements else False
+        if var is not None and var != self.variable and var in self.free:
+            return context.join(self, bindings, var)
+        guard = context.guard(self, bindings)
+        if guard is not None:
+            return any(context.over_candidates(self, guard, bindings))
+        value = context.value(self.child, bindings, self.variable)
+        if type(value) is bool:
+            return value if context.elements else False
+        return value != 0
 
     def __str__(self):
         return f"∃{self.variable} {self.child}"
 
-# Hàm phân tích công thức từ chuỗi
+# Ngữ cảnh của chế độ vector: miền được đánh số 0..n-1, mỗi vị từ được gọi đúng một lần
+# cho mỗi phần tử và kết quả lưu thành tập bit (bit i là P(phần tử i)) cùng dãy cờ để tra từng phần tử
+class VectorContext:
+    def __init__(self, domain, predicates):
+        self.elements = list(domain)
+        self.full = (1 << len(self.elements)) - 1
+        self.predicates = predicates
+        self.extensions = {}
+        self.hoisted = {}
+        self.positions = None
+        self.guards = {}
+        self.joins = {}
+
+    # Giá trị của một nút; nút không phụ thuộc biến nào đang được gán từ bên ngoài (mọi biến tự do
+    # chỉ là var) cho cùng một kết quả ở mọi lần lặp của các lượng từ bao quanh, nên được tính một lần
+    def value(self, node, bindings, var):
+        free = node.free
+        if free and (len(free) > 1 or var not in free):
+            return node.evaluate_vector(self, bindings, var)
+        value = self.hoisted.get(node)
+        if value is None:
+            value = self.hoisted[node] = node.evaluate_vector(self, bindings, var)
+        return value
+
+    def extension(self, name):
+        extension = self.extensions.get(name)
+        if extension is None:
+            func = self.predicates[name]
+            if isinstance(func, Relation):
+                flags = self.relation_flags(name, func)
+            else:
+                flags = bytes(map(bool, map(func, self.elements)))
+            extension = self.extensions[name] = (pack_flags(flags), flags)
+        return extension
+
+    # Cờ 0/1 theo từng phần tử của miền cho quan hệ một ngôi
+    def relation_flags(self, name, relation):
+        if relation.arity != 1:
+            raise ValueError(f"Vị từ {name} có {relation.arity} đối số, không phải 1")
+        flags = bytearray(len(self.elements))
+        index_of = self.index_of()
+        for value in relation.columns[0]:
+            index = index_of.get(value)
+            if index is not None:
+                flags[index] = 1
+        return bytes(flags)
+
+    # Số hiệu của từng phần tử trong miền (để đổi giá trị trong quan hệ sang vị trí bit)
+    def index_of(self):
+        if self.positions is None:
+            self.positions = {element: index for index, element in enumerate(self.elements)}
+        return self.positions
+
+    def is_relation(self, predicate):
+        return isinstance(self.predicates[predicate.name], Relation)
+
+    # Giá trị của vị từ khi mọi đối số đã được gán
+    def holds(self, predicate, bindings):
+        if len(predicate.arguments) == 1:
+            return self.extension(predicate.name)[1][bindings[predicate.arguments[0]]] == 1
+        elements = self.elements
+        return bool(self.predicates[predicate.name](*[elements[bindings[argument]] for argument in predicate.arguments]))
+
+    # Tập bit theo var của vị từ nhiều đối số (các đối số khác đã gán): quan hệ thì tra chỉ mục,
+    # hàm Python thì gọi với từng phần tử ở vị trí của var
+    def predicate_bits(self, predicate, bindings, var):
+        if self.is_relation(predicate):
+            return self.pack_indexes(self.matches(predicate, bindings, var))
+        func = self.predicates[predicate.name]
+        elements = self.elements
+        values = [None if argument == var else elements[bindings[argument]] for argument in predicate.arguments]
+        positions = [position for position, argument in enumerate(predicate.arguments) if argument == var]
+        flags = bytearray(len(elements))
+        for index, element in enumerate(elements):
+            for position in positions:
+                values[position] = element
+            flags[index] = bool(func(*values))
+        return pack_flags(bytes(flags))
+
+    def pack_indexes(self, indexes):
+        flags = bytearray(len(self.elements))
+        for index in indexes:
+            flags[index] = 1
+        return pack_flags(bytes(flags))
+
+    # Số hiệu (trong miền) các giá trị của var ở những bộ của quan hệ khớp với các đối số đã gán.
+    # Các đối số là biến hidden (nếu có) được lượng hóa tồn tại: chỉ cần giá trị nằm trong miền
+    def matches(self, predicate, bindings, var, hidden=None):
+        relation = self.predicates[predicate.name]
+        arguments = predicate.arguments
+        if relation.arity != len(arguments):
+            raise ValueError(f"Vị từ {predicate.name} có {relation.arity} đối số, không phải {len(arguments)}")
+        index_of = self.index_of()
+        conditions = [(position, self.elements[bindings[argument]]) for position, argument in enumerate(arguments)
+                      if argument != var and argument != hidden]
+        free_positions = {}
+        for position, argument in enumerate(arguments):
+            if argument == var or argument == hidden:
+                free_positions.setdefault(argument, []).append(position)
+        columns = relation.columns
+        result = set()
+        for row in relation.select(conditions):
+            indexes = {}
+            for argument, positions in free_positions.items():
+                values = {columns[position][row] for position in positions}
+                if len(values) != 1:
+                    break
+                index = index_of.get(values.pop())
+                if index is None:
+                    break
+                indexes[argument] = index
+            else:
+                result.add(indexes[var])
+        return result
+
+    # Vị từ canh (guard) của lượng từ: quan hệ chứa biến bị lượng hóa và có ít nhất một đối số đã gán,
+    # nằm trong phần hội của thân (∃) hoặc phần giả thiết của thân (∀)
+    def guard(self, quantifier, bindings):
+        guards = self.guards.get(quantifier)
+        if guards is None:
+            guards = self.guards[quantifier] = [part for part, _ in guard_parts(quantifier)
+                                                if isinstance(part, Predicate) and self.is_relation(part)
+                                                and quantifier.variable in part.free and len(part.free) > 1]
+        for guard in guards:
+            if any(argument in bindings for argument in guard.free if argument != quantifier.variable):
+                return guard
+        return None
+
+    # Lượng từ theo biến y, tính thành tập bit theo biến var còn tự do. Nếu thân có vị từ canh R(var, y)
+    # và phần còn lại A chỉ phụ thuộc y thì chỉ cần một lượt qua các bộ của R:
+    # ∃y (R(var, y) ∧ A) là nửa kết nối của R với A, ∀y (R(var, y) → A) là phần bù của nửa kết nối
+    # của R với ¬A (phản kết nối). Các trường hợp khác tính lần lượt tại từng phần tử (collect)
+    def join(self, quantifier, bindings, var):
+        plan = self.joins.get((quantifier, var), UNBOUND)
+        if plan is UNBOUND:
+            plan = self.joins[quantifier, var] = None
+            variable = quantifier.variable
+            for guard, rest in guard_parts(quantifier):
+                if (isinstance(guard, Predicate) and self.is_relation(guard) and guard.free == {var, variable}
+                        and len(guard.arguments) == 2 and (type(rest) is bool or rest.free <= {variable})):
+                    plan = self.joins[quantifier, var] = (guard, rest)
+                    break
+        if plan is None:
+            return self.collect(quantifier, bindings, var)
+        guard, rest = plan
+        relation = self.predicates[guard.name]
+        if relation.arity != 2:
+            raise ValueError(f"Vị từ {guard.name} có {relation.arity} đối số, không phải 2")
+        exists = isinstance(quantifier, Exists)
+        if type(rest) is not bool:
+            rest = self.value(rest, bindings, quantifier.variable)
+        if type(rest) is bool:
+            # A không phụ thuộc y: ∃ cần có ít nhất một bộ, ∀ đúng khi A đúng hoặc không có bộ nào
+            if rest != exists:
+                return self.full if rest else 0
+            wanted = None
+        else:
+            if not exists:
+                rest = self.full ^ rest
+            wanted = format(rest, f"0{len(self.elements)}b")[::-1]
+        bits = self.semijoin(guard, var, quantifier.variable, wanted)
+        return bits if exists else self.full ^ bits
+
+    # Tập bit các giá trị của var có ít nhất một bộ (var, y) trong quan hệ canh với y (biến variable)
+    # thuộc wanted (chuỗi cờ "0"/"1" theo số hiệu phần tử; None: mọi phần tử của miền)
+    def semijoin(self, guard, var, variable, wanted):
+        relation = self.predicates[guard.name]
+        index_of = self.index_of()
+        var_column = relation.columns[guard.arguments.index(var)]
+        other_column = relation.columns[guard.arguments.index(variable)]
+        pairs = zip(map(index_of.get, var_column), map(index_of.get, other_column))
+        if wanted is None:
+            indexes = {index for index, other in pairs if index is not None and other is not None}
+        else:
+            indexes = {index for index, other in pairs
+                       if index is not None and other is not None and wanted[other] == "1"}
+        return self.pack_indexes(indexes)
+
+    # Giá trị của thân lượng từ tại từng phần tử tra được qua vị từ canh; ngoài các phần tử đó,
+    # thân hiển nhiên sai (∃) hoặc đúng (∀)
+    def over_candidates(self, quantifier, guard, bindings):
+        variable = quantifier.variable
+        saved = bindings.get(variable, UNBOUND)
+        try:
+            for index in self.matches(guard, bindings, variable):
+                bindings[variable] = index
+                yield self.value(quantifier.child, bindings, None)
+        finally:
+            restore(bindings, variable, saved)
+
+    # Tập bit theo biến var của một công thức còn biến tự do khác: gán var lần lượt từng phần tử
+    def collect(self, formula, bindings, var):
+        saved = bindings.get(var, UNBOUND)
+        flags = bytearray(len(self.elements))
+        for index in range(len(self.elements)):
+            bindings[var] = index
+            flags[index] = formula.evaluate_vector(self, bindings, None)
+        restore(bindings, var, saved)
+        return pack_flags(bytes(flags))
+
+# Các cách tách thân lượng từ thành (vị từ canh, phần còn lại); phần còn lại rỗng là hằng True/False:
+# ∃y (G ∧ A) với G là một toán hạng của phép hội; ∀y (G → A) với G là một toán hạng của giả thiết;
+# ∀y (¬G ∨ A) là dạng chuẩn phủ định của trường hợp trước
+def guard_parts(quantifier):
+    child = quantifier.child
+    if isinstance(quantifier, Exists):
+        parts = operands_of(child, And)
+        for i, part in enumerate(parts):
+            rest = parts[:i] + parts[i + 1:]
+            yield part, join_operands(And, rest) if rest else True
+    elif isinstance(child, Implies):
+        parts = operands_of(child.left, And)
+        for i, part in enumerate(parts):
+            rest = parts[:i] + parts[i + 1:]
+            yield part, Implies(join_operands(And, rest), child.right) if rest else child.right
+    else:
+        parts = operands_of(child, Or)
+        for i, part in enumerate(parts):
+            if isinstance(part, Not):
+                rest = parts[:i] + parts[i + 1:]
+                yield part.child, join_operands(Or, rest) if rest else False
+
+# ---- Quan hệ ----
+# Mở rộng của vị từ n ngôi lưu theo cột: columns[i][r] là đối số thứ i của bộ thứ r. Cột số nguyên
+# dùng array('q') (8 byte mỗi giá trị), cột khác dùng list. Chỉ mục băm theo từng đối số
+# (giá trị -> danh sách số thứ tự bộ) được dựng khi cần lần đầu
+class Relation:
+    def __init__(self, columns):
+        self.columns = [compact_column(column) for column in columns]
+        self.arity = len(self.columns)
+        self.size = len(self.columns[0]) if self.columns else 0
+        self.indexes = {}
+
+    def __len__(self):
+        return self.size
+
+    def index(self, position):
+        index = self.indexes.get(position)
+        if index is None:
+            index = self.indexes[position] = {}
+            for row, value in enumerate(self.columns[position]):
+                rows = index.get(value)
+                if rows is None:
+                    index[value] = [row]
+                else:
+                    rows.append(row)
+        return index
+
+    # Số thứ tự các bộ thỏa mọi điều kiện (vị trí, giá trị): tra chỉ mục của điều kiện có ít bộ nhất
+    def select(self, conditions):
+        if not conditions:
+            return range(self.size)
+        candidates = [self.index(position).get(value, ()) for position, value in conditions]
+        best = min(range(len(conditions)), key=lambda i: len(candidates[i]))
+        rest = [condition for i, condition in enumerate(conditions) if i != best]
+        columns = self.columns
+        return [row for row in candidates[best] if all(columns[position][row] == value for position, value in rest)]
+
+    # Dùng quan hệ như một hàm vị từ: Edge(1, 2) là True nếu (1, 2) thuộc quan hệ
+    def __call__(self, *values):
+        if len(values) != self.arity:
+            raise ValueError(f"Quan hệ có {self.arity} đối số, nhận {len(values)}")
+        return bool(self.select(list(enumerate(values))))
+
+def compact_column(values):
+    if isinstance(values, array):
+        return values
+    try:
+        return array("q", values)
+    except (TypeError, OverflowError):
+        return list(values)
+
+def parse_value(text):
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+# Đọc quan hệ từ tệp CSV, mỗi dòng là một bộ; số nguyên được đọc thành int, còn lại giữ chuỗi
+def load_relation_csv(path, header=False):
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        if header:
+            next(reader, None)
+        rows = [row for row in reader if row]
+    if not rows:
+        return Relation([])
+    columns = [[parse_value(row[position]) for row in rows] for position in range(len(rows[0]))]
+    return Relation(columns)
+
+# Định dạng nhị phân (chỉ cho quan hệ số nguyên): RELATION_MAGIC, số cột (4 byte), số bộ (8 byte),
+# sau đó lần lượt từng cột dạng int64 little-endian
+RELATION_MAGIC = b"REL1"
+
+def save_relation_binary(relation, path):
+    with open(path, "wb") as file:
+        file.write(RELATION_MAGIC)
+        file.write(relation.arity.to_bytes(4, "little"))
+        file.write(relation.size.to_bytes(8, "little"))
+        for column in relation.columns:
+            column = array("q", column)
+            if sys.byteorder != "little":
+                column.byteswap()
+            column.tofile(file)
+
+def load_relation_binary(path):
+    with open(path, "rb") as file:
+        if file.read(4) != RELATION_MAGIC:
+            raise ValueError(f"Tệp {path} không phải quan hệ nhị phân")
+        arity = int.from_bytes(file.read(4), "little")
+        size = int.from_bytes(file.read(8), "little")
+        columns = []
+        for _ in range(arity):
+            column = array("q")
+            column.fromfile(file, size)
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+    return Relation(columns)
+
+# Đọc quan hệ theo đuôi tệp: .csv là CSV, còn lại là định dạng nhị phân
+def load_relation(path, header=False):
+    if str(path).endswith(".csv"):
+        return load_relation_csv(path, header)
+    return load_relation_binary(path)
+
+# Miền hoạt động: mọi giá trị xuất hiện trong các quan hệ
+def active_domain(*relations):
+    values = set()
+    for relation in relations:
+        for column in relation.columns:
+            values.update(column)
+    return values
+
+# ---- Lập kế hoạch ----
+# Viết lại công thức trước khi tính để lượng từ chỉ bao phần thật sự phụ thuộc biến của nó:
+# 1. Dạng chuẩn phủ định (NNF): đẩy ¬ xuống tận vị từ, thay A → B bằng ¬A ∨ B.
+# 2. Thu hẹp phạm vi (miniscoping): ∀x (A ∧ B) = ∀x A ∧ ∀x B, ∃x (A ∨ B) = ∃x A ∨ ∃x B,
+#    ∀x (A ∨ B) = A ∨ ∀x B và ∃x (A ∧ B) = A ∧ ∃x B khi x không tự do trong A.
+# Các luật trên đúng cả với miền rỗng. Sau đó mỗi lượng từ chỉ còn một biến tự do trong thân nên
+# chế độ vector tính nó bằng các phép nửa kết nối (&) và phản kết nối (& ~) trên mở rộng của vị từ
+# rồi rút gọn all()/any(), thay vì lặp lồng nhau |D|^k lần
+
+# Dạng chuẩn phủ định của formula (hoặc của ¬formula khi negate=True)
+def negation_normal_form(formula, negate=False):
+    if isinstance(formula, Predicate):
+        return Not(formula) if negate else formula
+    if isinstance(formula, Not):
+        return negation_normal_form(formula.child, not negate)
+    if isinstance(formula, (And, Or)):
+        left = negation_normal_form(formula.left, negate)
+        right = negation_normal_form(formula.right, negate)
+        if isinstance(formula, And) == negate:
+            return Or(left, right)
+        return And(left, right)
+    if isinstance(formula, Implies):
+        left = negation_normal_form(formula.left, not negate)
+        right = negation_normal_form(formula.right, negate)
+        return And(left, right) if negate else Or(left, right)
+    child = negation_normal_form(formula.child, negate)
+    if isinstance(formula, ForAll) == negate:
+        return Exists(formula.variable, child)
+    return ForAll(formula.variable, child)
+
+# Các toán hạng của một chuỗi cùng phép nối, ví dụ A ∧ (B ∧ C) -> [A, B, C]
+def operands_of(formula, cls):
+    if isinstance(formula, cls):
+        return operands_of(formula.left, cls) + operands_of(formula.right, cls)
+    return [formula]
+
+def join_operands(cls, parts):
+    result = parts[0]
+    for part in parts[1:]:
+        result = cls(result, part)
+    return result
+
+# Đặt lượng từ quantifier(variable, ...) lên thân body (đã thu hẹp) ở phạm vi nhỏ nhất có thể
+def push_quantifier(quantifier, variable, body):
+    if variable not in body.free:
+        return quantifier(variable, body)
+    distributes, splits = (And, Or) if quantifier is ForAll else (Or, And)
+    if isinstance(body, distributes):
+        return join_operands(distributes, [push_quantifier(quantifier, variable, part)
+                                           for part in operands_of(body, distributes)])
+    if isinstance(body, splits):
+        parts = operands_of(body, splits)
+        independent = [part for part in parts if variable not in part.free]
+        if independent:
+            dependent = [part for part in parts if variable in part.free]
+            return join_operands(splits, independent + [quantifier(variable, join_operands(splits, dependent))])
+    return quantifier(variable, body)
+
+def miniscope(formula):
+    if isinstance(formula, (Predicate, Not)):
+        return formula
+    if isinstance(formula, (And, Or)):
+        return type(formula)(miniscope(formula.left), miniscope(formula.right))
+    return push_quantifier(type(formula), formula.variable, miniscope(formula.child))
+
+def plan_formula(formula):
+    return miniscope(negation_normal_form(formula))
+
+# ---- Phân tích cú pháp ----
+# Dạng trung tố như bài 1: ¬ > ∧ > ∨ > →, → kết hợp phải. Vị từ có một hoặc nhiều đối số: P(x), Edge(x, y). Lượng từ ∀x, ∃x có cùng độ ưu tiên với ¬
+# và áp dụng cho toán hạng ngay sau nó, ví dụ ∀x (P(x) → Q(x)) ∧ ∃y P(y) là (∀x (...)) ∧ (∃y P(y))
+FORMULA_TOKEN_PATTERN = re.compile(
+    r"\s*(?:([∀∃])\s*([^\W\d]\w*)|([^\W\d]\w*)\s*\(\s*([^\W\d]\w*(?:\s*,\s*[^\W\d]\w*)*)\s*\)|(->|[¬~!∧&∨|→()]))")
+
+FORMULA_OPERATORS = {"∧": (3, And, False), "∨": (2, Or, False), "→": (1, Implies, True)}
+QUANTIFIERS = {"∀": ForAll, "∃": Exists}
+
+def tokenize_formula(formula_str):
+    position = 0
+    length = len(formula_str)
+    match = FORMULA_TOKEN_PATTERN.match
+    while position < length:
+        token = match(formula_str, position)
+        if token is None:
+            if formula_str[position:].strip() == "":
+                return
+            raise ValueError(f"Ký tự không hợp lệ '{formula_str[position]}' tại vị trí {position}")
+        quantifier, bound, name, arguments, operator = token.groups()
+        if quantifier is not None:
+            yield "quantifier", (quantifier, bound), token.group().strip(), token.start(1)
+        elif name is not None:
+            arguments = tuple(argument.strip() for argument in arguments.split(","))
+            yield "predicate", (name, arguments), token.group().strip(), token.start(3)
+        else:
+            yield "op", OPERATOR_NAMES.get(operator, operator), operator, token.start(5)
+        position = token.end()
+
+# Hàm phân tích công thức từ chuỗi (hai ngăn xếp như parse_tokens của bài 1, không đệ quy)
 def parse_formula(formula_str):
-    formula_str = formula_str.replace(" ", "")
-    stack = []
-    operators = {"¬": Not, "∧": And, "∨": Or, "→": Implies}
-    quantifiers = {"∀": ForAll, "∃": Exists}
-
-    i = 0
-    while i < len(formula_str):
-        if formula_str[i].isalpha() and formula_str[i + 1] == "(":
-            j = i + 2
-            while formula_str[j] != ")":
-                j += 1
-            stack.append(Predicate(formula_str[i], formula_str[i + 2:j]))
-            i = j
-        elif formula_str[i] in operators:
-            op = operators[formula_str[i]]
-            if formula_str[i] == "¬":
-                child = stack.pop()
-                stack.append(op(child))
+    operands = []
+    operators = []  # các phần tử: "¬", "(", (lượng từ, biến) hoặc toán tử hai ngôi
+
+    def precedence_of(operator):
+        return FORMULA_OPERATORS[operator][0] if operator in FORMULA_OPERATORS else NOT_PRECEDENCE
+
+    def reduce():
+        operator = operators.pop()
+        if operator == "¬":
+            operands.append(Not(operands.pop()))
+        elif isinstance(operator, tuple):
+            quantifier, variable = operator
+            operands.append(QUANTIFIERS[quantifier](variable, operands.pop()))
+        else:
+            right = operands.pop()
+            left = operands.pop()
+            operands.append(FORMULA_OPERATORS[operator][1](left, right))
+
+    expect_operand = True
+    for kind, value, text, position in tokenize_formula(formula_str):
+        if expect_operand:
+            if kind == "predicate":
+                name, arguments = value
+                operands.append(Predicate(name, *arguments))
+                expect_operand = False
+            elif kind == "quantifier" or value == "¬" or value == "(":
+                operators.append(value)
             else:
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(op(left, right))
-        elif formula_str[i] in quantifiers:
-            var = formula_str[i + 1]
-            child = stack.pop()
-            stack.append(quantifiers[formula_str[i]](var, child))
-            i += 1
-        elif formula_str[i] == "(" or formula_str[i] == ")":
-            pass
-        i += 1
-    return stack.pop()
+                raise ValueError(f"Thiếu toán hạng trước '{text}' tại vị trí {position}")
+        elif value in FORMULA_OPERATORS:
+            precedence, _, right_associative = FORMULA_OPERATORS[value]
+            while operators and operators[-1] != "(":
+                top_precedence = precedence_of(operators[-1])
+                if top_precedence > precedence or (top_precedence == precedence and not right_associative):
+                    reduce()
+                else:
+                    break
+            operators.append(value)
+            expect_operand = True
+        elif value == ")":
+            while operators and operators[-1] != "(":
+                reduce()
+            if not operators:
+                raise ValueError(f"Thừa dấu ')' tại vị trí {position}")
+            operators.pop()
+        else:
+            raise ValueError(f"Thiếu toán tử trước '{text}' tại vị trí {position}")
+
+    if expect_operand:
+        raise ValueError("Công thức rỗng hoặc kết thúc bằng toán tử")
+    while operators:
+        if operators[-1] == "(":
+            raise ValueError("Thiếu dấu ')'")
+        reduce()
+    return operands.pop()
 
 # Hàm kiểm tra tính đúng/sai của công thức
-def evaluate_formula(formula_str, domain, predicates):
+# mode="loop": duyệt lồng nhau trên miền, gọi hàm vị từ mỗi lần gặp;
+# mode="vector": mỗi vị từ chỉ được gọi một lần cho mỗi phần tử, lượng từ và phép nối tính trên tập bit.
+# plan=True: thu hẹp phạm vi lượng từ bằng plan_formula trước khi tính.
+# check_formula để lỗi (cú pháp, thiếu vị từ...) thành ngoại lệ; evaluate_formula trả về chuỗi báo lỗi
+def check_formula(formula_str, domain, predicates, mode="loop", plan=False):
+    formula = parse_formula(formula_str)
+    if plan:
+        formula = plan_formula(formula)
+    if mode == "vector":
+        return VectorContext(domain, predicates).value(formula, {}, None)
+    assignments = {}
+    return formula.evaluate(domain, predicates, assignments)
+
+def evaluate_formula(formula_str, domain, predicates, mode="loop", plan=False):
     try:
-        formula = parse_formula(formula_str)
-        assignments = {}
-        return formula.evaluate(domain, predicates, assignments)
+        return check_formula(formula_str, domain, predicates, mode, plan)
     except Exception as e:
         return f"Lỗi khi đánh giá công thức: {e}"
 
@@ -139,7 +725,7 @@ def main():
     formula_str = input("Nhập công thức logic vị từ (ví dụ: ∀x (P(x) → Q(x)) ∧ ∃y P(y)): ")
     domain = eval(input("Nhập miền giá trị (ví dụ: {1, 2, 3}): "))
     predicates = {}
-    print("Nhập định nghĩa vị từ (ví dụ: P = lambda x: x > 1):")
+    print("Nhập định nghĩa vị từ (ví dụ: P = lambda x: x > 1 hoặc Edge = load_relation('edges.csv')):")
     while True:
         predicate_input = input("Nhập tên vị từ và định nghĩa (hoặc bấm Enter để dừng): ")
         if not predicate_input.strip():
@@ -1,91 +1,25 @@
+import heapq
+import time
 from itertools import product
 
-# Các lớp logic mệnh đề (tương tự code trên)
-class Proposition:
-    def evaluate(self, **assignments):
-        raise NotImplementedError()
-
-class Variable(Proposition):
-    def __init__(self, name):
-        self.name = name
-
-    def evaluate(self, **assignments):
-        return assignments[self.name]
-
-    def __str__(self):
-        return self.name
-
-class Not(Proposition):
-    def __init__(self, child):
-        self.child = child
-
-    def evaluate(self, **assignments):
-        return not self.child.evaluate(**assignments)
-
-    def __str__(self):
-        return f"¬{self.child}"
-
-class And(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) and self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∧ {self.right})"
-
-class Or(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∨ {self.right})"
-
-class Implies(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return not self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} → {self.right})"
-
-# Hàm phân tích biểu thức logic
-operators = {"¬": Not, "∧": And, "∨": Or, "→": Implies}
-
-def parse_expression(expr_str):
-    expr_str = expr_str.replace(" ", "")
-    stack = []
-
-    i = 0
-    while i < len(expr_str):
-        if expr_str[i].isalpha():
-            stack.append(Variable(expr_str[i]))
-        elif expr_str[i] in operators:
-            op = operators[expr_str[i]]
-            if expr_str[i] == "¬":
-                operand = stack.pop()
-                stack.append(op(operand))
-            else:
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(op(left, right))
-        elif expr_str[i] == "(" or expr_str[i] == ")":
-            pass
-        i += 1
-
-    return stack.pop()
-
-# Hàm kiểm tra tính hợp lệ của kết luận bằng bảng chân trị
-def prove_by_truth_table(premises, conclusion):
+from BTTH2_logicAI_bdd import TRUE, build_bdd
+from BTTH2_logicAI_core import Constant, Variable, Not, And, Or, Implies, parse_expression
+from BTTH2_logicAI_parallel import parallel_counterexample
+from BTTH2_logicAI_sat import CNF, Solver
+from BTTH2_logicAI_simplify import simplify_logged
+
+# Rút gọn các mệnh đề và kết luận của một câu hỏi (tùy chọn simplify=True)
+def simplify_query(premises, conclusion):
+    premises = [simplify_logged(p, f"mệnh đề {i + 1}") for i, p in enumerate(premises)]
+    return premises, simplify_logged(conclusion, "kết luận")
+
+# Hàm kiểm tra tính hợp lệ của kết luận bằng bảng chân trị.
+# backend="bdd": thay vì duyệt từng dòng, dựng BDD của (∧ premises) → conclusion
+# và kiểm tra nó có phải nút hằng đúng hay không. backend="sat": hỏi KnowledgeBase (CDCL).
+# workers: số tiến trình cùng tìm phản ví dụ (chỉ với backend="enumerate")
+# simplify=True: rút gọn từng mệnh đề và kết luận trước khi kiểm tra (báo cáo số nút ghi vào logger
+# của BTTH2_logicAI_simplify)
+def prove_by_truth_table(premises, conclusion, backend="enumerate", workers=None, simplify=False):
     try:
         # Phân tích các mệnh đề và kết luận
         parsed_premises = [parse_expression(p) for p in premises]
@@ -93,24 +27,43 @@ def prove_by_truth_table(premises, conclusion):
     except Exception as e:
         return f"Lỗi khi phân tích biểu thức: {e}"
 
+    if simplify:
+        parsed_premises, parsed_conclusion = simplify_query(parsed_premises, parsed_conclusion)
+
+    if backend == "bdd":
+        manager, roots = build_bdd(parsed_premises + [parsed_conclusion])
+        premises_root = TRUE
+        for root in roots[:-1]:
+            premises_root = manager.conjoin(premises_root, root)
+        return "Đúng" if manager.implies(premises_root, roots[-1]) == TRUE else "Sai"
+
+    if backend == "sat":
+        return "Đúng" if KnowledgeBase(parsed_premises).entails(parsed_conclusion) else "Sai"
+
     # Tìm tất cả các biến logic
     all_variables = set()
     for p in parsed_premises + [parsed_conclusion]:
-        all_variables.update(str(p))
+        all_variables |= p.variables()
     variables = sorted(all_variables)
 
-    # Tạo tất cả các tổ hợp giá trị True/False
-    truth_values = list(product([True, False], repeat=len(variables)))
+    if workers is not None and workers > 1:
+        counterexample = parallel_counterexample(parsed_premises, parsed_conclusion, variables, workers)
+        return "Đúng" if counterexample is None else "Sai"
+
+    # Duyệt lần lượt các tổ hợp giá trị True/False, không tạo sẵn cả danh sách 2^n phần tử
+    truth_values = product([True, False], repeat=len(variables))
+
+    # Biên dịch các mệnh đề và kết luận một lần
+    compiled_premises = [p.compile(variables) for p in parsed_premises]
+    compiled_conclusion = parsed_conclusion.compile(variables)
 
     # Kiểm tra từng tổ hợp
     for values in truth_values:
-        assignments = dict(zip(variables, values))
-
         # Đánh giá tất cả các mệnh đề
-        premises_result = all(p.evaluate(**assignments) for p in parsed_premises)
+        premises_result = all(p(values) for p in compiled_premises)
 
         # Đánh giá kết luận
-        conclusion_result = parsed_conclusion.evaluate(**assignments)
+        conclusion_result = compiled_conclusion(values)
 
         # Nếu các mệnh đề đúng nhưng kết luận sai => không chứng minh được
         if premises_result and not conclusion_result:
@@ -119,38 +72,253 @@ def prove_by_truth_table(premises, conclusion):
     # Nếu không có trường hợp nào mâu thuẫn => chứng minh được
     return "Đúng"
 
-# Hàm kiểm tra bằng phương pháp dẫn chứng phản chứng
-def prove_by_resolution(premises, conclusion):
-    # Chuyển đổi: premises ∧ ¬conclusion phải dẫn đến mâu thuẫn
+# ---- Cơ sở tri thức ----
+# Các premise được mã hóa Tseitin và nạp vào một bộ giải CDCL duy nhất. Mỗi câu hỏi chỉ thêm các mệnh đề
+# định nghĩa cho kết luận (không ràng buộc các biến gốc) rồi giải với giả thiết ¬kết luận: không thỏa mãn
+# nghĩa là premises ⊨ kết luận. Mệnh đề học được giữ lại cho các câu hỏi sau, và tell() chỉ nạp thêm
+# mệnh đề mới thay vì dựng lại.
+class KnowledgeBase:
+    def __init__(self, premises=()):
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.loaded = 0          # số mệnh đề của cnf đã nạp vào solver
+        self.premises = []
+        self.variables = set()
+        for premise in premises:
+            self.tell(premise)
+
+    def parse(self, expr):
+        return parse_expression(expr) if isinstance(expr, str) else expr
+
+    def sync(self):
+        self.solver.add_cnf(self.cnf, self.loaded)
+        self.loaded = len(self.cnf.clauses)
+
+    def tell(self, premise):
+        premise = self.parse(premise)
+        self.premises.append(premise)
+        self.variables |= premise.variables()
+        self.cnf.add(premise)
+        self.sync()
+
+    # Phép gán làm mọi premise đúng và conclusion sai, hoặc None nếu premises ⊨ conclusion
+    def counterexample(self, conclusion):
+        conclusion = self.parse(conclusion)
+        literal = self.cnf.literal(conclusion)
+        self.sync()
+        if not self.solver.solve(assumptions=[-literal]):
+            return None
+        names = self.cnf.names
+        return {name: self.solver.value(names[name]) for name in sorted(self.variables | conclusion.variables())}
+
+    def entails(self, conclusion):
+        return self.counterexample(conclusion) is None
+
+    # Các premise có mâu thuẫn với nhau không
+    def consistent(self):
+        return bool(self.solver.solve())
+
+# ---- Chứng minh bằng phép hợp giải (resolution) ----
+# Literal là cặp (tên biến, dấu); mệnh đề là frozenset các literal, frozenset rỗng là mâu thuẫn □
+
+# Số mệnh đề tối đa khi chuyển sang CNF và khi hợp giải, thời gian tối đa (giây)
+MAX_CNF_CLAUSES = 5000
+MAX_RESOLUTION_CLAUSES = 20000
+RESOLUTION_TIME_LIMIT = 10.0
+
+class ResolutionBudgetExceeded(Exception):
+    pass
+
+def is_tautology(clause):
+    return any((name, not sign) in clause for name, sign in clause)
+
+def clause_to_str(clause):
+    if not clause:
+        return "□"
+    return " ∨ ".join(name if sign else f"¬{name}" for name, sign in sorted(clause))
+
+# Tích của hai tập mệnh đề (phân phối ∨ vào ∧), bỏ các mệnh đề hằng đúng
+def clause_product(left, right):
+    result = {a | b for a in left for b in right}
+    result = [c for c in result if not is_tautology(c)]
+    if len(result) > MAX_CNF_CLAUSES:
+        raise ResolutionBudgetExceeded("Dạng CNF quá lớn")
+    return result
+
+# Với mỗi phép hai ngôi và dấu của nút: (dấu của vế trái, dấu của vế phải, nối hai tập mệnh đề hay lấy tích).
+# Ví dụ ¬(A → B) là A ∧ ¬B: vế trái dương, vế phải âm, nối
+CLAUSE_RULES = {
+    (And, True): (True, True, False), (And, False): (False, False, True),
+    (Or, True): (True, True, True), (Or, False): (False, False, False),
+    (Implies, True): (False, True, True), (Implies, False): (True, False, False),
+}
+
+# Chuyển biểu thức (hoặc phủ định của nó khi positive=False) thành danh sách mệnh đề CNF.
+# Duyệt hậu thứ tự bằng ngăn xếp (không đệ quy) nên biểu thức rất sâu không vượt giới hạn đệ quy
+def to_clauses(expr, positive=True):
+    results = []
+    stack = [(expr, positive, False)]
+    while stack:
+        node, sign, expanded = stack.pop()
+        if isinstance(node, Variable):
+            results.append([frozenset([(node.name, sign)])])
+        elif isinstance(node, Constant):
+            results.append([] if node.value == sign else [frozenset()])
+        elif isinstance(node, Not):
+            stack.append((node.child, not sign, False))
+        elif (type(node), sign) not in CLAUSE_RULES:
+            raise ValueError(f"Không chuyển được sang CNF: {node}")
+        elif not expanded:
+            left_sign, right_sign, _ = CLAUSE_RULES[type(node), sign]
+            stack.append((node, sign, True))
+            stack.append((node.right, right_sign, False))
+            stack.append((node.left, left_sign, False))
+        else:
+            right = results.pop()
+            left = results.pop()
+            if CLAUSE_RULES[type(node), sign][2]:
+                results.append(clause_product(left, right))
+            else:
+                left.extend(right)
+                results.append(left)
+    return results.pop()
+
+# Kho mệnh đề có chỉ mục literal -> mệnh đề để tìm nhanh cặp hợp giải và kiểm tra bao hàm
+class ClauseStore:
+    def __init__(self):
+        self.clauses = []   # số hiệu -> mệnh đề
+        self.parents = []   # số hiệu -> (i, j) nếu là kết quả hợp giải, chuỗi nguồn gốc nếu là mệnh đề ban đầu
+        self.kept = set()   # các mệnh đề chưa bị bao hàm
+        self.occurs = {}    # literal -> số hiệu các mệnh đề còn giữ chứa literal đó
+        self.active = {}    # literal -> số hiệu các mệnh đề đã xử lý (ứng viên để hợp giải)
+
+    def add(self, clause, parents):
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.parents.append(parents)
+        self.kept.add(index)
+        for literal in clause:
+            self.occurs.setdefault(literal, set()).add(index)
+        return index
+
+    def remove(self, index):
+        self.kept.discard(index)
+        for literal in self.clauses[index]:
+            self.occurs[literal].discard(index)
+            if literal in self.active:
+                self.active[literal].discard(index)
+
+    def activate(self, index):
+        for literal in self.clauses[index]:
+            self.active.setdefault(literal, set()).add(index)
+
+    # Bao hàm xuôi: đã có mệnh đề nào là tập con của clause chưa
+    def is_subsumed(self, clause):
+        if not clause:
+            return False
+        candidates = set()
+        for literal in clause:
+            candidates |= self.occurs.get(literal, set())
+        return any(self.clauses[c] <= clause for c in candidates)
+
+    # Bao hàm ngược: xóa các mệnh đề là tập cha của clause
+    def remove_subsumed_by(self, clause):
+        if not clause:
+            return
+        rarest = min(clause, key=lambda literal: len(self.occurs.get(literal, ())))
+        for c in list(self.occurs.get(rarest, ())):
+            if clause <= self.clauses[c]:
+                self.remove(c)
+
+    # Các mệnh đề dùng để dẫn ra mệnh đề index, theo thứ tự sinh ra
+    def proof(self, index):
+        steps = set()
+        stack = [index]
+        while stack:
+            current = stack.pop()
+            if current in steps:
+                continue
+            steps.add(current)
+            if isinstance(self.parents[current], tuple):
+                stack.extend(self.parents[current])
+        lines = []
+        for current in sorted(steps):
+            parents = self.parents[current]
+            origin = parents if isinstance(parents, str) else f"hợp giải {parents[0] + 1}, {parents[1] + 1}"
+            lines.append(f"{current + 1}. {clause_to_str(self.clauses[current])}   ({origin})")
+        return lines
+
+# Bão hòa theo chiến lược tập hỗ trợ (set of support): chỉ hợp giải mệnh đề lấy ra từ sos
+# với các mệnh đề đã xử lý. Trả về số hiệu mệnh đề rỗng nếu tìm được, None nếu bão hòa
+def saturate(store, usable, support, deadline, support_origin):
+    for clause in usable:
+        if not store.is_subsumed(clause):
+            store.remove_subsumed_by(clause)
+            store.activate(store.add(clause, "giả thiết"))
+    queue = []
+    for clause in support:
+        if not clause:
+            return store.add(clause, support_origin)
+        if not store.is_subsumed(clause):
+            store.remove_subsumed_by(clause)
+            index = store.add(clause, support_origin)
+            heapq.heappush(queue, (len(clause), index))
+
+    while queue:
+        _, given = heapq.heappop(queue)
+        if given not in store.kept:
+            continue
+        if time.monotonic() > deadline or len(store.clauses) > MAX_RESOLUTION_CLAUSES:
+            raise ResolutionBudgetExceeded("Vượt ngân sách hợp giải")
+        store.activate(given)
+        clause = store.clauses[given]
+        for name, sign in clause:
+            for partner in list(store.active.get((name, not sign), ())):
+                if partner not in store.kept or given not in store.kept:
+                    continue
+                resolvent = (clause - {(name, sign)}) | (store.clauses[partner] - {(name, not sign)})
+                if is_tautology(resolvent) or store.is_subsumed(resolvent):
+                    continue
+                store.remove_subsumed_by(resolvent)
+                index = store.add(resolvent, (min(given, partner), max(given, partner)))
+                if not resolvent:
+                    return index
+                heapq.heappush(queue, (len(resolvent), index))
+    return None
+
+# Chứng minh phản chứng: premises ∧ ¬conclusion được chuyển thành tập mệnh đề, tập hỗ trợ là
+# các mệnh đề của ¬conclusion. Trả về ("Đúng", các bước chứng minh), ("Sai", None)
+# hoặc ("Không xác định", None) khi vượt ngân sách
+def resolution_proof(premises, conclusion, time_limit=RESOLUTION_TIME_LIMIT, simplify=False):
+    parsed_premises = [parse_expression(p) for p in premises]
+    parsed_conclusion = parse_expression(conclusion)
+    if simplify:
+        parsed_premises, parsed_conclusion = simplify_query(parsed_premises, parsed_conclusion)
+    deadline = time.monotonic() + time_limit
     try:
-        parsed_premises = [parse_expression(p) for p in premises]
-        negated_conclusion = Not(parse_expression(conclusion))
+        premise_clauses = [c for p in parsed_premises for c in to_clauses(p)]
+        negated_clauses = to_clauses(parsed_conclusion, positive=False)
+
+        store = ClauseStore()
+        empty = saturate(store, premise_clauses, negated_clauses, deadline, "phủ định kết luận")
+        if empty is None:
+            # Tập hỗ trợ chỉ đầy đủ khi các giả thiết nhất quán: kiểm tra riêng các giả thiết
+            store = ClauseStore()
+            empty = saturate(store, [], premise_clauses, deadline, "giả thiết")
+    except ResolutionBudgetExceeded:
+        return "Không xác định", None
+
+    if empty is None:
+        return "Sai", None
+    return "Đúng", store.proof(empty)
+
+# Hàm kiểm tra bằng phương pháp dẫn chứng phản chứng (hợp giải)
+def prove_by_resolution(premises, conclusion, simplify=False):
+    try:
+        result, _ = resolution_proof(premises, conclusion, simplify=simplify)
     except Exception as e:
         return f"Lỗi khi phân tích biểu thức: {e}"
-
-    # Tìm tất cả các biến logic
-    all_variables = set()
-    for p in parsed_premises + [negated_conclusion]:
-        all_variables.update(str(p))
-    variables = sorted(all_variables)
-
-    # Tạo tất cả các tổ hợp giá trị True/False
-    truth_values = list(product([True, False], repeat=len(variables)))
-
-    # Kiểm tra từng tổ hợp
-    for values in truth_values:
-        assignments = dict(zip(variables, values))
-
-        # Đánh giá tất cả các mệnh đề
-        premises_result = all(p.evaluate(**assignments) for p in parsed_premises)
-        negated_conclusion_result = negated_conclusion.evaluate(**assignments)
-
-        # Nếu premises ∧ ¬conclusion đúng trong bất kỳ tổ hợp nào => không mâu thuẫn
-        if premises_result and negated_conclusion_result:
-            return "Sai"
-
-    # Nếu không có tổ hợp nào mà premises ∧ ¬conclusion đúng => chứng minh được
-    return "Đúng"
+    return result
 
 # Chương trình chính
 def main():
@@ -165,10 +333,16 @@ def main():
     print("Chứng minh bằng bảng chân trị:")
     print(f"Kết quả: {truth_table_result}\n")
 
-    # Chứng minh bằng phương pháp dẫn chứng phản chứng
-    resolution_result = prove_by_resolution(premises, conclusion)
+    # Chứng minh bằng phương pháp dẫn chứng phản chứng (hợp giải)
+    try:
+        resolution_result, proof = resolution_proof(premises, conclusion)
+    except Exception as e:
+        resolution_result, proof = f"Lỗi khi phân tích biểu thức: {e}", None
     print("Chứng minh bằng phương pháp dẫn chứng phản chứng:")
     print(f"Kết quả: {resolution_result}")
+    if proof:
+        print("Các bước hợp giải:")
+        print("\n".join(proof))
 
 if __name__ == "__main__":
     main()
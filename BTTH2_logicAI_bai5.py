@@ -1,100 +1,112 @@
 import itertools
 
-class Proposition:
-    def evaluate(self, **assignments):
-        raise NotImplementedError()
-
-class Variable(Proposition):
-    def __init__(self, name):
-        self.name = name
-
-    def evaluate(self, **assignments):
-        return assignments[self.name]
-
-    def __str__(self):
-        return self.name
-
-class Not(Proposition):
-    def __init__(self, child):
-        self.child = child
-
-    def evaluate(self, **assignments):
-        return not self.child.evaluate(**assignments)
-
-    def __str__(self):
-        return f"¬{self.child}"
-
-class And(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) and self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∧ {self.right})"
-
-class Or(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} ∨ {self.right})"
-
-class Implies(Proposition):
-    def __init__(self, left, right):
-        self.left = left
-        self.right = right
-
-    def evaluate(self, **assignments):
-        return not self.left.evaluate(**assignments) or self.right.evaluate(**assignments)
-
-    def __str__(self):
-        return f"({self.left} → {self.right})"
-
-def parse_expression(expr_str):
-    expr_str = expr_str.replace(" ", "")  # Xóa khoảng trắng
-    stack = []
-    operators = {"¬": Not, "∧": And, "∨": Or, "→": Implies}
-
-    i = 0
-    while i < len(expr_str):
-        if expr_str[i].isalpha():  # Biến logic (A, B, C, ...)
-            stack.append(Variable(expr_str[i]))
-        elif expr_str[i] in operators:  # Toán tử logic
-            op = operators[expr_str[i]]
-            if expr_str[i] == "¬":  # Toán tử một ngôi
-                operand = stack.pop()
-                stack.append(op(operand))
-            else:  # Toán tử hai ngôi
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(op(left, right))
-        elif expr_str[i] == "(" or expr_str[i] == ")":
-            pass  # Bỏ qua dấu ngoặc (đã xử lý trong chuỗi)
-        i += 1
-    return stack.pop()
-
-def find_model(expr_str):
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_count import count_cnf
+from BTTH2_logicAI_parallel import parallel_find_model
+from BTTH2_logicAI_sat import CNF, Solver
+from BTTH2_logicAI_simplify import simplify_logged
+from BTTH2_logicAI_walksat import NOISE, MAX_FLIPS, RESTARTS, walksat
+
+# Tìm một mẫu giá trị thỏa mãn biểu thức.
+# method="cdcl": mã hóa Tseitin sang CNF rồi giải bằng CDCL (mặc định);
+# method="enumerate": duyệt lần lượt 2^n tổ hợp như cách làm ban đầu;
+# với workers > 1 các tổ hợp được chia cho nhiều tiến trình, kết quả vẫn là mẫu đầu tiên.
+# method="walksat": tìm kiếm cục bộ ngẫu nhiên trên CNF (noise, max_flips, restarts, seed); không đầy đủ
+# nên có thể không tìm được mẫu dù biểu thức thỏa mãn; với workers > 1 chạy song song các hạt giống
+# seed, seed + 1, ... và lấy mô hình tìm được đầu tiên.
+# simplify=True: rút gọn biểu thức trước (biến bị rút gọn mất nhận giá trị False trong mẫu);
+# số nút trước/sau được ghi vào logger của BTTH2_logicAI_simplify
+def find_model(expr_str, method="cdcl", workers=None, simplify=False,
+               noise=NOISE, max_flips=MAX_FLIPS, restarts=RESTARTS, seed=0):
     try:
         expression = parse_expression(expr_str)
     except Exception as e:
         return f"Lỗi khi phân tích biểu thức: {e}"
 
-    variables = sorted({char for char in expr_str if char.isalpha()})
-
-    for values in itertools.product([False, True], repeat=len(variables)):
-        assignments = dict(zip(variables, values))
-        if expression.evaluate(**assignments):
-            return assignments
+    variables = sorted(expression.variables())
+    if simplify:
+        expression = simplify_logged(expression)
+
+    if method == "enumerate" and workers is not None and workers > 1:
+        model = parallel_find_model(expression, variables, workers)
+        return model if model is not None else "Không có mẫu giá trị nào thỏa mãn."
+
+    if method == "enumerate":
+        evaluate = expression.compile(variables)
+        for values in itertools.product([False, True], repeat=len(variables)):
+            if evaluate(values):
+                return dict(zip(variables, values))
+        return "Không có mẫu giá trị nào thỏa mãn."
+
+    cnf = CNF()
+    cnf.add(expression)
+    if method == "walksat":
+        model = walksat(cnf.clauses, cnf.num_vars, workers, seed, noise, max_flips, restarts)
+        if model is None:
+            return "Không tìm được mẫu giá trị (WalkSAT hết số bước lật; biểu thức có thể không thỏa mãn)."
+        return {name: name in cnf.names and model[cnf.names[name]] for name in variables}
+
+    solver = Solver()
+    solver.add_cnf(cnf)
+    if solver.solve():
+        return {name: name in cnf.names and solver.value(cnf.names[name]) for name in variables}
 
     return "Không có mẫu giá trị nào thỏa mãn."
 
+# Duyệt lần lượt mọi mẫu giá trị thỏa mãn (generator, chỉ tính mẫu tiếp theo khi được yêu cầu).
+# method="cdcl": sau mỗi mô hình thêm mệnh đề chặn (phủ định phép gán các biến logic) vào bộ giải
+# tăng dần rồi giải tiếp, nên số lần gọi bộ giải bằng số mô hình chứ không phải 2^n;
+# biến không còn trong CNF (bị rút gọn mất) nhận cả hai giá trị.
+# method="enumerate": duyệt 2^n tổ hợp theo thứ tự product([False, True]).
+# Biểu thức sai cú pháp gây ValueError
+def iter_models(expr_str, method="cdcl", simplify=False):
+    try:
+        expression = parse_expression(expr_str)
+    except Exception as e:
+        raise ValueError(f"Lỗi khi phân tích biểu thức: {e}") from e
+
+    variables = sorted(expression.variables())
+    if simplify:
+        expression = simplify_logged(expression)
+
+    if method == "enumerate":
+        evaluate = expression.compile(variables)
+        for values in itertools.product([False, True], repeat=len(variables)):
+            if evaluate(values):
+                yield dict(zip(variables, values))
+        return
+
+    cnf = CNF()
+    cnf.add(expression)
+    solver = Solver()
+    solver.add_cnf(cnf)
+    encoded = [name for name in variables if name in cnf.names]
+    missing = [name for name in variables if name not in cnf.names]
+    while solver.solve():
+        model = {name: solver.value(cnf.names[name]) for name in encoded}
+        for values in itertools.product([False, True], repeat=len(missing)):
+            model.update(zip(missing, values))
+            yield {name: model[name] for name in variables}
+        if not encoded:
+            return
+        solver.add_clause([-cnf.names[name] if model[name] else cnf.names[name] for name in encoded])
+
+# Đếm chính xác số mẫu giá trị thỏa mãn (#SAT) trên các biến của biểu thức, không liệt kê từng mẫu:
+# đếm trên CNF Tseitin bằng DPLL có tách thành phần độc lập và bộ nhớ đệm (xem BTTH2_logicAI_count)
+def count_models(expr_str, simplify=False):
+    try:
+        expression = parse_expression(expr_str)
+    except Exception as e:
+        return f"Lỗi khi phân tích biểu thức: {e}"
+
+    variables = expression.variables()
+    if simplify:
+        expression = simplify_logged(expression)
+
+    cnf = CNF()
+    cnf.add(expression)
+    return count_cnf(cnf) << sum(1 for name in variables if name not in cnf.names)
+
 def main():
     expr_str = input("Nhập biểu thức logic (ví dụ: (A ∨ B) ∧ (¬A ∨ C)): ")
 
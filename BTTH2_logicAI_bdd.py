@@ -0,0 +1,294 @@
+# Biểu đồ quyết định nhị phân rút gọn có thứ tự (ROBDD) cho các biểu thức logic mệnh đề.
+# Mỗi hàm Boolean (với một thứ tự biến cố định) có đúng một nút gốc, nên kiểm tra hằng đúng
+# và tương đương chỉ là so sánh hai số hiệu nút.
+from itertools import product
+
+FALSE = 0
+TRUE = 1
+
+# Kích thước mặc định của bộ nhớ đệm ITE (số ô, ánh xạ trực tiếp)
+CACHE_SIZE = 1 << 16
+
+class BDD:
+    def __init__(self, order, cache_size=CACHE_SIZE):
+        self.order = list(order)                     # mức -> tên biến
+        self.level_of = {name: i for i, name in enumerate(self.order)}
+        terminal = len(self.order)
+        self.levels = [terminal, terminal]           # số hiệu nút -> mức của biến
+        self.lows = [FALSE, TRUE]                    # nhánh biến = False
+        self.highs = [FALSE, TRUE]                   # nhánh biến = True
+        self.unique = {}                             # (mức, low, high) -> số hiệu nút
+        # Bộ nhớ đệm ITE kích thước cố định: ô mới ghi đè ô cũ khi trùng vị trí
+        self.cache = [None] * cache_size
+        self.cache_mask = cache_size - 1
+
+    # Lấy (hoặc tạo) nút duy nhất cho bộ ba (mức, low, high)
+    def node(self, level, low, high):
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = len(self.levels)
+            self.levels.append(level)
+            self.lows.append(low)
+            self.highs.append(high)
+            self.unique[key] = u
+        return u
+
+    def var(self, name):
+        return self.node(self.level_of[name], FALSE, TRUE)
+
+    def cofactors(self, u, level):
+        if self.levels[u] == level:
+            return self.lows[u], self.highs[u]
+        return u, u
+
+    # Phép toán if-then-else, mọi phép toán hai ngôi đều quy về ITE
+    def ite(self, f, g, h):
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        key = (f, g, h)
+        slot = hash(key) & self.cache_mask
+        entry = self.cache[slot]
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        levels = self.levels
+        top = min(levels[f], levels[g], levels[h])
+        f0, f1 = self.cofactors(f, top)
+        g0, g1 = self.cofactors(g, top)
+        h0, h1 = self.cofactors(h, top)
+        result = self.node(top, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self.cache[slot] = (key, result)
+        return result
+
+    def negate(self, f):
+        return self.ite(f, FALSE, TRUE)
+
+    def conjoin(self, f, g):
+        return self.ite(f, g, FALSE)
+
+    def disjoin(self, f, g):
+        return self.ite(f, TRUE, g)
+
+    def implies(self, f, g):
+        return self.ite(f, g, TRUE)
+
+    # Dựng BDD từ cây biểu thức (duyệt hậu thứ tự bằng ngăn xếp, nút con dùng chung chỉ dựng một lần)
+    def build(self, expr):
+        built = {}
+        stack = [expr]
+        while stack:
+            current = stack[-1]
+            if current in built:
+                stack.pop()
+                continue
+            kind = type(current).__name__
+            if kind == "Variable":
+                built[current] = self.var(current.name)
+                stack.pop()
+                continue
+            if kind == "Constant":
+                built[current] = TRUE if current.value else FALSE
+                stack.pop()
+                continue
+            children = [current.child] if kind == "Not" else [current.left, current.right]
+            pending = [child for child in children if child not in built]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if kind == "Not":
+                built[current] = self.negate(built[current.child])
+            elif kind == "And":
+                built[current] = self.conjoin(built[current.left], built[current.right])
+            elif kind == "Or":
+                built[current] = self.disjoin(built[current.left], built[current.right])
+            elif kind == "Implies":
+                built[current] = self.implies(built[current.left], built[current.right])
+            else:
+                raise ValueError(f"Không dựng được BDD cho nút {kind}")
+        return built[expr]
+
+    # Thu hẹp: thay biến name bằng hằng value
+    def restrict(self, f, name, value):
+        level = self.level_of[name]
+        memo = {}
+        def walk(u):
+            if self.levels[u] > level:
+                return u
+            if u in memo:
+                return memo[u]
+            if self.levels[u] == level:
+                result = self.highs[u] if value else self.lows[u]
+            else:
+                result = self.node(self.levels[u], walk(self.lows[u]), walk(self.highs[u]))
+            memo[u] = result
+            return result
+        return walk(f)
+
+    # Đếm số mô hình trên toàn bộ các biến của thứ tự, tuyến tính theo số nút
+    def count(self, f):
+        levels, lows, highs = self.levels, self.lows, self.highs
+        memo = {FALSE: 0, TRUE: 1}
+        def walk(u):
+            if u in memo:
+                return memo[u]
+            low, high = lows[u], highs[u]
+            result = (walk(low) << (levels[low] - levels[u] - 1)) + (walk(high) << (levels[high] - levels[u] - 1))
+            memo[u] = result
+            return result
+        return walk(f) << levels[f]
+
+    def size(self, f):
+        seen = set()
+        stack = [f]
+        while stack:
+            u = stack.pop()
+            if u in seen or u <= TRUE:
+                continue
+            seen.add(u)
+            stack.append(self.lows[u])
+            stack.append(self.highs[u])
+        return len(seen)
+
+    def evaluate(self, f, assignments):
+        while f > TRUE:
+            f = self.highs[f] if assignments[self.order[self.levels[f]]] else self.lows[f]
+        return f == TRUE
+
+    # Cột kết quả của bảng chân trị theo các biến từ mức level trở đi, đóng gói thành số nguyên:
+    # bit r là kết quả của dòng r, các dòng xếp theo product([True, False]) như truth_table
+    def truth_bits(self, f, level, memo):
+        key = (f, level)
+        if key in memo:
+            return memo[key]
+        rows = 1 << (len(self.order) - level)
+        if f <= TRUE:
+            result = (1 << rows) - 1 if f == TRUE else 0
+        else:
+            half = rows >> 1
+            if self.levels[f] > level:
+                low = high = self.truth_bits(f, level + 1, memo)
+            else:
+                low = self.truth_bits(self.lows[f], level + 1, memo)
+                high = self.truth_bits(self.highs[f], level + 1, memo)
+            result = high | (low << half)
+        memo[key] = result
+        return result
+
+    # Giống truth_table_blocks trong bài 2 nhưng đọc kết quả từ BDD: cố định các biến đầu
+    # bằng cách đi xuống từ gốc, phần còn lại của khối lấy từ truth_bits (dùng lại giữa các khối)
+    def truth_table_blocks(self, f, block_bits):
+        n = len(self.order)
+        low_count = min(n, block_bits)
+        high_count = n - low_count
+        memo = {}
+        for high_values in product([True, False], repeat=high_count):
+            u = f
+            for level, value in enumerate(high_values):
+                if self.levels[u] == level:
+                    u = self.highs[u] if value else self.lows[u]
+            yield high_values, 1 << low_count, self.truth_bits(u, high_count, memo)
+
+# ---- Các heuristic chọn thứ tự biến ----
+
+def occurrences(expr):
+    counts = {}
+    order = []
+    stack = [expr]
+    while stack:
+        current = stack.pop()
+        kind = type(current).__name__
+        if kind == "Variable":
+            if current.name not in counts:
+                counts[current.name] = 0
+                order.append(current.name)
+            counts[current.name] += 1
+        elif kind == "Not":
+            stack.append(current.child)
+        elif kind != "Constant":
+            stack.append(current.right)
+            stack.append(current.left)
+    return order, counts
+
+# Thứ tự bảng chữ cái
+def sorted_order(expr):
+    return sorted(occurrences(expr)[0])
+
+# Thứ tự xuất hiện khi duyệt sâu từ trái sang phải: các biến đứng gần nhau trong biểu thức
+# thường liên quan đến nhau nên được đặt gần nhau
+def appearance_order(expr):
+    return occurrences(expr)[0]
+
+# Biến xuất hiện nhiều nhất đặt lên trên
+def frequency_order(expr):
+    order, counts = occurrences(expr)
+    return sorted(order, key=lambda name: -counts[name])
+
+def bdd_size(expr, order):
+    manager = BDD(order)
+    return manager.size(manager.build(expr))
+
+# Sifting: lần lượt lấy từng biến (nhiều lần xuất hiện trước), thử đặt nó ở mọi vị trí
+# và giữ vị trí cho BDD nhỏ nhất. Mỗi vị trí được đánh giá bằng cách dựng lại BDD,
+# nên chi phí là O(n^2) lần dựng; phù hợp với số biến vừa phải
+def sifting_order(expr, passes=1):
+    order, counts = occurrences(expr)
+    best = bdd_size(expr, order)
+    for _ in range(passes):
+        improved = False
+        for name in sorted(order, key=lambda name: -counts[name]):
+            rest = [other for other in order if other != name]
+            for position in range(len(order)):
+                candidate = rest[:position] + [name] + rest[position:]
+                if candidate == order:
+                    continue
+                size = bdd_size(expr, candidate)
+                if size < best:
+                    best, order, improved = size, candidate, True
+        if not improved:
+            break
+    return order
+
+ORDERINGS = {
+    "sorted": sorted_order,
+    "appearance": appearance_order,
+    "frequency": frequency_order,
+    "sifting": sifting_order,
+}
+
+# Dựng BDD cho một hoặc nhiều biểu thức trong cùng một bộ quản lý.
+# order là danh sách biến cho sẵn hoặc tên một heuristic trong ORDERINGS
+def build_bdd(exprs, order="appearance"):
+    if isinstance(order, str):
+        if len(exprs) == 1:
+            order = ORDERINGS[order](exprs[0])
+        else:
+            # Các biến dùng chung một thứ tự: áp dụng heuristic cho phép hội của các biểu thức
+            names = []
+            for expr in exprs:
+                for name in ORDERINGS[order](expr):
+                    if name not in names:
+                        names.append(name)
+            order = names
+    manager = BDD(order)
+    return manager, [manager.build(expr) for expr in exprs]
+
+def is_tautology(expr, order="appearance"):
+    _, (root,) = build_bdd([expr], order)
+    return root == TRUE
+
+def equivalent(left, right, order="appearance"):
+    _, (a, b) = build_bdd([left, right], order)
+    return a == b
+
+def count_models(expr, order="appearance"):
+    manager, (root,) = build_bdd([expr], order)
+    return manager.count(root)
@@ -0,0 +1,236 @@
+# Chế độ chạy hàng loạt không tương tác: đọc các công việc dạng JSONL (mỗi dòng một đối tượng JSON)
+# từ tệp hoặc stdin, chạy trên một nhóm tiến trình và ghi kết quả dạng JSONL theo đúng thứ tự đầu vào.
+#   python BTTH2_logicAI_bulk.py jobs.jsonl -o results.jsonl --workers 8 --timeout 5
+#   cat jobs.jsonl | python BTTH2_logicAI_bulk.py > results.jsonl
+# Các loại công việc (trường "task"), trường "id" (tùy chọn) được chép sang kết quả:
+#   {"task": "evaluate", "expression": "A ∧ B", "assignments": {"A": true, "B": false}}
+#   {"task": "truth_table", "expression": "A → B"}                  -> {"variables": [...], "rows": "1011"}
+#   {"task": "entail", "premises": ["A", "A → B"], "conclusion": "B", "method": "truth_table", "backend": "sat"}
+#   {"task": "find_model", "expression": "(A ∨ B) ∧ ¬A", "method": "cdcl"}
+#   {"task": "first_order", "formula": "∀x (P(x) → Q(x))", "domain": [1, 2, 3],
+#    "predicates": {"P": [2, 3], "Q": [[1], [2], [3]]}, "mode": "vector", "plan": true}
+# Vị từ của first_order được cho bằng danh sách các bộ làm vị từ đúng (vị từ một ngôi có thể ghi giá trị trơn).
+# Mỗi dòng kết quả: {"id": ..., "ok": true, "result": ..., "seconds": ...} hoặc {"id": ..., "ok": false, "error": ...}.
+# Các dòng được gửi cho tiến trình con theo lô; chỉ giữ tối đa window lô đang chờ (backpressure):
+# đầu vào được đọc dần theo tốc độ xử lý chứ không đọc hết vào bộ nhớ.
+# Thống kê (thông lượng, độ trễ) được in ra stderr khi kết thúc.
+# Các công việc gọi thẳng các hàm để lỗi thành ngoại lệ (kết quả "ok": false) thay vì các hàm bọc trả về
+# chuỗi "Lỗi ..." của chương trình tương tác, và không hàm nào trên đường chạy công việc in ra stdout
+# (stdout có thể chính là luồng JSONL kết quả).
+import argparse
+import collections
+import json
+import multiprocessing
+import signal
+import sys
+import time
+
+from BTTH2_logicAI_bai2 import result_bits, truth_table_blocks
+from BTTH2_logicAI_bai3 import Relation, check_formula
+from BTTH2_logicAI_bai4 import prove_by_truth_table, resolution_proof
+from BTTH2_logicAI_bai5 import find_model
+from BTTH2_logicAI_bdd import BDD
+from BTTH2_logicAI_core import block_layout, parse_expression
+
+# Số lô công việc đang chờ tối đa cho mỗi tiến trình
+WINDOW_PER_WORKER = 4
+
+# Số dòng gửi sang tiến trình con trong một lần (giảm chi phí truyền qua lại cho các công việc nhỏ)
+CHUNK_SIZE = 16
+
+def run_evaluate(job):
+    return parse_expression(job["expression"]).evaluate(**job.get("assignments", {}))
+
+# Bảng chân trị thành chuỗi bit 1/0 theo thứ tự dòng của truth_table
+def run_truth_table(job):
+    expression = parse_expression(job["expression"])
+    variables = sorted(expression.variables())
+    if job.get("backend", "bits") == "bdd":
+        manager = BDD(variables)
+        blocks = manager.truth_table_blocks(manager.build(expression), block_layout(len(variables))[1])
+    else:
+        blocks = truth_table_blocks(expression, variables)
+    return {"variables": variables, "rows": "".join(result_bits(result, size) for _, size, result in blocks)}
+
+def run_entail(job):
+    if job.get("method", "truth_table") == "resolution":
+        result, _ = resolution_proof(job["premises"], job["conclusion"])
+        return result
+    # Phân tích trước để lỗi cú pháp thành ngoại lệ (prove_by_truth_table dùng lại kết quả đã lưu đệm)
+    for text in list(job["premises"]) + [job["conclusion"]]:
+        parse_expression(text)
+    return prove_by_truth_table(job["premises"], job["conclusion"], backend=job.get("backend", "enumerate"))
+
+def run_find_model(job):
+    parse_expression(job["expression"])
+    options = {name: job[name] for name in ("method", "noise", "max_flips", "restarts", "seed") if name in job}
+    return find_model(job["expression"], **options)
+
+# Vị từ cho bằng danh sách bộ -> quan hệ đánh chỉ mục; giá trị trơn là bộ một phần tử
+def relation_from_rows(rows):
+    rows = [tuple(row) if isinstance(row, list) else (row,) for row in rows]
+    if not rows:
+        return Relation([[]])
+    return Relation([list(column) for column in zip(*rows)])
+
+def run_first_order(job):
+    predicates = {name: relation_from_rows(rows) for name, rows in job.get("predicates", {}).items()}
+    return check_formula(job["formula"], job["domain"], predicates,
+                         mode=job.get("mode", "loop"), plan=job.get("plan", False))
+
+TASKS = {
+    "evaluate": run_evaluate,
+    "truth_table": run_truth_table,
+    "entail": run_entail,
+    "find_model": run_find_model,
+    "first_order": run_first_order,
+}
+
+# Kế thừa BaseException để các khối except Exception bên trong thư viện không nuốt mất
+class JobTimeout(BaseException):
+    pass
+
+def on_alarm(signum, frame):
+    raise JobTimeout()
+
+# Chạy một dòng đầu vào, trả về dòng kết quả (chuỗi JSON) và thời gian chạy.
+# Giới hạn thời gian dùng bộ hẹn giờ SIGALRM (chỉ có trên Unix; nơi khác công việc chạy không giới hạn)
+def run_line(line, timeout=None):
+    start = time.perf_counter()
+    job_id = None
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    try:
+        job = json.loads(line)
+        job_id = job.get("id")
+        task = TASKS.get(job.get("task"))
+        if task is None:
+            raise ValueError(f"Không có loại công việc {job.get('task')!r}")
+        if use_alarm:
+            signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            result = task(job)
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        output = {"id": job_id, "ok": True, "result": result}
+    except JobTimeout:
+        output = {"id": job_id, "ok": False, "error": f"Quá thời gian {timeout}s"}
+    except Exception as e:
+        output = {"id": job_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    seconds = time.perf_counter() - start
+    output["seconds"] = round(seconds, 6)
+    return json.dumps(output, ensure_ascii=False), seconds, output["ok"]
+
+def run_chunk(lines, timeout=None):
+    return [run_line(line, timeout) for line in lines]
+
+# Phân vị p (0..100) của danh sách đã sắp xếp
+def percentile(values, p):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+class Stats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.service = []   # thời gian chạy trong tiến trình con
+        self.latency = []   # từ lúc đọc dòng đến lúc ghi kết quả
+        self.failed = 0
+
+    def add(self, seconds, latency, ok):
+        self.service.append(seconds)
+        self.latency.append(latency)
+        if not ok:
+            self.failed += 1
+
+    def report(self):
+        elapsed = time.perf_counter() - self.start
+        count = len(self.service)
+        lines = [f"Số công việc: {count} (lỗi/quá thời gian: {self.failed})",
+                 f"Tổng thời gian: {elapsed:.3f}s, thông lượng: {count / elapsed if elapsed else 0:.1f} công việc/s"]
+        for name, values in (("Thời gian chạy", self.service), ("Độ trễ", self.latency)):
+            values = sorted(values)
+            lines.append(f"{name} (ms): p50 {percentile(values, 50) * 1e3:.2f}, p95 {percentile(values, 95) * 1e3:.2f}, "
+                         f"p99 {percentile(values, 99) * 1e3:.2f}, max {(values[-1] if values else 0) * 1e3:.2f}")
+        return "\n".join(lines)
+
+def job_lines(source):
+    for line in source:
+        if line.strip():
+            yield line
+
+# Gom các dòng thành lô tối đa size dòng
+def chunks(lines, size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Chạy các dòng công việc của source, ghi kết quả vào sink; trả về Stats.
+# workers <= 1 chạy ngay trong tiến trình hiện tại; ngược lại các lô chunk_size dòng được gửi cho nhóm tiến trình
+def run_bulk(source, sink, workers=None, timeout=None, window=None, chunk_size=CHUNK_SIZE):
+    stats = Stats()
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers <= 1:
+        for line in job_lines(source):
+            start = time.perf_counter()
+            text, seconds, ok = run_line(line, timeout)
+            sink.write(text + "\n")
+            stats.add(seconds, time.perf_counter() - start, ok)
+        return stats
+
+    if window is None:
+        window = workers * WINDOW_PER_WORKER
+    pending = collections.deque()
+
+    def flush_oldest():
+        start, result = pending.popleft()
+        outputs = result.get()
+        latency = time.perf_counter() - start
+        sink.write("".join(text + "\n" for text, _, _ in outputs))
+        for _, seconds, ok in outputs:
+            stats.add(seconds, latency, ok)
+
+    with multiprocessing.Pool(workers) as pool:
+        for chunk in chunks(job_lines(source), chunk_size):
+            if len(pending) >= window:
+                flush_oldest()
+            pending.append((time.perf_counter(), pool.apply_async(run_chunk, (chunk, timeout))))
+            # Ghi ngay các kết quả đầu hàng đã xong để giữ độ trễ thấp
+            while pending and pending[0][1].ready():
+                flush_oldest()
+        while pending:
+            flush_oldest()
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy hàng loạt các công việc logic dạng JSONL")
+    parser.add_argument("input", nargs="?", help="tệp JSONL đầu vào (mặc định stdin)")
+    parser.add_argument("-o", "--output", help="tệp JSONL kết quả (mặc định stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình (mặc định số lõi CPU)")
+    parser.add_argument("--timeout", type=float, default=None, help="giới hạn thời gian mỗi công việc (giây)")
+    parser.add_argument("--window", type=int, default=None, help="số lô công việc đang chờ tối đa")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="số công việc mỗi lô gửi cho tiến trình con")
+    args = parser.parse_args(argv)
+
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    sink = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = run_bulk(source, sink, args.workers, args.timeout, args.window, args.chunk_size)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            sink.close()
+        else:
+            sink.flush()
+    print(stats.report(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
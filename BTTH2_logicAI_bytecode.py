@@ -0,0 +1,299 @@
+# Mã hậu tố (postfix) gọn cho biểu thức logic mệnh đề và tệp kho biểu thức đọc qua mmap.
+# Mỗi lệnh là một số nguyên 32 bit: 3 bit thấp là mã lệnh, phần còn lại là toán hạng
+# (số hiệu biến trong bảng ký hiệu, hoặc 0/1 với hằng). Biểu thức A ∧ ¬B được mã thành
+#   VAR 0, VAR 1, NOT, AND
+# và được tính bằng một vòng lặp máy ngăn xếp, không đệ quy, không tạo đối tượng nút.
+# Giá trị là số nguyên: 0/1 cho một phép gán, hoặc cột bit (bit r là dòng r, full là mặt nạ toàn 1)
+# để tính nhiều phép gán cùng lúc như bitmask của các nút.
+#
+# Tệp kho (little-endian, các mảng căn theo 8 byte):
+#   CORPUS_MAGIC, phiên bản (4 byte), số ký hiệu (4 byte), số biểu thức n (8 byte), số lệnh (8 byte)
+#   bảng ký hiệu: với mỗi tên, độ dài (4 byte) + UTF-8
+#   n + 1 vị trí bắt đầu (8 byte mỗi số) trong mảng lệnh, rồi mảng lệnh (4 byte mỗi lệnh)
+# Corpus mở tệp bằng mmap và đọc lệnh trực tiếp trên vùng nhớ ánh xạ (memoryview), không sao chép
+# và không phân tích lại, nên mở một kho 10^6 biểu thức chỉ tốn thời gian đọc bảng ký hiệu.
+import mmap
+import sys
+from array import array
+
+from BTTH2_logicAI_core import (BINARY_OPERATORS, CONSTANTS, NOT_PRECEDENCE, Constant, Variable, Not, And, Or,
+                                Implies, tokenize)
+
+VAR, CONST, NOT, AND, OR, IMPLIES = range(6)
+OPCODE_BITS = 3
+OPCODE_MASK = (1 << OPCODE_BITS) - 1
+
+# Mã lệnh của các toán tử và của các lớp nút
+OPERATOR_OPCODES = {"¬": NOT, "∧": AND, "∨": OR, "→": IMPLIES}
+NODE_OPCODES = {Not: NOT, And: AND, Or: OR, Implies: IMPLIES}
+OPCODE_NODES = {NOT: Not, AND: And, OR: Or, IMPLIES: Implies}
+
+CORPUS_MAGIC = b"LGC1"
+CORPUS_VERSION = 1
+
+# Bảng ký hiệu: tên biến <-> số hiệu
+class SymbolTable:
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.id(name)
+
+    def id(self, name):
+        index = self.ids.get(name)
+        if index is None:
+            index = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def __len__(self):
+        return len(self.names)
+
+# Dịch thẳng chuỗi biểu thức sang mã hậu tố bằng thuật toán shunting-yard (cùng độ ưu tiên và cách
+# kết hợp như parse_expression) mà không dựng cây nút
+def assemble(expr_str, symbols, code=None):
+    if code is None:
+        code = array("I")
+    emit = code.append
+    operators = []
+    depth = 0   # số giá trị trên ngăn xếp khi chạy đến đây (để kiểm tra biểu thức đủ toán hạng)
+
+    def reduce():
+        nonlocal depth
+        operator = operators.pop()
+        emit(OPERATOR_OPCODES[operator])
+        if operator != "¬":
+            depth -= 1
+
+    expect_operand = True
+    for kind, text, position in tokenize(expr_str):
+        if expect_operand:
+            if kind == "name":
+                emit(symbols.id(text) << OPCODE_BITS | VAR)
+                depth += 1
+                expect_operand = False
+            elif text in CONSTANTS:
+                emit(CONSTANTS[text] << OPCODE_BITS | CONST)
+                depth += 1
+                expect_operand = False
+            elif text == "¬" or text == "(":
+                operators.append(text)
+            else:
+                raise ValueError(f"Thiếu toán hạng trước '{text}' tại vị trí {position}")
+        elif text in BINARY_OPERATORS:
+            precedence, _, right_associative = BINARY_OPERATORS[text]
+            while operators and operators[-1] != "(":
+                top = operators[-1]
+                top_precedence = NOT_PRECEDENCE if top == "¬" else BINARY_OPERATORS[top][0]
+                if top_precedence > precedence or (top_precedence == precedence and not right_associative):
+                    reduce()
+                else:
+                    break
+            operators.append(text)
+            expect_operand = True
+        elif text == ")":
+            while operators and operators[-1] != "(":
+                reduce()
+            if not operators:
+                raise ValueError(f"Thừa dấu ')' tại vị trí {position}")
+            operators.pop()
+        else:
+            raise ValueError(f"Thiếu toán tử trước '{text}' tại vị trí {position}")
+
+    if expect_operand:
+        raise ValueError("Biểu thức rỗng hoặc kết thúc bằng toán tử")
+    while operators:
+        if operators[-1] == "(":
+            raise ValueError("Thiếu dấu ')'")
+        reduce()
+    return code
+
+# Hạ một cây nút (Proposition) xuống mã hậu tố (duyệt hậu thứ tự bằng ngăn xếp)
+def lower(expr, symbols, code=None):
+    if code is None:
+        code = array("I")
+    emit = code.append
+    stack = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if isinstance(node, Variable):
+            emit(symbols.id(node.name) << OPCODE_BITS | VAR)
+        elif isinstance(node, Constant):
+            emit(node.value << OPCODE_BITS | CONST)
+        elif expanded:
+            emit(NODE_OPCODES[type(node)])
+        else:
+            stack.append((node, True))
+            if isinstance(node, Not):
+                stack.append((node.child, False))
+            else:
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+    return code
+
+# Dựng lại cây nút từ mã hậu tố
+def to_expression(code, names):
+    stack = []
+    for word in code:
+        opcode = word & OPCODE_MASK
+        if opcode == VAR:
+            stack.append(Variable(names[word >> OPCODE_BITS]))
+        elif opcode == CONST:
+            stack.append(Constant(word >> OPCODE_BITS))
+        elif opcode == NOT:
+            stack.append(Not(stack.pop()))
+        else:
+            right = stack.pop()
+            stack.append(OPCODE_NODES[opcode](stack.pop(), right))
+    return stack.pop()
+
+# Máy ngăn xếp: values[i] là giá trị (0/1 hoặc cột bit) của biến số hiệu i
+def run(code, values, full=1):
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for word in code:
+        opcode = word & OPCODE_MASK
+        if opcode == VAR:
+            push(values[word >> OPCODE_BITS])
+        elif opcode == AND:
+            right = pop()
+            stack[-1] &= right
+        elif opcode == OR:
+            right = pop()
+            stack[-1] |= right
+        elif opcode == NOT:
+            stack[-1] ^= full
+        elif opcode == IMPLIES:
+            right = pop()
+            stack[-1] = (stack[-1] ^ full) | right
+        else:
+            push(full if word >> OPCODE_BITS else 0)
+    return stack[-1]
+
+# ---- Tệp kho biểu thức ----
+
+def padding(size):
+    return b"\0" * (-size % 8)
+
+# Ghi một dãy biểu thức (chuỗi hoặc cây nút) vào tệp kho
+def write_corpus(path, expressions):
+    symbols = SymbolTable()
+    code = array("I")
+    offsets = array("Q", [0])
+    for expr in expressions:
+        if isinstance(expr, str):
+            assemble(expr, symbols, code)
+        else:
+            lower(expr, symbols, code)
+        offsets.append(len(code))
+    if sys.byteorder != "little":
+        code.byteswap()
+        offsets.byteswap()
+    with open(path, "wb") as file:
+        header = (CORPUS_MAGIC + CORPUS_VERSION.to_bytes(4, "little") + len(symbols).to_bytes(4, "little")
+                  + (len(offsets) - 1).to_bytes(8, "little") + len(code).to_bytes(8, "little"))
+        file.write(header)
+        table = b"".join(len(data).to_bytes(4, "little") + data
+                         for data in (name.encode("utf-8") for name in symbols.names))
+        file.write(table + padding(len(header) + len(table)))
+        offsets.tofile(file)
+        code.tofile(file)
+    return len(offsets) - 1
+
+# Bảng số hiệu biến -> 0/1 cho run, điền dần: số hiệu chưa có được tra trong assignments theo tên
+class SymbolValues(dict):
+    def __init__(self, names, assignments, default=None):
+        super().__init__()
+        self.names = names
+        self.assignments = assignments
+        self.default = default
+
+    def __missing__(self, index):
+        name = self.names[index]
+        if self.default is None:
+            value = self.assignments[name]
+        else:
+            value = self.assignments.get(name, self.default)
+        value = self[index] = int(bool(value))
+        return value
+
+class Corpus:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self.buffer = memoryview(self.map)
+        if data[:4] != CORPUS_MAGIC:
+            self.close()
+            raise ValueError(f"Tệp {path} không phải kho biểu thức")
+        version = int.from_bytes(data[4:8], "little")
+        if version != CORPUS_VERSION:
+            self.close()
+            raise ValueError(f"Không đọc được kho biểu thức phiên bản {version}")
+        symbol_count = int.from_bytes(data[8:12], "little")
+        self.count = int.from_bytes(data[12:20], "little")
+        words = int.from_bytes(data[20:28], "little")
+        position = 28
+        self.names = []
+        for _ in range(symbol_count):
+            size = int.from_bytes(data[position:position + 4], "little")
+            self.names.append(str(data[position + 4:position + 4 + size], "utf-8"))
+            position += 4 + size
+        position += -position % 8
+        self.ids = {name: index for index, name in enumerate(self.names)}
+        offsets_end = position + 8 * (self.count + 1)
+        if sys.byteorder == "little":
+            self.offsets = data[position:offsets_end].cast("Q")
+            self.code = data[offsets_end:offsets_end + 4 * words].cast("I")
+        else:
+            # Máy big-endian: phải đổi thứ tự byte nên đọc ra bản sao
+            self.offsets = array("Q", data[position:offsets_end])
+            self.offsets.byteswap()
+            self.code = array("I", data[offsets_end:offsets_end + 4 * words])
+            self.code.byteswap()
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Các lát cắt lấy từ instructions() phải được bỏ trước khi đóng: nếu còn, vùng ánh xạ không đóng được
+    # (BufferError, tệp vẫn được đóng) và chỉ được giải phóng khi lát cắt cuối cùng bị thu hồi
+    def close(self):
+        try:
+            for view in ("code", "offsets", "buffer"):
+                value = getattr(self, view, None)
+                if isinstance(value, memoryview):
+                    value.release()
+            self.map.close()
+        finally:
+            self.file.close()
+
+    # Mã của biểu thức thứ index (lát cắt memoryview, không sao chép)
+    def instructions(self, index):
+        return self.code[self.offsets[index]:self.offsets[index + 1]]
+
+    def expression(self, index):
+        return to_expression(self.instructions(index), self.names)
+
+    # Giá trị của các biến theo số hiệu, chỉ tra trong assignments khi mã dùng đến biến đó;
+    # biến không có trong assignments nhận default (default=None: thiếu biến là lỗi)
+    def values(self, assignments, default=None):
+        return SymbolValues(self.names, assignments, default)
+
+    def evaluate(self, index, assignments, default=None):
+        return run(self.instructions(index), self.values(assignments, default)) == 1
+
+    # Giá trị của mọi biểu thức trong kho với cùng một phép gán, trả về lần lượt True/False
+    def evaluate_all(self, assignments, default=None):
+        values = self.values(assignments, default)
+        code, offsets = self.code, self.offsets
+        start = offsets[0]
+        for index in range(self.count):
+            stop = offsets[index + 1]
+            yield run(code[start:stop], values) == 1
+            start = stop
@@ -0,0 +1,462 @@
+# Các lớp biểu thức logic mệnh đề và bộ phân tích cú pháp dùng chung cho các bài 1, 2, 4, 5
+import re
+import weakref
+from functools import lru_cache
+
+# Bảng các nút đã tạo: (lớp, tham số) -> nút. Hai biểu thức con giống hệt nhau về cấu trúc
+# luôn là cùng một đối tượng, nên so sánh bằng chỉ là so sánh định danh.
+# Dùng tham chiếu yếu để nút không còn ai dùng được giải phóng bình thường
+INTERNED = weakref.WeakValueDictionary()
+
+# Bộ theo dõi đang bật (ví dụ Profiler của BTTH2_logicAI_profile) hoặc None. Khi có, evaluate và bitmask
+# gọi tracer.enter(nút) lúc bắt đầu tính một nút và tracer.leave(nút, tên phương thức, kết quả) khi xong;
+# tracer.depth()/tracer.unwind(độ sâu) dọn trạng thái khi việc tính bị ngắt bởi ngoại lệ;
+# compile() khi đó trả về hàm gọi evaluate để việc tính vẫn đi qua tracer
+TRACER = None
+
+# Các lớp và hàm định nghĩa logic mệnh đề.
+# Nút là đối tượng bất biến dùng __slots__, lưu sẵn mã băm, số nút (size), độ sâu (depth)
+# và tập biến tự do (free) nên các truy vấn này đều O(1).
+# Mọi phép duyệt cây (evaluate, bitmask, compile, str) dùng ngăn xếp tường minh chứ không đệ quy,
+# nên không bị giới hạn độ sâu đệ quy với các biểu thức rất sâu (ví dụ chuỗi 10^4 phép ∧ kết hợp trái).
+# Mỗi lớp chỉ định nghĩa phần của riêng nút: các nút con (children), mã Python (emit_step) và cách in (parts)
+class Proposition:
+    __slots__ = ("hash", "size", "depth", "free", "compiled", "__weakref__")
+
+    # Tìm nút đã có trong bảng hoặc tạo nút mới với các trường cho trước
+    @staticmethod
+    def intern(cls, key, fields, free, size, depth):
+        node = INTERNED.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            for name, value in fields:
+                object.__setattr__(node, name, value)
+            object.__setattr__(node, "hash", hash(key))
+            object.__setattr__(node, "free", free)
+            object.__setattr__(node, "size", size)
+            object.__setattr__(node, "depth", depth)
+            INTERNED[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} là đối tượng bất biến")
+
+    def __hash__(self):
+        return self.hash
+
+    def __reduce__(self):
+        return type(self), self.arguments()
+
+    def arguments(self):
+        raise NotImplementedError()
+
+    def children(self):
+        return ()
+
+    def variables(self):
+        return self.free
+
+    # Duyệt hậu thứ tự bằng ngăn xếp: step(nút, danh sách giá trị các nút con) cho giá trị của nút.
+    # Giá trị các con nằm trên một ngăn xếp giá trị như máy ngăn xếp, nên bộ nhớ chỉ theo độ sâu
+    def fold(self, step):
+        values = []
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            children = node.children()
+            if not children:
+                values.append(step(node, ()))
+            elif not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+            else:
+                count = len(children)
+                value = step(node, values[-count:])
+                del values[-count:]
+                values.append(value)
+        return values[0]
+
+    # Tính giá trị với phép gán tên biến -> giá trị. Có đoản mạch như and/or của Python:
+    # nút con bên phải của ∧ (∨, →) không được tính khi vế trái đã quyết định kết quả
+    def evaluate(self, **assignments):
+        tracer = TRACER
+        if tracer is not None:
+            depth = tracer.depth()
+        stack = [(self, 0)]   # (nút, trạng thái): 0 chưa tính con nào, 1 đã có vế trái, 2 đã có vế phải
+        value = None
+        try:
+            while stack:
+                node, state = stack.pop()
+                if state == 0 and tracer is not None:
+                    tracer.enter(node)
+                kind = type(node)
+                if kind is Variable:
+                    value = assignments[node.name]
+                elif kind is Constant:
+                    value = node.value
+                elif kind is Not:
+                    if state == 0:
+                        stack.append((node, 1))
+                        stack.append((node.child, 0))
+                        continue
+                    value = not value
+                elif state == 0:
+                    stack.append((node, 1))
+                    stack.append((node.left, 0))
+                    continue
+                elif state == 1:
+                    # value đang là giá trị vế trái
+                    if kind is And and not value:
+                        pass
+                    elif kind is Or and value:
+                        pass
+                    elif kind is Implies and not value:
+                        value = True
+                    else:
+                        stack.append((node, 2))
+                        stack.append((node.right, 0))
+                        continue
+                # state == 2: kết quả là giá trị vế phải (value)
+                if tracer is not None:
+                    tracer.leave(node, "evaluate", value)
+        finally:
+            if tracer is not None:
+                tracer.unwind(depth)
+        return value
+
+    # Giá trị trên các cột bit (bit r là dòng r của bảng chân trị), full là mặt nạ toàn 1.
+    # Máy ngăn xếp: nút được đẩy lại dưới dạng (nút,) để kết hợp giá trị các con sau khi chúng đã tính xong
+    def bitmask(self, columns, full):
+        tracer = TRACER
+        if tracer is not None:
+            depth = tracer.depth()
+        values = []
+        push = values.append
+        pop = values.pop
+        stack = [self]
+        try:
+            while stack:
+                node = stack.pop()
+                kind = type(node)
+                if kind is tuple:
+                    node = node[0]
+                    kind = type(node)
+                    if kind is Not:
+                        values[-1] ^= full
+                    elif kind is And:
+                        right = pop()
+                        values[-1] &= right
+                    elif kind is Or:
+                        right = pop()
+                        values[-1] |= right
+                    else:
+                        right = pop()
+                        values[-1] = (full ^ values[-1]) | right
+                else:
+                    if tracer is not None:
+                        tracer.enter(node)
+                    if kind is Variable:
+                        push(columns[node.name])
+                    elif kind is Constant:
+                        push(full if node.value else 0)
+                    elif kind is Not:
+                        stack.append((node,))
+                        stack.append(node.child)
+                        continue
+                    else:
+                        stack.append((node,))
+                        stack.append(node.right)
+                        stack.append(node.left)
+                        continue
+                if tracer is not None:
+                    tracer.leave(node, "bitmask", values[-1])
+        finally:
+            if tracer is not None:
+                tracer.unwind(depth)
+        return values[0]
+
+    # Biên dịch cây biểu thức (một lần) thành một hàm Python phẳng.
+    # Hàm nhận bộ giá trị theo đúng thứ tự của variables và truy cập biến theo chỉ số,
+    # không còn đóng gói lại dict assignments ở mỗi nút như evaluate(**assignments).
+    def compile(self, variables=None):
+        if variables is None:
+            variables = sorted(self.variables())
+        variables = tuple(variables)
+        # Khi có tracer, trả về hàm gọi evaluate (đi qua tracer) thay cho mã phẳng không đo được từng nút
+        if TRACER is not None:
+            return lambda values: self.evaluate(**dict(zip(variables, values)))
+        cached = getattr(self, "compiled", None)
+        if cached is not None and cached[0] == variables:
+            return cached[1]
+
+        slots = {name: i for i, name in enumerate(variables)}
+        lines = []
+        result, _ = self.emit(slots, lines)
+        body = "".join(f"    {line}\n" for line in lines)
+        source = f"def compiled(v):\n{body}    return {result}\n"
+        namespace = {}
+        exec(source, namespace)
+        function = namespace["compiled"]
+        object.__setattr__(self, "compiled", (variables, function))
+        return function
+
+    # Mã Python của biểu thức: (chuỗi biểu thức, độ lồng ngoặc); các biểu thức quá sâu được tách ra
+    # thành biến tạm trong lines
+    def emit(self, slots, lines):
+        return self.fold(lambda node, values: node.emit_step(slots, lines, values))
+
+    # Dạng chuỗi: mỗi nút cho dãy các mảnh (chuỗi hoặc nút con) theo thứ tự in
+    def __str__(self):
+        pieces = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if type(item) is str:
+                pieces.append(item)
+            else:
+                stack.extend(reversed(item.parts()))
+        return "".join(pieces)
+
+# Độ sâu lồng ngoặc tối đa của một biểu thức sinh ra; sâu hơn thì tách ra biến tạm
+# để không vượt giới hạn lồng ngoặc của trình biên dịch Python
+MAX_EMIT_DEPTH = 50
+
+def hoist(text, depth, lines):
+    if depth < MAX_EMIT_DEPTH:
+        return text, depth
+    name = f"t{len(lines)}"
+    lines.append(f"{name} = {text}")
+    return name, 0
+
+class Variable(Proposition):
+    __slots__ = ("name",)
+
+    def __new__(cls, name):
+        return Proposition.intern(cls, (cls, name), (("name", name),), frozenset([name]), 1, 1)
+
+    def arguments(self):
+        return (self.name,)
+
+    def emit_step(self, slots, lines, values):
+        return f"v[{slots[self.name]}]", 0
+
+    def parts(self):
+        return (self.name,)
+
+# Hằng đúng ⊤ và hằng sai ⊥ (chủ yếu xuất hiện sau khi rút gọn, ví dụ A ∨ ¬A thành ⊤)
+class Constant(Proposition):
+    __slots__ = ("value",)
+
+    def __new__(cls, value):
+        value = bool(value)
+        return Proposition.intern(cls, (cls, value), (("value", value),), frozenset(), 1, 1)
+
+    def arguments(self):
+        return (self.value,)
+
+    def emit_step(self, slots, lines, values):
+        return repr(self.value), 0
+
+    def parts(self):
+        return ("⊤" if self.value else "⊥",)
+
+class Not(Proposition):
+    __slots__ = ("child",)
+
+    def __new__(cls, child):
+        return Proposition.intern(cls, (cls, child), (("child", child),),
+                                  child.free, child.size + 1, child.depth + 1)
+
+    def arguments(self):
+        return (self.child,)
+
+    def children(self):
+        return (self.child,)
+
+    def emit_step(self, slots, lines, values):
+        (child, depth), = values
+        return hoist(f"(not {child})", depth + 1, lines)
+
+    def parts(self):
+        return ("¬", self.child)
+
+# Lớp chung cho các phép toán hai ngôi And, Or, Implies.
+# SYMBOL là ký hiệu khi in, TEMPLATE là mẫu mã Python của emit
+class BinaryProposition(Proposition):
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
+        if left.free >= right.free:
+            free = left.free
+        elif right.free >= left.free:
+            free = right.free
+        else:
+            free = left.free | right.free
+        return Proposition.intern(cls, (cls, left, right), (("left", left), ("right", right)),
+                                  free, left.size + right.size + 1, max(left.depth, right.depth) + 1)
+
+    def arguments(self):
+        return (self.left, self.right)
+
+    def children(self):
+        return (self.left, self.right)
+
+    def emit_step(self, slots, lines, values):
+        (left, left_depth), (right, right_depth) = values
+        return hoist(self.TEMPLATE.format(left, right), max(left_depth, right_depth) + 1, lines)
+
+    def parts(self):
+        return ("(", self.left, f" {self.SYMBOL} ", self.right, ")")
+
+class And(BinaryProposition):
+    __slots__ = ()
+    SYMBOL = "∧"
+    TEMPLATE = "({} and {})"
+
+class Or(BinaryProposition):
+    __slots__ = ()
+    SYMBOL = "∨"
+    TEMPLATE = "({} or {})"
+
+class Implies(BinaryProposition):
+    __slots__ = ()
+    SYMBOL = "→"
+    TEMPLATE = "(not {} or {})"
+
+# ---- Không gian phép gán, chia thành các khối bit ----
+# Số biến cuối cùng được đóng gói chung vào một khối bit: mỗi khối gồm 2^BLOCK_BITS dòng
+BLOCK_BITS = 16
+
+# Tạo cột giá trị của k biến trong một khối 2^k dòng theo thứ tự của product([True, False]):
+# bit r của cột là 1 khi biến mang giá trị True ở dòng r (dòng 0 là tất cả True)
+def column_masks(k):
+    size = 1 << k
+    full = (1 << size) - 1
+    masks = []
+    for i in range(k):
+        run = 1 << (k - 1 - i)  # số dòng liên tiếp có cùng giá trị của biến thứ i
+        masks.append(full // ((1 << (2 * run)) - 1) * ((1 << run) - 1))
+    return masks, full
+
+# Số biến đầu (cố định theo khối) và số biến cuối (nằm trong khối) của không gian n biến
+def block_layout(n):
+    low_count = min(n, BLOCK_BITS)
+    return n - low_count, low_count
+
+# Duyệt các khối của không gian phép gán trong khoảng chỉ số khối [start, stop).
+# Các biến đầu được cố định cho cả khối (cột toàn 1 hoặc toàn 0), các biến cuối là cột bit.
+# first=True: thứ tự của product([True, False]) như bảng chân trị;
+# first=False: thứ tự của product([False, True]) như khi tìm mẫu thỏa mãn.
+# Trả về lần lượt (giá trị các biến đầu, mặt nạ toàn 1 của khối, dict cột của các biến);
+# dict cột được dùng lại giữa các khối
+def assignment_blocks(variables, start=0, stop=None, first=True):
+    high_count, low_count = block_layout(len(variables))
+    masks, full = column_masks(low_count)
+    if not first:
+        masks = [full ^ mask for mask in masks]
+    columns = dict(zip(variables[high_count:], masks))
+    if stop is None:
+        stop = 1 << high_count
+    for index in range(start, stop):
+        high_values = tuple(((index >> (high_count - 1 - j)) & 1) != first for j in range(high_count))
+        for name, value in zip(variables[:high_count], high_values):
+            columns[name] = full if value else 0
+        yield high_values, full, columns
+
+# Phép gán ứng với dòng thứ row của không gian phép gán (theo thứ tự như assignment_blocks)
+def assignment_at(variables, row, first=True):
+    n = len(variables)
+    return {name: ((row >> (n - 1 - i)) & 1) != first for i, name in enumerate(variables)}
+
+# ---- Phân tích cú pháp ----
+# Biến là tên gồm chữ cái, chữ số, dấu gạch dưới (không bắt đầu bằng chữ số), ví dụ sensor_17_ok.
+# Toán tử theo thứ tự ưu tiên giảm dần: ¬ > ∧ > ∨ > →; → kết hợp phải, ∧ và ∨ kết hợp trái.
+# Chấp nhận thêm cách viết ASCII: ~ ! (phủ định), & (và), | (hoặc), -> (kéo theo). Hằng: ⊤ (đúng), ⊥ (sai)
+TOKEN_PATTERN = re.compile(r"\s*(?:([^\W\d]\w*)|(->|[¬~!∧&∨|→()⊤⊥]))")
+
+OPERATOR_NAMES = {"~": "¬", "!": "¬", "&": "∧", "|": "∨", "->": "→"}
+
+# Toán tử hai ngôi: (độ ưu tiên, lớp nút, kết hợp phải)
+BINARY_OPERATORS = {"∧": (3, And, False), "∨": (2, Or, False), "→": (1, Implies, True)}
+NOT_PRECEDENCE = 4
+CONSTANTS = {"⊤": True, "⊥": False}
+
+def tokenize(expr_str):
+    position = 0
+    length = len(expr_str)
+    match = TOKEN_PATTERN.match
+    while position < length:
+        token = match(expr_str, position)
+        if token is None:
+            if expr_str[position:].strip() == "":
+                return
+            raise ValueError(f"Ký tự không hợp lệ '{expr_str[position]}' tại vị trí {position}")
+        name, operator = token.groups()
+        if name is not None:
+            yield "name", name, token.start(1)
+        else:
+            yield "op", OPERATOR_NAMES.get(operator, operator), token.start(2)
+        position = token.end()
+
+# Phân tích theo độ ưu tiên toán tử (Pratt/shunting-yard) bằng hai ngăn xếp, không đệ quy,
+# nên chạy tuyến tính và không bị giới hạn độ sâu đệ quy với chuỗi rất dài
+def parse_tokens(tokens):
+    operands = []
+    operators = []  # các phần tử: "¬", "(" hoặc toán tử hai ngôi
+
+    def reduce():
+        operator = operators.pop()
+        if operator == "¬":
+            operands.append(Not(operands.pop()))
+        else:
+            right = operands.pop()
+            left = operands.pop()
+            operands.append(BINARY_OPERATORS[operator][1](left, right))
+
+    expect_operand = True
+    position = 0
+    for kind, text, position in tokens:
+        if expect_operand:
+            if kind == "name":
+                operands.append(Variable(text))
+                expect_operand = False
+            elif text in CONSTANTS:
+                operands.append(Constant(CONSTANTS[text]))
+                expect_operand = False
+            elif text == "¬" or text == "(":
+                operators.append(text)
+            else:
+                raise ValueError(f"Thiếu toán hạng trước '{text}' tại vị trí {position}")
+        elif text in BINARY_OPERATORS:
+            precedence, _, right_associative = BINARY_OPERATORS[text]
+            while operators and operators[-1] != "(":
+                top = operators[-1]
+                top_precedence = NOT_PRECEDENCE if top == "¬" else BINARY_OPERATORS[top][0]
+                if top_precedence > precedence or (top_precedence == precedence and not right_associative):
+                    reduce()
+                else:
+                    break
+            operators.append(text)
+            expect_operand = True
+        elif text == ")":
+            while operators and operators[-1] != "(":
+                reduce()
+            if not operators:
+                raise ValueError(f"Thừa dấu ')' tại vị trí {position}")
+            operators.pop()
+        else:
+            raise ValueError(f"Thiếu toán tử trước '{text}' tại vị trí {position}")
+
+    if expect_operand:
+        raise ValueError("Biểu thức rỗng hoặc kết thúc bằng toán tử")
+    while operators:
+        if operators[-1] == "(":
+            raise ValueError("Thiếu dấu ')'")
+        reduce()
+    return operands.pop()
+
+# Hàm phân tích biểu thức logic từ chuỗi; kết quả được lưu đệm theo chuỗi nguồn (LRU)
+# nên một biểu thức lặp lại không phải phân tích lại
+@lru_cache(maxsize=1024)
+def parse_expression(expr_str):
+    return parse_tokens(tokenize(expr_str))
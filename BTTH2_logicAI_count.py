@@ -0,0 +1,232 @@
+# Đếm chính xác số mô hình (#SAT) của một tập mệnh đề CNF.
+# Thuật toán DPLL đếm: chọn một biến, lan truyền đơn vị cho từng giá trị rồi cộng số mô hình hai nhánh.
+# Sau mỗi bước, các mệnh đề còn lại được tách thành các thành phần liên thông (không chung biến),
+# số mô hình là tích số mô hình của từng thành phần; mỗi thành phần được lưu vào bộ nhớ đệm nên các
+# thành phần lặp lại ở nhánh khác chỉ đếm một lần.
+# Biến không còn xuất hiện trong mệnh đề nào nhận tự do hai giá trị (nhân 2).
+# Thành phần đủ nhỏ được đếm trực tiếp bằng bảng chân trị đóng gói bit (column_masks) thay vì rẽ nhánh tiếp.
+#
+# Biểu diễn: mỗi thành phần là một cặp số nguyên (tập mệnh đề chưa thỏa C, tập biến chưa gán V) dùng như
+# mặt nạ bit theo số hiệu mệnh đề / số hiệu biến. Mọi literal đã gán của một mệnh đề chưa thỏa đều sai,
+# nên phần còn lại của mệnh đề i là các biến (clause_vars[i] & V): không cần dựng lại các bộ mệnh đề, khóa
+# bộ nhớ đệm chỉ là cặp (C, V), và lan truyền một literal chỉ xem các mệnh đề chứa literal ngược dấu của nó.
+from functools import lru_cache
+
+from BTTH2_logicAI_core import column_masks
+
+# Thành phần có không quá bấy nhiêu biến thì đếm bằng bảng chân trị 2^k bit
+LEAF_VARIABLES = 14
+
+# Các cột của bảng chân trị k biến, tạo một lần cho mỗi k
+@lru_cache(maxsize=None)
+def table_columns(k):
+    return column_masks(k)
+
+# Loại khung trên ngăn xếp của count_split
+PRODUCT, BRANCH = "product", "branch"
+
+# Lần lượt số hiệu các bit 1 của mask
+def bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class ModelCounter:
+    def __init__(self):
+        self.cache = {}     # (C, V) của một thành phần -> số mô hình trên các biến của nó
+        self.decisions = 0
+
+    # Các chỉ mục của tập mệnh đề: biến của từng mệnh đề, biến mang dấu dương của từng mệnh đề,
+    # và với mỗi biến, tập mệnh đề chứa nó (theo từng dấu và cả hai dấu)
+    def load(self, clauses):
+        self.clauses = clauses
+        self.clause_vars = []
+        self.positive = []
+        self.positive_clauses = {}
+        self.negative_clauses = {}
+        for i, clause in enumerate(clauses):
+            variables = positive = 0
+            for lit in clause:
+                v = abs(lit)
+                variables |= 1 << v
+                if lit > 0:
+                    positive |= 1 << v
+                    self.positive_clauses[v] = self.positive_clauses.get(v, 0) | 1 << i
+                else:
+                    self.negative_clauses[v] = self.negative_clauses.get(v, 0) | 1 << i
+            self.clause_vars.append(variables)
+            self.positive.append(positive)
+        self.var_clauses = {v: self.positive_clauses.get(v, 0) | self.negative_clauses.get(v, 0)
+                            for v in self.positive_clauses.keys() | self.negative_clauses.keys()}
+
+    # Lan truyền đơn vị bắt đầu từ các phép gán (biến, giá trị) trong pending;
+    # trả về (C, V) sau khi gán hoặc None khi xung đột
+    def propagate(self, C, V, pending):
+        clause_vars, positive = self.clause_vars, self.positive
+        values = {}
+        while pending:
+            v, value = pending.pop()
+            bit = 1 << v
+            if not V & bit:
+                if values[v] != value:
+                    return None
+                continue
+            V ^= bit
+            values[v] = value
+            # Bỏ các mệnh đề vừa thỏa; các mệnh đề chứa literal vừa sai có thể thành đơn vị hoặc rỗng
+            if value:
+                C &= ~self.positive_clauses.get(v, 0)
+                touched = self.negative_clauses.get(v, 0) & C
+            else:
+                C &= ~self.negative_clauses.get(v, 0)
+                touched = self.positive_clauses.get(v, 0) & C
+            while touched:
+                low = touched & -touched
+                touched ^= low
+                i = low.bit_length() - 1
+                free = clause_vars[i] & V
+                if not free & (free - 1):
+                    if not free:
+                        return None
+                    pending.append((free.bit_length() - 1, bool(positive[i] & free)))
+        return C, V
+
+    # Tách (C, V) thành các thành phần liên thông (loang từ một mệnh đề qua các biến chung);
+    # trả về danh sách (C, V) của từng thành phần và số biến của V không nằm trong mệnh đề nào
+    def split(self, C, V):
+        clause_vars, var_clauses = self.clause_vars, self.var_clauses
+        groups = []
+        used = 0
+        while C:
+            clauses = C & -C
+            frontier = variables = clause_vars[clauses.bit_length() - 1] & V
+            while frontier:
+                reached = 0
+                while frontier:
+                    low = frontier & -frontier
+                    frontier ^= low
+                    reached |= var_clauses[low.bit_length() - 1]
+                reached &= C & ~clauses
+                clauses |= reached
+                while reached:
+                    low = reached & -reached
+                    reached ^= low
+                    frontier |= clause_vars[low.bit_length() - 1]
+                frontier &= V & ~variables
+                variables |= frontier
+            C &= ~clauses
+            used |= variables
+            groups.append((clauses, variables))
+        return groups, (V & ~used).bit_count()
+
+    # Biến rẽ nhánh của thành phần (C, V): biến xuất hiện trong nhiều mệnh đề của thành phần nhất; khi bằng
+    # nhau thì chọn biến có số hiệu gần trung vị của thành phần nhất. Số hiệu biến theo thứ tự xuất hiện
+    # (như biến Tseitin) nên với các chuỗi A1 → A2 → ... nhát cắt rơi vào giữa và hai nửa tách thành hai
+    # thành phần độc lập, thay vì gặm dần từ một đầu
+    def choose(self, C, V):
+        var_clauses, scale = self.var_clauses, self.scale
+        variables = list(bits(V))
+        middle = variables[len(variables) // 2]
+        best = -scale
+        for v in variables:
+            score = (var_clauses[v] & C).bit_count() * scale - abs(v - middle)
+            if score > best:
+                best, var = score, v
+        return var
+
+    # Khung tính tích: [PRODUCT, tích đã có (bắt đầu bằng 2^số biến tự do), các thành phần còn phải đếm];
+    # thành phần nhỏ được đếm trước (lấy từ cuối danh sách) để gặp thành phần 0 mô hình thì dừng sớm
+    def product_frame(self, C, V):
+        groups, free = self.split(C, V)
+        if len(groups) > 1:
+            groups.sort(key=lambda group: group[1].bit_count(), reverse=True)
+        return [PRODUCT, 1 << free, groups]
+
+    # Số mô hình của (C, V): tích số mô hình các thành phần, nhân 2 cho mỗi biến tự do; thành phần lớn rẽ
+    # nhánh theo một biến và cộng số mô hình hai nhánh. Duyệt bằng ngăn xếp tường minh chứ không đệ quy nên
+    # độ sâu rẽ nhánh (có thể bằng số biến) không bị giới hạn đệ quy của Python.
+    # Khung rẽ nhánh: [BRANCH, khóa (C, V), biến, các giá trị còn phải thử, tổng đã có]
+    def count_split(self, C, V):
+        cache = self.cache
+        stack = [self.product_frame(C, V)]
+        result = None   # số mô hình của khung con vừa xong
+        while stack:
+            frame = stack[-1]
+            if frame[0] is PRODUCT:
+                if result is not None:
+                    frame[1] *= result
+                    result = None
+                if not frame[1] or not frame[2]:
+                    stack.pop()
+                    result = frame[1]
+                    continue
+                key = frame[2].pop()
+                cached = cache.get(key)
+                if cached is not None:
+                    result = cached
+                    continue
+                size = key[1].bit_count()
+                if size <= LEAF_VARIABLES:
+                    result = cache[key] = self.count_table(*key, size)
+                    continue
+                self.decisions += 1
+                stack.append([BRANCH, key, self.choose(*key), [False, True], 0])
+            else:
+                if result is not None:
+                    frame[4] += result
+                    result = None
+                if not frame[3]:
+                    stack.pop()
+                    result = cache[frame[1]] = frame[4]
+                    continue
+                reduced = self.propagate(*frame[1], [(frame[2], frame[3].pop())])
+                if reduced is not None:
+                    stack.append(self.product_frame(*reduced))
+        return result
+
+    # Đếm trên bảng chân trị: mỗi mệnh đề là OR các cột literal, số mô hình là số bit 1 của AND
+    def count_table(self, C, V, size):
+        masks, full = table_columns(size)
+        columns = {}
+        for v, mask in zip(bits(V), masks):
+            columns[v] = mask
+            columns[-v] = full ^ mask
+        rows = full
+        for i in bits(C):
+            satisfied = 0
+            for lit in self.clauses[i]:
+                column = columns.get(lit)
+                if column is not None:
+                    satisfied |= column
+            rows &= satisfied
+            if not rows:
+                return 0
+        return rows.bit_count()
+
+    # Số mô hình của tập mệnh đề (literal kiểu DIMACS) trên các biến 1..num_vars
+    def count(self, clauses, num_vars):
+        normalized = set()
+        for clause in clauses:
+            literals = set(clause)
+            if any(-lit in literals for lit in literals):
+                continue  # mệnh đề luôn đúng
+            if not literals:
+                return 0
+            normalized.add(tuple(sorted(literals)))
+        normalized = sorted(normalized)
+        self.load(normalized)
+        V = (1 << (num_vars + 1)) - 2
+        for variables in self.clause_vars:
+            V |= variables
+        self.scale = V.bit_length()
+        units = [(abs(clause[0]), clause[0] > 0) for clause in normalized if len(clause) == 1]
+        reduced = self.propagate((1 << len(normalized)) - 1, V, units)
+        if reduced is None:
+            return 0
+        return self.count_split(*reduced)
+
+# Số mô hình của một CNF mã hóa Tseitin, tính trên các biến logic của nó.
+# Mỗi biến phụ của mã hóa Tseitin được xác định duy nhất bởi các biến logic nên không làm thay đổi số mô hình
+def count_cnf(cnf):
+    return ModelCounter().count(cnf.clauses, cnf.num_vars)
@@ -0,0 +1,221 @@
+# Đọc/ghi CNF dạng DIMACS để dùng các bộ dữ liệu SAT chuẩn với bộ giải của bài 5 và xuất câu hỏi của bài 4.
+#   python BTTH2_logicAI_dimacs.py solve bai_toan.cnf [--method walksat] [--count]
+#   python BTTH2_logicAI_dimacs.py export "(A ∨ B) ∧ ¬A" -o bai_toan.cnf
+#   python BTTH2_logicAI_dimacs.py entail "A, A → B" "B" -o cau_hoi.cnf   (UNSAT nghĩa là suy ra được)
+# Tệp được đọc theo từng khối byte; các literal được giữ trong một mảng array('i') phẳng, mỗi mệnh đề
+# kết thúc bằng số 0 như chính DIMACS, không tạo đối tượng Proposition hay list cho từng mệnh đề.
+# Kết quả theo định dạng của các cuộc thi SAT: dòng "s SATISFIABLE"/"s UNSATISFIABLE" và các dòng
+# "v 1 -2 3 ... 0".
+import argparse
+import bz2
+import gzip
+import lzma
+import sys
+from array import array
+
+from BTTH2_logicAI_core import Not, parse_expression
+from BTTH2_logicAI_count import ModelCounter
+from BTTH2_logicAI_sat import CNF, Solver
+from BTTH2_logicAI_walksat import walksat
+
+# Kích thước mỗi khối đọc
+READ_CHUNK = 1 << 20
+
+# Các byte có thể có trong phần mệnh đề; khối chỉ gồm các byte này không có dòng c/p/%
+NUMBER_BYTES = b"0123456789- \t\r\n"
+
+# Số mệnh đề gom lại cho mỗi lần ghi
+WRITE_BATCH = 4096
+
+# Độ dài tối đa của một dòng "v ..."
+VALUE_LINE_WIDTH = 78
+
+OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+def open_binary(path, mode="rb"):
+    for suffix, opener in OPENERS.items():
+        if str(path).endswith(suffix):
+            return opener(path, mode)
+    return open(path, mode)
+
+class DimacsCNF:
+    def __init__(self, num_vars=0, literals=None, comments=None):
+        self.num_vars = num_vars
+        self.literals = literals if literals is not None else array("i")  # các mệnh đề nối nhau, kết thúc bằng 0
+        self.comments = comments if comments is not None else []
+        self.declared = None    # (số biến, số mệnh đề) trên dòng "p cnf"
+
+    def __len__(self):
+        return self.literals.count(0)
+
+    # Lần lượt từng mệnh đề dưới dạng list literal
+    def clauses(self):
+        literals = self.literals
+        start = 0
+        end = len(literals)
+        while start < end:
+            stop = literals.index(0, start)
+            yield literals[start:stop].tolist()
+            start = stop + 1
+
+    def solver(self):
+        solver = Solver()
+        solver.ensure_vars(self.num_vars)
+        for clause in self.clauses():
+            if not solver.add_clause(clause):
+                break
+        return solver
+
+# Đọc tệp DIMACS (có thể nén .gz/.bz2/.xz). Các dòng chú thích "c" được giữ lại, dòng "%" (định dạng SATLIB)
+# kết thúc phần dữ liệu. Mệnh đề có thể trải qua nhiều dòng
+def read_dimacs(path, chunk_size=READ_CHUNK):
+    cnf = DimacsCNF()
+    literals = cnf.literals
+    with open_binary(path) as file:
+        rest = b""
+        finished = False
+        while not finished:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                finished = True
+                block, rest = rest, b""
+            else:
+                block = rest + chunk
+                cut = block.rfind(b"\n") + 1
+                block, rest = block[:cut], block[cut:]
+            if not block.translate(None, NUMBER_BYTES):
+                # Khối chỉ có số: tách và đổi kiểu cả khối một lần
+                literals.extend(map(int, block.split()))
+                continue
+            data = []
+            for line in block.split(b"\n"):
+                stripped = line.lstrip()
+                first = stripped[:1]
+                if first == b"c":
+                    cnf.comments.append(stripped[1:].strip().decode("utf-8", "replace"))
+                elif first == b"p":
+                    fields = stripped.split()
+                    if len(fields) != 4 or fields[1] != b"cnf":
+                        raise ValueError(f"Dòng tiêu đề không hợp lệ: {stripped.decode('utf-8', 'replace')}")
+                    cnf.declared = (int(fields[2]), int(fields[3]))
+                elif first == b"%":
+                    finished = True
+                    break
+                else:
+                    data.append(stripped)
+            literals.extend(map(int, b" ".join(data).split()))
+    if literals and literals[-1] != 0:
+        literals.append(0)  # mệnh đề cuối thiếu số 0 kết thúc
+    if literals:
+        cnf.num_vars = max(max(literals), -min(literals))
+    if cnf.declared is not None:
+        cnf.num_vars = max(cnf.num_vars, cnf.declared[0])
+    return cnf
+
+# Ghi CNF dạng DIMACS; clauses là dãy các mệnh đề (list literal), ghi theo từng lô
+def write_dimacs(path, num_vars, clauses, comments=()):
+    clauses = clauses if isinstance(clauses, list) else list(clauses)
+    with open_binary(path, "wb") as file:
+        header = "".join(f"c {comment}\n" for comment in comments) + f"p cnf {num_vars} {len(clauses)}\n"
+        file.write(header.encode("utf-8"))
+        for start in range(0, len(clauses), WRITE_BATCH):
+            batch = clauses[start:start + WRITE_BATCH]
+            file.write("".join(" ".join(map(str, clause)) + " 0\n" for clause in batch).encode("ascii"))
+
+# Chú thích "c var <số hiệu> <tên>" giữ tên biến logic của các biến DIMACS
+def name_comments(cnf):
+    return [f"var {number} {name}" for name, number in sorted(cnf.names.items(), key=lambda item: item[1])]
+
+def names_from_comments(comments):
+    names = {}
+    for comment in comments:
+        fields = comment.split()
+        if len(fields) == 3 and fields[0] == "var" and fields[1].isdigit():
+            names[fields[2]] = int(fields[1])
+    return names
+
+# Xuất một biểu thức (chuỗi hoặc cây nút) sang DIMACS qua mã hóa Tseitin
+def export_formula(expr, path):
+    if isinstance(expr, str):
+        expr = parse_expression(expr)
+    cnf = CNF()
+    cnf.add(expr)
+    write_dimacs(path, cnf.num_vars, cnf.clauses, name_comments(cnf))
+    return cnf
+
+# Xuất câu hỏi premises ⊨ conclusion của prove_by_truth_table: CNF của các premise và ¬conclusion,
+# không thỏa mãn khi và chỉ khi kết luận được suy ra
+def export_entailment(premises, conclusion, path):
+    cnf = CNF()
+    for premise in premises:
+        cnf.add(parse_expression(premise) if isinstance(premise, str) else premise)
+    conclusion = parse_expression(conclusion) if isinstance(conclusion, str) else conclusion
+    cnf.add(Not(conclusion))
+    write_dimacs(path, cnf.num_vars, cnf.clauses, ["premises ⊨ conclusion khi và chỉ khi CNF này UNSAT"]
+                 + name_comments(cnf))
+    return cnf
+
+# Các dòng "v ..." của mô hình model (list giá trị theo số hiệu biến, phần tử 0 bỏ trống)
+def value_lines(model, num_vars):
+    lines = []
+    line = "v"
+    for v in range(1, num_vars + 1):
+        token = str(v) if model[v] else str(-v)
+        if len(line) + 1 + len(token) > VALUE_LINE_WIDTH:
+            lines.append(line)
+            line = "v"
+        line += " " + token
+    lines.append(line + " 0")
+    return lines
+
+# Giải một CNF DIMACS; trả về model (list giá trị theo số hiệu biến) hoặc None.
+# method="cdcl" (đầy đủ) hoặc "walksat" (không đầy đủ: None nghĩa là không tìm được)
+def solve_dimacs(cnf, method="cdcl", **options):
+    if method == "walksat":
+        model = walksat(list(cnf.clauses()), cnf.num_vars, **options)
+        return model
+    solver = cnf.solver()
+    if not solver.solve():
+        return None
+    return solver.model
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đọc/ghi CNF dạng DIMACS")
+    commands = parser.add_subparsers(dest="command", required=True)
+    solve = commands.add_parser("solve", help="giải tệp DIMACS, in kết quả dạng s/v")
+    solve.add_argument("path")
+    solve.add_argument("--method", default="cdcl", choices=["cdcl", "walksat"])
+    solve.add_argument("--workers", type=int, default=None, help="số tiến trình cho walksat")
+    solve.add_argument("--count", action="store_true", help="đếm chính xác số mô hình thay vì tìm một mô hình")
+    export = commands.add_parser("export", help="xuất biểu thức sang DIMACS")
+    export.add_argument("expression")
+    export.add_argument("-o", "--output", required=True)
+    entail = commands.add_parser("entail", help="xuất câu hỏi suy diễn sang DIMACS")
+    entail.add_argument("premises", help="các mệnh đề cách nhau bởi dấu phẩy")
+    entail.add_argument("conclusion")
+    entail.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        export_formula(args.expression, args.output)
+        return 0
+    if args.command == "entail":
+        export_entailment([p for p in args.premises.split(",") if p.strip()], args.conclusion, args.output)
+        return 0
+
+    cnf = read_dimacs(args.path)
+    print(f"c {cnf.num_vars} biến, {len(cnf)} mệnh đề")
+    if args.count:
+        print(f"s mc {ModelCounter().count(cnf.clauses(), cnf.num_vars)}")
+        return 0
+    options = {"workers": args.workers} if args.method == "walksat" else {}
+    model = solve_dimacs(cnf, args.method, **options)
+    if model is None:
+        print("s UNKNOWN" if args.method == "walksat" else "s UNSATISFIABLE")
+        return 20 if args.method == "cdcl" else 0
+    print("s SATISFIABLE")
+    print("\n".join(value_lines(model, cnf.num_vars)))
+    return 10
+
+if __name__ == "__main__":
+    sys.exit(main())
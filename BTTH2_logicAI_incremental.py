@@ -0,0 +1,372 @@
+# Kiểm tra mô hình bậc nhất tăng dần cho công thức của bài 3.
+# Mỗi công thức con giữ bảng giá trị theo mọi phép gán cho các biến tự do của nó; mỗi lượng từ giữ
+# thêm số nhân chứng (∃: số phần tử làm thân đúng) hoặc số phản ví dụ (∀: số phần tử làm thân sai)
+# cho từng phép gán. Khi thêm/bớt một phần tử của miền hoặc đổi một sự kiện của vị từ, chỉ các dòng
+# bị ảnh hưởng được tính lại và thay đổi được lan lên theo thứ tự từ lá lên gốc.
+# Bảng của một công thức con k biến tự do có |D|^k dòng, nên nên dùng kế hoạch (plan_formula) để
+# phần lớn công thức con chỉ còn một biến. Riêng lượng từ có vị từ canh ∃y (R(x, y) ∧ A(y)) hoặc
+# ∀y (R(x, y) → A(y)) với R là tập sự kiện: không lập bảng hai biến cho thân mà đếm trực tiếp qua
+# chỉ mục của R theo từng đối số, nên mỗi thay đổi chỉ tốn thời gian theo số sự kiện liên quan.
+from itertools import product
+
+from BTTH2_logicAI_bai3 import (Predicate, Not, And, Or, Implies, ForAll, Exists, Relation,
+                                guard_parts, parse_formula, plan_formula)
+
+def children_of(node):
+    if isinstance(node, Predicate):
+        return []
+    if isinstance(node, (Not, ForAll, Exists)):
+        return [node.child]
+    return [node.left, node.right]
+
+# Mọi phép gán k biến có ít nhất một biến nhận element, các biến còn lại nhận giá trị trong others
+def rows_with(element, others, k):
+    for mask in range(1, 1 << k):
+        for combo in product(others, repeat=k - bin(mask).count("1")):
+            values = iter(combo)
+            yield tuple(element if (mask >> i) & 1 else next(values) for i in range(k))
+
+class IncrementalChecker:
+    # predicates: tên -> hàm Python (chỉ đọc), Relation hoặc tập các bộ (có thể cập nhật bằng set_fact)
+    def __init__(self, formula, domain, predicates, plan=True):
+        if isinstance(formula, str):
+            formula = parse_formula(formula)
+        if formula.free:
+            raise ValueError(f"Công thức còn biến tự do: {', '.join(sorted(formula.free))}")
+        if plan:
+            formula = plan_formula(formula)
+        self.formula = formula
+        self.domain = dict.fromkeys(domain)  # giữ thứ tự thêm vào
+        self.functions = {}
+        self.facts = {}
+        for name, definition in predicates.items():
+            if isinstance(definition, Relation):
+                self.facts[name] = set(zip(*definition.columns))
+            elif isinstance(definition, (set, frozenset, list, tuple)):
+                self.facts[name] = {fact if isinstance(fact, tuple) else (fact,) for fact in definition}
+            else:
+                self.functions[name] = definition
+        self.indexes = {}
+        self.guarded = {}
+        self.nodes = self.post_order(formula)
+        self.parents = {node: [] for node in self.nodes}
+        for node in self.nodes:
+            for child in self.children(node):
+                self.parents[child].append(node)
+        self.variables = {node: tuple(sorted(node.free)) for node in self.nodes}
+        self.tables = {}
+        self.counts = {}
+        self.subscribers = []
+        self.value = None
+        self.rebuild()
+
+    # Lượng từ một biến tự do x có vị từ canh R(x, y) (R là tập sự kiện, hai đối số khác nhau) và phần
+    # còn lại chỉ phụ thuộc y: ghi lại (R, vị trí của x, vị trí của y, phần còn lại)
+    def find_guard(self, node):
+        if not isinstance(node, (ForAll, Exists)) or len(node.free) != 1:
+            return None
+        (outer,) = node.free
+        for guard, rest in guard_parts(node):
+            if (isinstance(guard, Predicate) and guard.name not in self.functions
+                    and len(guard.arguments) == 2 and set(guard.arguments) == {outer, node.variable}
+                    and (type(rest) is bool or rest.free <= {node.variable})):
+                return guard.name, guard.arguments.index(outer), guard.arguments.index(node.variable), rest
+        return None
+
+    # Các nút con được theo dõi: lượng từ có vị từ canh chỉ phụ thuộc phần còn lại của thân
+    def children(self, node):
+        guarded = self.guarded.get(node)
+        if guarded is not None:
+            rest = guarded[3]
+            return [] if type(rest) is bool else [rest]
+        return children_of(node)
+
+    # Các nút theo thứ tự hậu tự (con trước cha)
+    def post_order(self, formula):
+        order = []
+        stack = [(formula, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            stack.append((node, True))
+            guarded = self.find_guard(node)
+            if guarded is not None:
+                self.guarded[node] = guarded
+            for child in reversed(self.children(node)):
+                stack.append((child, False))
+        return order
+
+    # Chỉ mục của tập sự kiện name theo đối số ở vị trí position: giá trị -> tập các bộ
+    def index(self, name, position):
+        indexes = self.indexes.setdefault(name, {})
+        index = indexes.get(position)
+        if index is None:
+            index = indexes[position] = {}
+            for fact in self.facts.setdefault(name, set()):
+                index.setdefault(fact[position], set()).add(fact)
+        return index
+
+    # Giá trị phần còn lại của thân lượng từ có vị từ canh tại y
+    def rest_value(self, rest, y):
+        if type(rest) is bool:
+            return rest
+        return self.tables[rest][(y,) if rest.free else ()]
+
+    # Số nhân chứng/phản ví dụ của lượng từ có vị từ canh tại x, đếm qua chỉ mục của R
+    def count_guarded(self, node, x):
+        name, x_position, y_position, rest = self.guarded[node]
+        wanted = isinstance(node, Exists)
+        return sum(fact[y_position] in self.domain and self.rest_value(rest, fact[y_position]) == wanted
+                   for fact in self.index(name, x_position).get(x, ()))
+
+    # Cộng delta vào bộ đếm tại mọi x có R(x, y)
+    def shift_guarded(self, node, y, delta, pending, skip=None):
+        name, x_position, y_position, _ = self.guarded[node]
+        counts = self.counts[node]
+        rows = pending.setdefault(node, set())
+        for fact in self.index(name, y_position).get(y, ()):
+            x = fact[x_position]
+            if x in self.domain and x != skip:
+                counts[(x,)] = counts.get((x,), 0) + delta
+                rows.add((x,))
+
+    # Lượng từ có biến xuất hiện trong thân thì cần bộ đếm; lượng từ thừa chỉ truyền giá trị của thân
+    def counted(self, node):
+        return node not in self.guarded and isinstance(node, (ForAll, Exists)) and node.variable in node.child.free
+
+    # Vị trí của biến bị lượng hóa trong dòng của thân
+    def bound_position(self, node):
+        return self.variables[node.child].index(node.variable)
+
+    def holds(self, name, values):
+        func = self.functions.get(name)
+        if func is not None:
+            return bool(func(*values))
+        return values in self.facts[name]
+
+    def lookup(self, node, env):
+        return self.tables[node][tuple(env[variable] for variable in self.variables[node])]
+
+    def compute(self, node, row):
+        env = dict(zip(self.variables[node], row))
+        if isinstance(node, Predicate):
+            return self.holds(node.name, tuple(env[argument] for argument in node.arguments))
+        if isinstance(node, Not):
+            return not self.lookup(node.child, env)
+        if isinstance(node, And):
+            return self.lookup(node.left, env) and self.lookup(node.right, env)
+        if isinstance(node, Or):
+            return self.lookup(node.left, env) or self.lookup(node.right, env)
+        if isinstance(node, Implies):
+            return not self.lookup(node.left, env) or self.lookup(node.right, env)
+        if node not in self.guarded and not self.counted(node):
+            return self.lookup(node.child, env) if self.domain else isinstance(node, ForAll)
+        count = self.counts[node].get(row, 0)
+        return count > 0 if isinstance(node, Exists) else count == 0
+
+    # Số nhân chứng/phản ví dụ của một dòng, đếm lại trên toàn miền
+    def count_row(self, node, row, elements):
+        table = self.tables[node.child]
+        position = self.bound_position(node)
+        wanted = isinstance(node, Exists)
+        return sum(table[row[:position] + (element,) + row[position:]] == wanted for element in elements)
+
+    # Tính lại toàn bộ (khi khởi tạo hoặc khi miền trở thành rỗng/khác rỗng)
+    def rebuild(self):
+        elements = list(self.domain)
+        for node in self.nodes:
+            if self.counted(node):
+                counts = {}
+                position = self.bound_position(node)
+                wanted = isinstance(node, Exists)
+                for row, value in self.tables[node.child].items():
+                    if value == wanted:
+                        key = row[:position] + row[position + 1:]
+                        counts[key] = counts.get(key, 0) + 1
+                self.counts[node] = counts
+            elif node in self.guarded:
+                self.counts[node] = {(x,): self.count_guarded(node, x) for x in elements}
+            self.tables[node] = {row: self.compute(node, row)
+                                 for row in product(elements, repeat=len(self.variables[node]))}
+        self.notify(self.tables[self.formula][()])
+
+    # Dòng row của node đổi từ old sang new: cập nhật bộ đếm hoặc đánh dấu các dòng của cha cần tính lại
+    def affect(self, parent, node, row, old, new, pending, elements):
+        if parent in self.guarded:
+            if not row:
+                # Phần còn lại là hằng: đếm lại mọi dòng
+                self.counts[parent] = {(x,): self.count_guarded(parent, x) for x in elements}
+                pending.setdefault(parent, set()).update(self.counts[parent])
+            elif old == isinstance(parent, Exists) or new == isinstance(parent, Exists):
+                self.shift_guarded(parent, row[0], 1 if new == isinstance(parent, Exists) else -1, pending)
+            return
+        if self.counted(parent):
+            position = self.bound_position(parent)
+            key = row[:position] + row[position + 1:]
+            counts = self.counts[parent]
+            wanted = isinstance(parent, Exists)
+            if new == wanted:
+                counts[key] = counts.get(key, 0) + 1
+            elif old == wanted:
+                counts[key] -= 1
+            pending.setdefault(parent, set()).add(key)
+            return
+        env = dict(zip(self.variables[node], row))
+        variables = self.variables[parent]
+        extra = [variable for variable in variables if variable not in env]
+        rows = pending.setdefault(parent, set())
+        for values in product(elements, repeat=len(extra)):
+            env.update(zip(extra, values))
+            rows.add(tuple(env[variable] for variable in variables))
+
+    # Tính lại các dòng đang chờ theo thứ tự hậu tự, lan thay đổi lên cha
+    def propagate(self, pending):
+        elements = list(self.domain)
+        for node in self.nodes:
+            rows = pending.pop(node, None)
+            if not rows:
+                continue
+            table = self.tables[node]
+            for row in rows:
+                old = table.get(row)
+                if old is None:
+                    continue
+                new = self.compute(node, row)
+                if new != old:
+                    table[row] = new
+                    for parent in self.parents[node]:
+                        self.affect(parent, node, row, old, new, pending, elements)
+        self.notify(self.tables[self.formula][()])
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def notify(self, value):
+        old, self.value = self.value, value
+        if old is not None and old != value:
+            for callback in list(self.subscribers):
+                callback(value)
+
+    # Đặt sự kiện name(values) thành đúng/sai; chỉ các dòng của vị từ name khớp với values bị ảnh hưởng
+    def set_fact(self, name, values, holds=True):
+        if name in self.functions:
+            raise ValueError(f"Vị từ {name} là hàm Python, không cập nhật từng sự kiện được")
+        values = values if isinstance(values, tuple) else (values,)
+        facts = self.facts.setdefault(name, set())
+        if (values in facts) == holds:
+            return self.value
+        if holds:
+            facts.add(values)
+        else:
+            facts.discard(values)
+        for position, index in self.indexes.get(name, {}).items():
+            if holds:
+                index.setdefault(values[position], set()).add(values)
+            else:
+                index[values[position]].discard(values)
+        pending = {}
+        for node, (guard_name, x_position, y_position, rest) in self.guarded.items():
+            if guard_name != name or len(values) != 2:
+                continue
+            x, y = values[x_position], values[y_position]
+            if x in self.domain and y in self.domain and self.rest_value(rest, y) == isinstance(node, Exists):
+                self.counts[node][(x,)] += 1 if holds else -1
+                pending.setdefault(node, set()).add((x,))
+        for node in self.nodes:
+            if not isinstance(node, Predicate) or node.name != name or len(node.arguments) != len(values):
+                continue
+            env = {}
+            if all(env.setdefault(argument, value) == value and value in self.domain
+                   for argument, value in zip(node.arguments, values)):
+                pending.setdefault(node, set()).add(tuple(env[variable] for variable in self.variables[node]))
+        self.propagate(pending)
+        return self.value
+
+    def add_fact(self, name, *values):
+        return self.set_fact(name, values, True)
+
+    def remove_fact(self, name, *values):
+        return self.set_fact(name, values, False)
+
+    # Thêm một phần tử: tạo các dòng mới có chứa phần tử đó; các dòng cũ chỉ đổi ở lượng từ
+    # (thêm một nhân chứng/phản ví dụ) và được lan lên như một thay đổi thường
+    def add_element(self, element):
+        if element in self.domain:
+            return self.value
+        others = list(self.domain)
+        self.domain[element] = None
+        if not others:
+            self.rebuild()
+            return self.value
+        elements = others + [element]
+        pending = {}
+        added = {}
+        for node in self.nodes:
+            if self.counted(node):
+                position = self.bound_position(node)
+                counts = self.counts[node]
+                wanted = isinstance(node, Exists)
+                table = self.tables[node.child]
+                for row in added[node.child]:
+                    key = row[:position] + row[position + 1:]
+                    if element not in key and table[row] == wanted:
+                        counts[key] = counts.get(key, 0) + 1
+                        pending.setdefault(node, set()).add(key)
+            elif node in self.guarded:
+                if self.rest_value(self.guarded[node][3], element) == isinstance(node, Exists):
+                    self.shift_guarded(node, element, 1, pending, skip=element)
+            table = self.tables[node]
+            rows = added[node] = list(rows_with(element, others, len(self.variables[node])))
+            for row in rows:
+                if self.counted(node):
+                    self.counts[node][row] = self.count_row(node, row, elements)
+                elif node in self.guarded:
+                    self.counts[node][row] = self.count_guarded(node, row[0])
+                table[row] = self.compute(node, row)
+        self.propagate(pending)
+        return self.value
+
+    # Bớt một phần tử: xóa các dòng có chứa phần tử đó và trừ bộ đếm của các dòng cũ tương ứng
+    def remove_element(self, element):
+        if element not in self.domain:
+            return self.value
+        del self.domain[element]
+        others = list(self.domain)
+        if not others:
+            self.rebuild()
+            return self.value
+        pending = {}
+        removed = {}
+        for node in self.nodes:
+            table = self.tables[node]
+            rows = list(rows_with(element, others, len(self.variables[node])))
+            removed[node] = [(row, table.pop(row)) for row in rows]
+            if self.counted(node):
+                position = self.bound_position(node)
+                counts = self.counts[node]
+                wanted = isinstance(node, Exists)
+                for row, value in removed[node.child]:
+                    key = row[:position] + row[position + 1:]
+                    if element not in key and value == wanted:
+                        counts[key] -= 1
+                        pending.setdefault(node, set()).add(key)
+                for row in rows:
+                    counts.pop(row, None)
+            elif node in self.guarded:
+                rest = self.guarded[node][3]
+                if type(rest) is bool or not rest.free:
+                    value = self.rest_value(rest, element)
+                else:
+                    value = dict(removed[rest])[(element,)]
+                if value == isinstance(node, Exists):
+                    self.shift_guarded(node, element, -1, pending)
+                for row in rows:
+                    self.counts[node].pop(row, None)
+        self.propagate(pending)
+        return self.value
@@ -0,0 +1,95 @@
+# Duyệt song song không gian phép gán bằng nhiều tiến trình.
+# Không gian 2^n dòng được chia theo giá trị của các biến đầu (mỗi khối cố định các biến đầu),
+# mỗi tác vụ là một đoạn liên tiếp các khối. Biểu thức đã phân tích được gửi sang mỗi tiến trình
+# đúng một lần qua initializer của Pool, tác vụ chỉ mang chỉ số khối.
+import multiprocessing
+
+from BTTH2_logicAI_core import assignment_at, assignment_blocks, block_layout
+
+# Số tác vụ trung bình cho mỗi tiến trình (nhiều hơn 1 để cân bằng tải)
+TASKS_PER_WORKER = 8
+
+# Trạng thái riêng của mỗi tiến trình con, gán một lần trong init_worker
+WORKER = {}
+
+def init_worker(expressions, variables):
+    WORKER["expressions"] = expressions
+    WORKER["variables"] = variables
+
+# Chia [0, blocks) thành các đoạn liên tiếp theo thứ tự
+def split_blocks(blocks, workers):
+    step = max(1, blocks // (workers * TASKS_PER_WORKER))
+    return [(start, min(start + step, blocks)) for start in range(0, blocks, step)]
+
+def block_count(variables):
+    return 1 << block_layout(len(variables))[0]
+
+# Tác vụ của truth_table: kết quả (số nguyên đóng gói) của từng khối trong đoạn
+def table_task(bounds):
+    (expression,) = WORKER["expressions"]
+    return [expression.bitmask(columns, full)
+            for _, full, columns in assignment_blocks(WORKER["variables"], *bounds)]
+
+# Tác vụ tìm dòng đầu tiên trong đoạn mà mọi biểu thức "cần đúng" đều đúng và mọi biểu thức
+# "cần sai" đều sai. Trả về chỉ số dòng toàn cục hoặc None
+def search_task(bounds, first, required, refuted):
+    start, stop = bounds
+    expressions = WORKER["expressions"]
+    for offset, (_, full, columns) in enumerate(assignment_blocks(WORKER["variables"], start, stop, first)):
+        rows = full
+        for expression in expressions[:required]:
+            rows &= expression.bitmask(columns, full)
+            if not rows:
+                break
+        for expression in expressions[required:required + refuted]:
+            if not rows:
+                break
+            rows &= full ^ expression.bitmask(columns, full)
+        if rows:
+            return (start + offset) * full.bit_length() + (rows & -rows).bit_length() - 1
+    return None
+
+def counterexample_task(bounds):
+    return search_task(bounds, True, len(WORKER["expressions"]) - 1, 1)
+
+def model_task(bounds):
+    return search_task(bounds, False, 1, 0)
+
+def make_pool(expressions, variables, workers):
+    return multiprocessing.Pool(workers, initializer=init_worker, initargs=(expressions, variables))
+
+# Bảng chân trị song song: trả về lần lượt (giá trị các biến đầu, số dòng, kết quả) như
+# truth_table_blocks, theo đúng thứ tự tuần tự
+def parallel_truth_table(expression, variables, workers):
+    tasks = split_blocks(block_count(variables), workers)
+    high_count, low_count = block_layout(len(variables))
+    with make_pool([expression], variables, workers) as pool:
+        for (start, _), results in zip(tasks, pool.imap(table_task, tasks)):
+            for offset, result in enumerate(results):
+                index = start + offset
+                high_values = tuple(((index >> (high_count - 1 - j)) & 1) == 0 for j in range(high_count))
+                yield high_values, 1 << low_count, result
+
+# Chạy tác vụ tìm kiếm trên mọi đoạn, lấy kết quả theo thứ tự đoạn; đoạn đầu tiên có kết quả
+# chính là kết quả đầu tiên theo thứ tự tuần tự, khi đó dừng ngay mọi tiến trình còn lại
+def first_row(task, expressions, variables, workers):
+    tasks = split_blocks(block_count(variables), workers)
+    pool = make_pool(expressions, variables, workers)
+    try:
+        for row in pool.imap(task, tasks):
+            if row is not None:
+                return row
+        return None
+    finally:
+        pool.terminate()
+        pool.join()
+
+# Phản ví dụ đầu tiên (theo thứ tự product([True, False])) làm mọi premise đúng và conclusion sai
+def parallel_counterexample(premises, conclusion, variables, workers):
+    row = first_row(counterexample_task, list(premises) + [conclusion], variables, workers)
+    return None if row is None else assignment_at(variables, row)
+
+# Mẫu thỏa mãn đầu tiên theo thứ tự product([False, True])
+def parallel_find_model(expression, variables, workers):
+    row = first_row(model_task, [expression], variables, workers)
+    return None if row is None else assignment_at(variables, row, first=False)
@@ -0,0 +1,256 @@
+# Đo đạc các đường nóng: đếm số lần tính và số lần đoản mạch của từng nút, thời gian theo loại phép toán,
+# số lần gọi và thời gian của từng vị từ (bài 3), hook gọi lại sau mỗi lần tính và xuất dạng "folded stacks"
+# cho flamegraph.pl / speedscope.
+# Khi bật, Profiler đăng ký làm bộ theo dõi core.TRACER (evaluate/bitmask của logic mệnh đề duyệt cây bằng
+# ngăn xếp và báo vào/ra từng nút) và thay tạm các phương thức evaluate/evaluate_vector (logic vị từ)
+# của các lớp nút bằng hàm bọc; khi tắt thì trả lại như cũ, nên lúc không đo không có chi phí nào.
+# Trong lúc đo, compile() trả về hàm gọi evaluate thay cho mã phẳng nên các đường duyệt 2^n tổ hợp
+# (prove_by_truth_table, find_model method="enumerate") vẫn đo được từng nút; chế độ vector của bài 3 đo
+# từng lần gọi hàm vị từ và từng lần tra quan hệ của VectorContext; bộ giải CDCL (mã hóa Tseitin và
+# solve) được đo như một phép toán, không theo từng nút.
+#
+#   with Profiler() as profiler:
+#       truth_table("(A ∧ B) → C")
+#   print(profiler.report())
+#   profiler.write_folded("stacks.txt")   # flamegraph.pl stacks.txt > graph.svg
+import time
+
+import BTTH2_logicAI_core as core
+import BTTH2_logicAI_bai3 as predicate_logic
+import BTTH2_logicAI_sat as sat
+
+# (lớp, tên phương thức) được thay bằng hàm bọc
+FORMULA_METHODS = [(cls, name) for cls in (predicate_logic.Predicate, predicate_logic.Not, predicate_logic.And,
+                                           predicate_logic.Or, predicate_logic.Implies, predicate_logic.ForAll,
+                                           predicate_logic.Exists)
+                   for name in ("evaluate", "evaluate_vector")]
+
+# Các phương thức tra quan hệ của VectorContext (đối số đầu là tên vị từ hoặc nút vị từ)
+LOOKUP_METHODS = ["relation_flags", "matches", "semijoin"]
+
+# (lớp, tên phương thức) của bộ giải CDCL, đo theo từng lần gọi
+SOLVER_METHODS = [(sat.CNF, "add"), (sat.Solver, "solve")]
+
+# Nhãn của một nút trong báo cáo và flamegraph được cắt ngắn còn bấy nhiêu ký tự
+LABEL_WIDTH = 60
+
+# Profiler đang bật (chỉ cho phép một profiler tại một thời điểm vì các phương thức được thay ở mức lớp)
+ACTIVE = None
+
+def label_of(node):
+    text = str(node)
+    if len(text) > LABEL_WIDTH:
+        text = text[:LABEL_WIDTH - 1] + "…"
+    return f"{type(node).__name__} {text}".replace(";", ",")
+
+# Số lần gọi nút con trực tiếp mà dưới mức đó thì coi là đoản mạch (bỏ qua việc tính phần còn lại).
+# Chỉ áp dụng cho evaluate: phép hai ngôi cần 2 lần, lượng từ (vòng lặp) cần một lần cho mỗi phần tử
+def expected_children(node, method, args):
+    if method != "evaluate":
+        return None
+    if hasattr(node, "left"):
+        return 2
+    if isinstance(node, (predicate_logic.ForAll, predicate_logic.Exists)):
+        return len(args[0])
+    return None
+
+class Profiler:
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.nodes = {}       # nút -> [số lần tính, số lần đoản mạch, tổng thời gian, thời gian riêng]
+        self.operators = {}   # "lớp.phương thức" -> [số lần tính, tổng thời gian, thời gian riêng]
+        self.predicates = {}  # tên vị từ -> [số lần tính, tổng thời gian]
+        self.stacks = {}      # chuỗi nhãn từ gốc đến nút -> thời gian riêng
+        self.frames = []      # [số lần gọi con, thời gian của các con, bắt đầu] của từng nút đang tính
+        self.path = []
+        self.labels = {}      # nút -> nhãn (str của nút lớn tốn O(kích thước) nên chỉ tạo một lần)
+        self.originals = []
+
+    # Hook nhận (nút, tên phương thức, thời gian, kết quả) sau mỗi lần tính một nút
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    # ---- Giao diện tracer của core: vào/ra từng nút ----
+
+    def depth(self):
+        return len(self.frames)
+
+    def unwind(self, depth):
+        del self.frames[depth:]
+        del self.path[depth:]
+
+    def enter(self, node):
+        label = self.labels.get(node)
+        if label is None:
+            label = self.labels[node] = label_of(node)
+        self.push(label)
+
+    def leave(self, node, method, result, args=()):
+        frame, stack, elapsed = self.pop()
+        self.record(node, method, args, stack, frame, elapsed, result)
+
+    def push(self, label):
+        frames = self.frames
+        if frames:
+            frames[-1][0] += 1
+        self.path.append(label)
+        # [số lần gọi con, thời gian của các con, thời điểm bắt đầu]
+        frames.append([0, 0.0, time.perf_counter()])
+
+    def pop(self):
+        frame = self.frames.pop()
+        elapsed = time.perf_counter() - frame[2]
+        stack = tuple(self.path)
+        self.path.pop()
+        if self.frames:
+            self.frames[-1][1] += elapsed
+        return frame, stack, elapsed
+
+    def wrap(self, method, original):
+        def wrapped(node, *args, **kwargs):
+            depth = len(self.frames)
+            self.enter(node)
+            try:
+                result = original(node, *args, **kwargs)
+            except BaseException:
+                self.unwind(depth)
+                raise
+            self.leave(node, method, result, args)
+            return result
+        return wrapped
+
+    # Bọc một lời gọi không gắn với nút (hàm vị từ, tra quan hệ, bộ giải): chỉ tính vào phép toán name,
+    # vị từ predicate (nếu có) và flamegraph
+    def wrap_call(self, name, original, predicate=None):
+        def wrapped(*args, **kwargs):
+            depth = len(self.frames)
+            self.push(name if predicate is None else f"{name} {predicate(args)}")
+            try:
+                result = original(*args, **kwargs)
+            except BaseException:
+                self.unwind(depth)
+                raise
+            frame, stack, elapsed = self.pop()
+            own = elapsed - frame[1]
+            operator = self.operators.setdefault(name, [0, 0.0, 0.0])
+            operator[0] += 1
+            operator[1] += elapsed
+            operator[2] += own
+            if predicate is not None:
+                stats = self.predicates.setdefault(predicate(args), [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + own
+            return result
+        return wrapped
+
+    # VectorContext gọi thẳng hàm vị từ (không qua Predicate.evaluate): thay bằng hàm bọc khi dựng ngữ cảnh
+    def wrap_context(self, original):
+        def init(context, domain, predicates):
+            original(context, domain, predicates)
+            context.predicates = {
+                name: func if isinstance(func, predicate_logic.Relation)
+                else self.wrap_call("VectorContext.call", func, lambda args, name=name: name)
+                for name, func in predicates.items()}
+        return init
+
+    def record(self, node, method, args, stack, frame, elapsed, result):
+        own = elapsed - frame[1]
+        stats = self.nodes.get(node)
+        if stats is None:
+            stats = self.nodes[node] = [0, 0, 0.0, 0.0]
+        stats[0] += 1
+        expected = expected_children(node, method, args)
+        if expected is not None and frame[0] < expected:
+            stats[1] += 1
+        stats[2] += elapsed
+        stats[3] += own
+        operator = self.operators.setdefault(f"{type(node).__name__}.{method}", [0, 0.0, 0.0])
+        operator[0] += 1
+        operator[1] += elapsed
+        operator[2] += own
+        # Mỗi lần Predicate.evaluate là một lần gọi vị từ; evaluate_vector đo qua wrap_context/LOOKUP_METHODS
+        if method == "evaluate" and isinstance(node, predicate_logic.Predicate):
+            predicate = self.predicates.setdefault(node.name, [0, 0.0])
+            predicate[0] += 1
+            predicate[1] += elapsed
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + own
+        for hook in self.hooks:
+            hook(node, method, elapsed, result)
+
+    def enable(self):
+        global ACTIVE
+        if ACTIVE is not None:
+            raise RuntimeError("Đã có một Profiler đang bật")
+        ACTIVE = self
+        core.TRACER = self
+        for cls, name in FORMULA_METHODS:
+            original = cls.__dict__[name]
+            self.originals.append((cls, name, original))
+            setattr(cls, name, self.wrap(name, original))
+        context = predicate_logic.VectorContext
+        patches = [(context, "__init__", self.wrap_context(context.__dict__["__init__"]))]
+        for name in LOOKUP_METHODS:
+            patches.append((context, name, self.wrap_call(f"VectorContext.{name}", context.__dict__[name],
+                                                          lambda args: getattr(args[1], "name", args[1]))))
+        for cls, name in SOLVER_METHODS:
+            patches.append((cls, name, self.wrap_call(f"{cls.__name__}.{name}", cls.__dict__[name])))
+        for cls, name, wrapped in patches:
+            self.originals.append((cls, name, cls.__dict__[name]))
+            setattr(cls, name, wrapped)
+        return self
+
+    def disable(self):
+        global ACTIVE
+        for cls, name, original in reversed(self.originals):
+            setattr(cls, name, original)
+        self.originals = []
+        core.TRACER = None
+        self.frames.clear()
+        self.path.clear()
+        ACTIVE = None
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def reset(self):
+        self.nodes.clear()
+        self.operators.clear()
+        self.predicates.clear()
+        self.stacks.clear()
+
+    # Dạng folded stacks: mỗi dòng "gốc;...;nút <thời gian riêng tính bằng micro giây>"
+    def folded(self):
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            micros = round(seconds * 1e6)
+            if micros > 0:
+                lines.append(f"{';'.join(stack)} {micros}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_folded(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
+
+    # Báo cáo dạng văn bản: các nút tốn thời gian riêng nhiều nhất, thời gian theo loại phép toán, các vị từ
+    def report(self, limit=20):
+        lines = [f"{'Nút':{LABEL_WIDTH + 10}} {'lần tính':>10} {'đoản mạch':>10} {'tổng (ms)':>10} {'riêng (ms)':>10}"]
+        top = sorted(self.nodes.items(), key=lambda item: -item[1][3])[:limit]
+        for node, (calls, short, total, own) in top:
+            lines.append(f"{self.labels[node]:{LABEL_WIDTH + 10}} {calls:10} {short:10} {total * 1e3:10.3f} {own * 1e3:10.3f}")
+        lines.append("")
+        lines.append(f"{'Phép toán':28} {'lần tính':>10} {'tổng (ms)':>10} {'riêng (ms)':>10}")
+        for name, (calls, total, own) in sorted(self.operators.items(), key=lambda item: -item[1][2]):
+            lines.append(f"{name:28} {calls:10} {total * 1e3:10.3f} {own * 1e3:10.3f}")
+        if self.predicates:
+            lines.append("")
+            lines.append(f"{'Vị từ':20} {'lần gọi':>10} {'tổng (ms)':>10} {'trung bình (µs)':>16}")
+            for name, (calls, total) in sorted(self.predicates.items(), key=lambda item: -item[1][1]):
+                lines.append(f"{name:20} {calls:10} {total * 1e3:10.3f} {total / calls * 1e6:16.2f}")
+        return "\n".join(lines)
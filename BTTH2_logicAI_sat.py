@@ -0,0 +1,519 @@
+# Bộ giải SAT cho logic mệnh đề: mã hóa Tseitin sang CNF và thuật toán CDCL
+# (lan truyền hai literal theo dõi, học mệnh đề 1-UIP rút gọn đệ quy, chọn biến kiểu VSIDS, khởi động lại
+# theo LBD và đặt lại pha đã lưu bằng tìm kiếm cục bộ).
+# Literal được viết theo kiểu DIMACS: biến có số hiệu 1..n, literal âm là phủ định.
+import collections
+import heapq
+import random
+
+from BTTH2_logicAI_walksat import WalkSAT
+
+# Các cặp nút cùng loại được gộp thành phép toán nhiều ngôi khi mã hóa
+FLATTEN = ("And", "Or")
+
+# Lấy danh sách toán hạng của một nút, gộp chuỗi And/Or lồng nhau cùng loại
+def operands(node):
+    kind = type(node).__name__
+    if kind == "Not":
+        return [node.child]
+    if kind not in FLATTEN:
+        return [node.left, node.right]
+    result = []
+    stack = [node.right, node.left]
+    while stack:
+        current = stack.pop()
+        if type(current).__name__ == kind:
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            result.append(current)
+    return result
+
+# Tập mệnh đề CNF sinh bằng mã hóa Tseitin: mỗi nút con được gán một biến phụ,
+# nên kích thước CNF tuyến tính theo kích thước biểu thức
+class CNF:
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+        self.names = {}     # tên biến logic -> số hiệu biến
+        self.literals = {}  # nút đã mã hóa -> literal tương ứng
+        self.true = None    # biến luôn đúng, dùng cho hằng ⊤/⊥
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def constant(self, value):
+        if self.true is None:
+            self.true = self.new_var()
+            self.clauses.append([self.true])
+        return self.true if value else -self.true
+
+    def variable(self, name):
+        if name not in self.names:
+            self.names[name] = self.new_var()
+        return self.names[name]
+
+    # Literal tương đương với nút (duyệt hậu thứ tự bằng ngăn xếp để không tràn đệ quy)
+    def literal(self, node):
+        literals = self.literals
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in literals:
+                stack.pop()
+                continue
+            if type(current).__name__ == "Variable":
+                literals[current] = self.variable(current.name)
+                stack.pop()
+                continue
+            if type(current).__name__ == "Constant":
+                literals[current] = self.constant(current.value)
+                stack.pop()
+                continue
+            children = operands(current)
+            pending = [child for child in children if child not in literals]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            literals[current] = self.define(type(current).__name__, [literals[child] for child in children])
+        return literals[node]
+
+    # Thêm các mệnh đề định nghĩa x ↔ op(args) và trả về x
+    def define(self, kind, args):
+        if kind == "Not":
+            return -args[0]
+        x = self.new_var()
+        if kind == "And":
+            for a in args:
+                self.clauses.append([-x, a])
+            self.clauses.append([x] + [-a for a in args])
+        elif kind == "Or":
+            for a in args:
+                self.clauses.append([x, -a])
+            self.clauses.append([-x] + args)
+        elif kind == "Implies":
+            a, b = args
+            self.clauses.append([-x, -a, b])
+            self.clauses.append([x, a])
+            self.clauses.append([x, -b])
+        else:
+            raise ValueError(f"Không mã hóa được nút {kind}")
+        return x
+
+    # Khẳng định biểu thức đúng: các vế của phép And ngoài cùng được thêm riêng,
+    # vế nào đã có dạng tuyển của các literal thì thêm thẳng thành mệnh đề, không cần biến phụ
+    def add(self, node):
+        conjuncts = operands(node) if type(node).__name__ == "And" else [node]
+        for conjunct in conjuncts:
+            clause = self.as_clause(conjunct)
+            if clause is None:
+                clause = [self.literal(conjunct)]
+            self.clauses.append(clause)
+
+    def as_clause(self, node):
+        terms = operands(node) if type(node).__name__ == "Or" else [node]
+        clause = []
+        for term in terms:
+            kind = type(term).__name__
+            if kind == "Variable":
+                clause.append(self.variable(term.name))
+            elif kind == "Not" and type(term.child).__name__ == "Variable":
+                clause.append(-self.variable(term.child.name))
+            else:
+                return None
+        return clause
+
+# Bộ giải CDCL. Bên trong mỗi literal được mã thành số nguyên 2*v (dương) hoặc 2*v+1 (âm),
+# nên phủ định chỉ là phép XOR với 1 và mọi bảng tra đều là list.
+# Mệnh đề là list mã literal, hai phần tử đầu là hai literal đang theo dõi; danh sách theo dõi và
+# lý do của phép gán giữ thẳng đối tượng mệnh đề (không qua chỉ số). Mệnh đề lý do luôn có literal
+# được suy ra ở vị trí 0.
+class Solver:
+    VAR_DECAY = 0.95
+    # Đặt lại pha bằng tìm kiếm cục bộ: lần đầu trước khi tìm kiếm, các lần sau cách thêm REPHASE_STEP
+    # xung đột mỗi lần; mỗi lần đi tối đa WALK_EFFORT bước lật cho mỗi biến
+    REPHASE_FIRST = 0
+    REPHASE_STEP = 1000
+    WALK_EFFORT = 20
+    # Khởi động lại theo LBD (kiểu Glucose): khởi động lại khi LBD trung bình của LBD_WINDOW mệnh đề
+    # học gần nhất nhân RESTART_MARGIN vẫn lớn hơn LBD trung bình từ đầu (các mệnh đề gần đây kém hơn);
+    # hoãn khởi động lại khi trail dài hơn BLOCK_MARGIN lần trung bình (có thể đang gần một mô hình)
+    LBD_WINDOW = 50
+    RESTART_MARGIN = 0.8
+    TRAIL_WINDOW = 5000
+    BLOCK_MARGIN = 1.4
+    BLOCK_AFTER = 10000
+    # Dọn mệnh đề học: lần đầu sau REDUCE_FIRST xung đột, các lần sau cách thêm REDUCE_STEP
+    REDUCE_FIRST = 2000
+    REDUCE_STEP = 300
+
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []       # các mệnh đề ban đầu (từ hai literal trở lên)
+        self.learnts = []       # các mệnh đề học được
+        self.lbd = {}           # id(mệnh đề học) -> số mức quyết định khác nhau (LBD)
+        self.watches = [[], []]
+        self.vals = [0, 0]      # giá trị theo mã literal: 1 đúng, -1 sai, 0 chưa gán
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.polarity = [False]
+        self.seen = [0]
+        self.heap = []
+        self.var_inc = 1.0
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.ok = True
+        self.model = None
+        self.conflicts = 0
+        self.next_reduce = self.REDUCE_FIRST
+        self.reductions = 0
+        self.lbd_sum = 0
+        self.next_rephase = self.REPHASE_FIRST
+        self.rephases = 0
+        self.walker = None      # WalkSAT trên các mệnh đề ban đầu, dựng lại khi có mệnh đề mới
+        self.walker_key = None
+        self.rng = random.Random(0)
+
+    def new_var(self):
+        self.num_vars += 1
+        v = self.num_vars
+        self.watches += [[], []]
+        self.vals += [0, 0]
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.polarity.append(False)
+        self.seen.append(0)
+        heapq.heappush(self.heap, (0.0, v))
+        return v
+
+    def ensure_vars(self, n):
+        while self.num_vars < n:
+            self.new_var()
+
+    def add_cnf(self, cnf, start=0):
+        self.ensure_vars(cnf.num_vars)
+        for clause in cnf.clauses[start:]:
+            self.add_clause(clause)
+        return self.ok
+
+    # Thêm một mệnh đề (literal kiểu DIMACS); có thể gọi giữa các lần solve()
+    def add_clause(self, literals):
+        if not self.ok:
+            return False
+        self.backtrack(0)
+        vals = self.vals
+        clause = []
+        for lit in literals:
+            v = abs(lit)
+            self.ensure_vars(v)
+            code = 2 * v + (lit < 0)
+            if vals[code] == 1 or (code ^ 1) in clause:
+                return True  # đã thỏa ở mức 0 hoặc là hằng đúng
+            if vals[code] == 0 and code not in clause:
+                clause.append(code)
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self.assign(clause[0], None)
+            self.ok = self.propagate() is None
+            return self.ok
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+        return True
+
+    def assign(self, code, reason):
+        v = code >> 1
+        self.vals[code] = 1
+        self.vals[code ^ 1] = -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(code)
+
+    def backtrack(self, target):
+        if len(self.trail_lim) <= target:
+            return
+        vals, reason, polarity, activity, heap = self.vals, self.reason, self.polarity, self.activity, self.heap
+        stop = self.trail_lim[target]
+        for code in self.trail[stop:]:
+            v = code >> 1
+            vals[code] = 0
+            vals[code ^ 1] = 0
+            reason[v] = None
+            polarity[v] = not (code & 1)
+            heapq.heappush(heap, (-activity[v], v))
+        del self.trail[stop:]
+        del self.trail_lim[target:]
+        self.qhead = stop
+        if len(heap) > 4 * self.num_vars + 1000:
+            # Dọn các phần tử cũ trong heap (mỗi biến chỉ cần một phần tử theo hoạt độ hiện tại)
+            self.heap = [(-activity[v], v) for v in range(1, self.num_vars + 1) if vals[2 * v] == 0]
+            heapq.heapify(self.heap)
+
+    # Lan truyền đơn vị với hai literal theo dõi: clause[0] và clause[1].
+    # Trả về mệnh đề xung đột hoặc None
+    def propagate(self):
+        vals, watches, trail = self.vals, self.watches, self.trail
+        level, reason = self.level, self.reason
+        current = len(self.trail_lim)
+        qhead = self.qhead
+        while qhead < len(trail):
+            false_lit = trail[qhead] ^ 1
+            qhead += 1
+            ws = watches[false_lit]
+            i = j = 0
+            n = len(ws)
+            while i < n:
+                c = ws[i]
+                i += 1
+                first = c[0]
+                if first == false_lit:
+                    first = c[1]
+                    c[0] = first
+                    c[1] = false_lit
+                if vals[first] == 1:
+                    ws[j] = c
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    if vals[lit] != -1:
+                        c[1] = lit
+                        c[k] = false_lit
+                        watches[lit].append(c)
+                        break
+                else:
+                    ws[j] = c
+                    j += 1
+                    if vals[first] == -1:
+                        ws[j:] = ws[i:]
+                        self.qhead = len(trail)
+                        return c
+                    # Gán literal suy ra (viết gọn thay cho assign() vì đây là vòng lặp nóng nhất)
+                    vals[first] = 1
+                    vals[first ^ 1] = -1
+                    level[first >> 1] = current
+                    reason[first >> 1] = c
+                    trail.append(first)
+            del ws[j:]
+        self.qhead = qhead
+        return None
+
+    def bump(self, v):
+        activity = self.activity
+        activity[v] += self.var_inc
+        if activity[v] > 1e100:
+            for u in range(1, self.num_vars + 1):
+                activity[u] *= 1e-100
+            self.var_inc *= 1e-100
+            self.heap = [(-activity[u], u) for u in range(1, self.num_vars + 1) if self.vals[2 * u] == 0]
+            heapq.heapify(self.heap)
+        elif self.vals[2 * v] == 0:
+            heapq.heappush(self.heap, (-activity[v], v))
+
+    # Phân tích xung đột theo lược đồ 1-UIP; trả về (mệnh đề học được, mức quay lui)
+    def analyze(self, confl):
+        level, reason, seen, trail = self.level, self.reason, self.seen, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        marked = []
+        counter = 0
+        p = None
+        index = len(trail) - 1
+        c = confl
+        while True:
+            for q in (c if p is None else c[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1
+                    marked.append(v)
+                    self.bump(v)
+                    if level[v] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            p = trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            c = reason[p >> 1]
+        learnt[0] = p ^ 1
+
+        # Rút gọn đệ quy: bỏ literal q nếu phủ định của nó được suy ra (qua chuỗi lý do) từ các
+        # literal khác của mệnh đề học; mặt nạ mức giúp loại nhanh các nhánh chắc chắn không rút gọn được
+        levels = 0
+        for q in learnt[1:]:
+            levels |= 1 << (level[q >> 1] & 63)
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            if reason[q >> 1] is None or not self.redundant(q, levels, marked):
+                kept.append(q)
+        for v in marked:
+            seen[v] = 0
+
+        if len(kept) == 1:
+            return kept, 0
+        best = max(range(1, len(kept)), key=lambda k: level[kept[k] >> 1])
+        kept[1], kept[best] = kept[best], kept[1]
+        return kept, level[kept[1] >> 1]
+
+    # Literal q của mệnh đề học có thừa không: mọi literal trong chuỗi lý do của nó (duyệt bằng ngăn xếp)
+    # đều đã nằm trong mệnh đề học hoặc ở mức 0. Các biến đã chứng minh được thừa giữ cờ seen
+    def redundant(self, q, levels, marked):
+        level, reason, seen = self.level, self.reason, self.seen
+        stack = [q]
+        top = len(marked)
+        while stack:
+            c = reason[stack.pop() >> 1]
+            for r in c[1:]:
+                v = r >> 1
+                if seen[v] or not level[v]:
+                    continue
+                if reason[v] is None or not (levels >> (level[v] & 63)) & 1:
+                    for u in marked[top:]:
+                        seen[u] = 0
+                    del marked[top:]
+                    return False
+                seen[v] = 1
+                marked.append(v)
+                stack.append(r)
+        return True
+
+    def pick_branch(self):
+        heap, vals = self.heap, self.vals
+        while heap:
+            _, v = heapq.heappop(heap)
+            if vals[2 * v] == 0:
+                return 2 * v + (not self.polarity[v])
+        return None
+
+    # Xóa một nửa số mệnh đề học được có LBD lớn nhất, trừ mệnh đề LBD <= 2 và mệnh đề đang là lý do
+    # của một phép gán; danh sách theo dõi được dựng lại từ các mệnh đề còn giữ
+    def reduce_learnts(self):
+        vals, reason, lbd = self.vals, self.reason, self.lbd
+        self.learnts.sort(key=lambda c: lbd[id(c)])
+        half = len(self.learnts) // 2
+        kept = self.learnts[:half]
+        for c in self.learnts[half:]:
+            if lbd[id(c)] <= 2 or (vals[c[0]] == 1 and reason[c[0] >> 1] is c):
+                kept.append(c)
+            else:
+                del lbd[id(c)]
+        self.learnts = kept
+        watches = self.watches = [[] for _ in self.watches]
+        for clauses in (self.clauses, kept):
+            for c in clauses:
+                watches[c[0]].append(c)
+                watches[c[1]].append(c)
+        self.reductions += 1
+        self.next_reduce = self.conflicts + self.REDUCE_FIRST + self.REDUCE_STEP * self.reductions
+
+    # Tìm kiếm đến khi có kết quả hoặc đến lúc khởi động lại (trả về None)
+    def search(self, assumptions):
+        recent = collections.deque(maxlen=self.LBD_WINDOW)
+        trails = self.trails
+        while True:
+            confl = self.propagate()
+            if confl is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                trails.append(len(self.trail))
+                if (self.conflicts > self.BLOCK_AFTER and len(recent) == self.LBD_WINDOW
+                        and len(self.trail) > self.BLOCK_MARGIN * sum(trails) / len(trails)):
+                    recent.clear()
+                learnt, target = self.analyze(confl)
+                self.backtrack(target)
+                lbd = len({self.level[q >> 1] for q in learnt})
+                recent.append(lbd)
+                self.lbd_sum += lbd
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self.lbd[id(learnt)] = lbd
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.assign(learnt[0], learnt)
+                self.var_inc /= self.VAR_DECAY
+                continue
+
+            if (len(recent) == self.LBD_WINDOW
+                    and sum(recent) * self.RESTART_MARGIN > self.lbd_sum / self.conflicts * self.LBD_WINDOW):
+                self.backtrack(0)
+                return None
+            if self.conflicts >= self.next_reduce:
+                self.reduce_learnts()
+
+            decision = None
+            while len(self.trail_lim) < len(assumptions):
+                p = assumptions[len(self.trail_lim)]
+                if self.vals[p] == 1:
+                    self.trail_lim.append(len(self.trail))  # mức giả cho giả thiết đã đúng
+                elif self.vals[p] == -1:
+                    return False  # mâu thuẫn với các giả thiết
+                else:
+                    decision = p
+                    break
+            if decision is None:
+                decision = self.pick_branch()
+                if decision is None:
+                    return True
+            self.trail_lim.append(len(self.trail))
+            self.assign(decision, None)
+
+    # Giải với các giả thiết (literal kiểu DIMACS) tùy chọn.
+    # Trả về True (có mô hình), False (không thỏa mãn) hoặc None (hết conflict_limit)
+    def solve(self, assumptions=(), conflict_limit=None):
+        self.model = None
+        if not self.ok:
+            return False
+        self.backtrack(0)
+        if self.propagate() is not None:
+            self.ok = False
+            return False
+        for lit in assumptions:
+            self.ensure_vars(abs(lit))
+        assumptions = [2 * abs(lit) + (lit < 0) for lit in assumptions]
+        self.trails = collections.deque(maxlen=self.TRAIL_WINDOW)
+        start = self.conflicts
+        while True:
+            if self.conflicts >= self.next_rephase:
+                self.rephase()
+            status = self.search(assumptions)
+            if status is True:
+                self.model = [False] + [self.vals[2 * v] == 1 for v in range(1, self.num_vars + 1)]
+            if status is not None:
+                self.backtrack(0)
+                return status
+            if conflict_limit is not None and self.conflicts - start >= conflict_limit:
+                return None
+
+    # Đặt lại pha đã lưu bằng tìm kiếm cục bộ (WalkSAT) trên các mệnh đề ban đầu, bắt đầu từ chính các pha
+    # đang lưu; lấy phép gán làm sai ít mệnh đề nhất làm pha mới cho các lần quyết định sau
+    def rephase(self):
+        self.rephases += 1
+        self.next_rephase = self.conflicts + self.REPHASE_STEP * self.rephases
+        units = len(self.trail)
+        if self.walker_key != (len(self.clauses), units):
+            decode = lambda code: -(code >> 1) if code & 1 else code >> 1
+            clauses = [[decode(code) for code in clause] for clause in self.clauses]
+            clauses += [[decode(code)] for code in self.trail]
+            self.walker = WalkSAT(clauses, self.num_vars)
+            self.walker_key = (len(self.clauses), units)
+        self.walker.reset(self.rng, list(self.polarity))
+        self.polarity[:] = self.walker.walk(self.rng, max_flips=self.WALK_EFFORT * self.num_vars)
+        self.polarity[0] = False
+
+    def value(self, v):
+        return self.model[v]
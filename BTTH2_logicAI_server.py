@@ -0,0 +1,235 @@
+# Dịch vụ tính toán logic chạy cục bộ bằng asyncio, giao tiếp qua TCP localhost hoặc Unix socket.
+#   python BTTH2_logicAI_server.py --port 8765
+#   python BTTH2_logicAI_server.py --unix /tmp/logic.sock --workers 4
+# Giao thức: mỗi dòng một yêu cầu JSON, mỗi dòng một phản hồi JSON (cùng dạng với chế độ hàng loạt
+# BTTH2_logicAI_bulk). Một kết nối có thể gửi liên tiếp nhiều yêu cầu không cần chờ; phản hồi có thể về
+# không theo thứ tự nên mỗi yêu cầu nên có "id".
+#   {"id": 1, "task": "evaluate", "expression": "(A ∧ B) → C", "assignments": {"A": true, "B": true, "C": false}}
+#   {"id": 2, "task": "find_model", "expression": "(A ∨ B) ∧ ¬A"}
+#   {"id": 3, "task": "entail", "premises": ["A", "A → B"], "conclusion": "B"}
+#   {"id": 4, "task": "metrics"}
+# - evaluate: biểu thức đã phân tích và biên dịch được giữ trong bộ nhớ đệm LRU theo chuỗi; các yêu cầu
+#   cùng biểu thức đến trong khoảng BATCH_DELAY được gom lại và tính một lần bằng evaluate_batch (theo cột).
+# - find_model, entail, truth_table, first_order: chạy trên nhóm tiến trình để vòng lặp sự kiện không bị chặn.
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import time
+
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_bai1 import evaluate_batch
+from BTTH2_logicAI_bulk import TASKS, percentile, run_line
+
+# Số biểu thức giữ trong bộ nhớ đệm
+CACHE_SIZE = 1024
+
+# Thời gian chờ gom các yêu cầu evaluate cùng biểu thức (giây) và số yêu cầu tối đa mỗi lô
+BATCH_DELAY = 0.002
+MAX_BATCH = 4096
+
+# Lô nhỏ hơn mức này thì gọi hàm đã biên dịch cho từng yêu cầu (nhanh hơn dựng cột)
+VECTOR_BATCH = 8
+
+# Số độ trễ gần nhất dùng để tính phân vị
+LATENCY_WINDOW = 10000
+
+# Bộ nhớ đệm LRU: chuỗi biểu thức -> (biểu thức, danh sách biến, hàm đã biên dịch)
+class FormulaCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        entry = self.entries.get(text)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(text)
+            return entry
+        self.misses += 1
+        expression = parse_expression(text)
+        variables = sorted(expression.variables())
+        entry = (expression, variables, expression.compile(variables))
+        self.entries[text] = entry
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return entry
+
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.requests = collections.Counter()
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.batches = 0
+        self.batched = 0
+        self.in_flight = 0      # yêu cầu đã nhận, chưa trả lời
+        self.pool_queue = 0     # công việc đang chờ hoặc đang chạy trong nhóm tiến trình
+
+    def snapshot(self, cache, pending_batches):
+        latencies = sorted(self.latencies)
+        return {
+            "uptime": round(time.time() - self.started, 3),
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "pool_queue": self.pool_queue,
+            "batch_queue": pending_batches,
+            "batches": self.batches,
+            "mean_batch": round(self.batched / self.batches, 2) if self.batches else 0,
+            "cache": {"size": len(cache.entries), "hits": cache.hits, "misses": cache.misses},
+            "latency_ms": {name: round(percentile(latencies, p) * 1e3, 3)
+                           for name, p in (("p50", 50), ("p95", 95), ("p99", 99))},
+        }
+
+class LogicServer:
+    def __init__(self, workers=None, timeout=None, cache_size=CACHE_SIZE):
+        self.cache = FormulaCache(cache_size)
+        self.metrics = Metrics()
+        self.pool = concurrent.futures.ProcessPoolExecutor(workers)
+        self.timeout = timeout
+        self.batches = {}       # chuỗi biểu thức -> danh sách (assignments, future) đang chờ gom
+
+    # ---- evaluate: gom lô theo biểu thức ----
+
+    def evaluate(self, text, assignments):
+        future = asyncio.get_running_loop().create_future()
+        batch = self.batches.get(text)
+        if batch is None:
+            batch = self.batches[text] = []
+            asyncio.get_running_loop().call_later(BATCH_DELAY, self.flush, text)
+        batch.append((assignments, future))
+        if len(batch) >= MAX_BATCH:
+            self.flush(text)
+        return future
+
+    def flush(self, text):
+        batch = self.batches.pop(text, None)
+        if not batch:
+            return
+        self.metrics.batches += 1
+        self.metrics.batched += len(batch)
+        try:
+            expression, variables, compiled = self.cache.get(text)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(ValueError(f"Lỗi khi phân tích biểu thức: {e}"))
+            return
+        valid = []
+        for assignments, future in batch:
+            missing = [name for name in variables if name not in assignments]
+            if missing:
+                future.set_exception(KeyError(f"Thiếu giá trị của biến {missing}"))
+            else:
+                valid.append((assignments, future))
+        try:
+            if len(valid) < VECTOR_BATCH or not variables:
+                results = [bool(compiled([assignments[name] for name in variables])) for assignments, _ in valid]
+            else:
+                columns = {name: [bool(assignments[name]) for assignments, _ in valid] for name in variables}
+                results = [bool(value) for value in evaluate_batch(expression, columns)]
+        except Exception as e:
+            for _, future in valid:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(valid, results):
+            future.set_result(result)
+
+    # ---- Xử lý yêu cầu ----
+
+    async def run_in_pool(self, line):
+        self.metrics.pool_queue += 1
+        try:
+            loop = asyncio.get_running_loop()
+            text, _, _ = await loop.run_in_executor(self.pool, run_line, line, self.timeout)
+            return text
+        finally:
+            self.metrics.pool_queue -= 1
+
+    async def handle(self, line):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            task = request.get("task")
+            self.metrics.requests[str(task)] += 1
+            if task == "metrics":
+                result = self.metrics.snapshot(self.cache, sum(map(len, self.batches.values())))
+            elif task == "evaluate":
+                result = await self.evaluate(request["expression"], request.get("assignments", {}))
+            elif task in TASKS:
+                return await self.run_in_pool(line)
+            else:
+                raise ValueError(f"Không có loại công việc {task!r}")
+        except Exception as e:
+            self.metrics.errors += 1
+            return json.dumps({"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"},
+                              ensure_ascii=False)
+        return json.dumps({"id": request_id, "ok": True, "result": result}, ensure_ascii=False)
+
+    async def respond(self, line, writer, lock):
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            text = await self.handle(line)
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.latencies.append(time.perf_counter() - start)
+        writer.write(text.encode("utf-8") + b"\n")
+        async with lock:
+            await writer.drain()
+
+    async def connection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.respond(line.decode("utf-8"), writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix=None):
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.connection, unix)
+        else:
+            server = await asyncio.start_server(self.connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dịch vụ tính toán logic qua socket cục bộ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="đường dẫn Unix socket (thay cho TCP)")
+    parser.add_argument("--workers", type=int, default=None, help="số tiến trình cho các công việc nặng")
+    parser.add_argument("--timeout", type=float, default=None, help="giới hạn thời gian mỗi công việc nặng (giây)")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args(argv)
+
+    server = LogicServer(args.workers, args.timeout, args.cache_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Rút gọn biểu thức logic mệnh đề trước khi tính (bảng chân trị, tìm mô hình, chứng minh).
+# Mỗi lượt viết lại cây theo dạng chuẩn phủ định (NNF: ¬ chỉ đứng trước biến, A → B thành ¬A ∨ B),
+# gộp chuỗi ∧/∨ thành phép nhiều ngôi rồi áp dụng:
+#   hằng:        A ∧ ⊤ = A, A ∧ ⊥ = ⊥, A ∨ ⊥ = A, A ∨ ⊤ = ⊤
+#   lũy đẳng:    A ∧ A = A, A ∨ A = A
+#   bù:          A ∧ ¬A = ⊥, A ∨ ¬A = ⊤
+#   hấp thụ:     A ∧ (A ∨ B) = A, A ∨ (A ∧ B) = A, (A ∨ B) ∧ (A ∨ B ∨ C) = A ∨ B
+#   hấp thụ bù:  A ∧ (¬A ∨ B) = A ∧ B, A ∨ (¬A ∧ B) = A ∨ B
+# và lặp lại đến điểm bất động. Các nút được băm cố định (hash-consing) nên mọi biểu thức con trùng
+# nhau sau khi viết lại là cùng một nút: kết quả là một DAG, không cần bước khử biểu thức con chung riêng.
+import logging
+
+from BTTH2_logicAI_core import Constant, Variable, Not, And, Or, Implies
+
+# Báo cáo rút gọn (số nút trước/sau) của các tùy chọn simplify=True được ghi vào logger này ở mức INFO,
+# không in ra stdout (stdout có thể là bảng chân trị hoặc luồng JSONL); xem bằng
+# logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("BTTH2_logicAI_simplify")
+
+TRUE = Constant(True)
+FALSE = Constant(False)
+
+# Số toán hạng tối đa của một phép ∧/∨ để kiểm tra hấp thụ giữa mọi cặp (chi phí O(k^2))
+ABSORPTION_LIMIT = 200
+
+# Số lượt viết lại tối đa (thường chỉ cần 2-3 lượt là đến điểm bất động)
+MAX_PASSES = 10
+
+# Các toán hạng của chuỗi cùng phép toán kind, ví dụ A ∧ (B ∧ C) -> [A, B, C]
+def flatten(node, kind):
+    if type(node) is not kind:
+        return [node]
+    result = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if type(current) is kind:
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            result.append(current)
+    return result
+
+def join(kind, parts):
+    if not parts:
+        return TRUE if kind is And else FALSE
+    result = parts[0]
+    for part in parts[1:]:
+        result = kind(result, part)
+    return result
+
+# Phủ định của một biểu thức NNF, vẫn ở dạng NNF (luật De Morgan)
+def negated(node, memo):
+    result = memo.get(node)
+    if result is not None:
+        return result
+    if isinstance(node, Variable):
+        result = Not(node)
+    elif isinstance(node, Not):
+        result = node.child
+    elif isinstance(node, Constant):
+        result = Constant(not node.value)
+    else:
+        dual = Or if type(node) is And else And
+        result = join(dual, [negated(part, memo) for part in flatten(node, type(node))])
+    memo[node] = result
+    return result
+
+# Dựng phép kind (And hoặc Or) từ các toán hạng đã rút gọn
+def combine(kind, operands, negations):
+    absorbing, neutral = (FALSE, TRUE) if kind is And else (TRUE, FALSE)
+    dual = Or if kind is And else And
+    parts = []
+    seen = set()
+    for operand in operands:
+        for part in flatten(operand, kind):
+            if part is absorbing:
+                return absorbing
+            if part is not neutral and part not in seen:
+                seen.add(part)
+                parts.append(part)
+    if any(negated(part, negations) in seen for part in parts):
+        return absorbing
+
+    # Hấp thụ: bỏ toán hạng dạng dual có một vế là toán hạng khác
+    parts = [part for part in parts
+             if type(part) is not dual or not any(sub in seen for sub in flatten(part, dual))]
+    # Hấp thụ giữa các toán hạng dạng dual: bỏ toán hạng có tập vế chứa tập vế của toán hạng khác
+    if len(parts) <= ABSORPTION_LIMIT:
+        groups = [frozenset(flatten(part, dual)) for part in parts]
+        parts = [part for i, part in enumerate(parts)
+                 if not any(j != i and (groups[j] < groups[i] or (groups[j] == groups[i] and j < i))
+                            for j in range(len(parts)))]
+    # Hấp thụ bù: trong vế dạng dual, bỏ các vế con là phủ định của một toán hạng không phải dạng dual
+    fixed = {part for part in parts if type(part) is not dual}
+    result = []
+    for part in parts:
+        if type(part) is dual:
+            subs = flatten(part, dual)
+            kept = [sub for sub in subs if negated(sub, negations) not in fixed]
+            if len(kept) != len(subs):
+                part = join(dual, kept)
+                if part is absorbing:
+                    return absorbing
+                if part is neutral:
+                    continue
+        result.append(part)
+    return join(kind, result)
+
+# Một lượt viết lại: dạng NNF của expr (hoặc của ¬expr khi negate=True) đã rút gọn.
+# Duyệt hậu thứ tự bằng ngăn xếp trên các cặp (nút, negate), nút dùng chung chỉ xử lý một lần
+def rewrite(expr, memo, negations):
+    stack = [(expr, False)]
+    while stack:
+        key = stack[-1]
+        if key in memo:
+            stack.pop()
+            continue
+        node, negate = key
+        if isinstance(node, Variable):
+            memo[key] = Not(node) if negate else node
+            stack.pop()
+            continue
+        if isinstance(node, Constant):
+            memo[key] = Constant(node.value != negate)
+            stack.pop()
+            continue
+        if isinstance(node, Not):
+            children = [(node.child, not negate)]
+            kind = None
+        elif isinstance(node, Implies):
+            children = [(node.left, not negate), (node.right, negate)]
+            kind = And if negate else Or
+        else:
+            children = [(part, negate) for part in flatten(node, type(node))]
+            kind = type(node) if not negate else (Or if type(node) is And else And)
+        pending = [child for child in children if child not in memo]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if kind is None:
+            memo[key] = memo[children[0]]
+        else:
+            memo[key] = combine(kind, [memo[child] for child in children], negations)
+    return memo[(expr, False)]
+
+def simplify(expr):
+    negations = {}
+    for _ in range(MAX_PASSES):
+        result = rewrite(expr, {}, negations)
+        if result is expr:
+            break
+        expr = result
+    return expr
+
+# Số nút khác nhau (kích thước DAG) của biểu thức
+def node_count(expr):
+    seen = set()
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        if isinstance(node, Not):
+            stack.append(node.child)
+        elif not isinstance(node, (Variable, Constant)):
+            stack.append(node.left)
+            stack.append(node.right)
+    return len(seen)
+
+def simplify_report(before, after):
+    return (f"Rút gọn: {node_count(before)} → {node_count(after)} nút "
+            f"(dạng cây {before.size} → {after.size} nút)")
+
+# Rút gọn expr và ghi báo cáo vào logger, name cho biết biểu thức nào (ví dụ "kết luận")
+def simplify_logged(expr, name="biểu thức"):
+    result = simplify(expr)
+    logger.info("%s: %s", name, simplify_report(expr, result))
+    return result
@@ -0,0 +1,160 @@
+# Tìm kiếm cục bộ ngẫu nhiên WalkSAT trên CNF (literal kiểu DIMACS): không đầy đủ (không chứng minh được
+# vô nghiệm) nhưng thường tìm mô hình của các biểu thức lớn, ít ràng buộc nhanh hơn nhiều so với CDCL.
+# Mỗi bước chọn ngẫu nhiên một mệnh đề đang sai và lật một biến của nó: biến có break = 0 nếu có,
+# nếu không thì với xác suất noise lật biến ngẫu nhiên, còn lại lật biến có break nhỏ nhất.
+# break(v) là số mệnh đề chỉ còn v làm đúng; bảng break, số literal đúng của từng mệnh đề và danh sách
+# mệnh đề sai được cập nhật tăng dần khi lật, nên mỗi lần lật chỉ tốn chi phí theo số lần xuất hiện của biến.
+import multiprocessing
+import random
+
+NOISE = 0.5
+MAX_FLIPS = 100000
+RESTARTS = 10
+
+class WalkSAT:
+    def __init__(self, clauses, num_vars):
+        self.num_vars = num_vars
+        self.clauses = []
+        for clause in clauses:
+            literals = list(dict.fromkeys(clause))
+            if any(-lit in literals for lit in literals):
+                continue  # mệnh đề luôn đúng
+            if not literals:
+                raise ValueError("CNF có mệnh đề rỗng")
+            self.clauses.append(literals)
+        # occurrences[lit] là danh sách các mệnh đề chứa literal lit (chỉ số âm cho literal âm)
+        self.occurrences = [[] for _ in range(2 * num_vars + 1)]
+        for index, clause in enumerate(self.clauses):
+            for lit in clause:
+                self.occurrences[lit].append(index)
+        self.flips = 0
+
+    # Gán ngẫu nhiên (hoặc theo values cho trước) rồi dựng lại mọi bảng tăng dần
+    def reset(self, rng, values=None):
+        if values is None:
+            values = [False] + [rng.random() < 0.5 for _ in range(self.num_vars)]
+        self.values = values
+        self.true_count = []
+        self.true_sum = []   # tổng số hiệu các biến làm mệnh đề đúng: khi chỉ có một, đó chính là biến đó
+        self.breaks = [0] * (self.num_vars + 1)
+        self.unsat = []
+        self.unsat_position = {}
+        values = self.values
+        for index, clause in enumerate(self.clauses):
+            count = total = 0
+            for lit in clause:
+                if values[abs(lit)] == (lit > 0):
+                    count += 1
+                    total += abs(lit)
+            self.true_count.append(count)
+            self.true_sum.append(total)
+            if count == 0:
+                self.add_unsat(index)
+            elif count == 1:
+                self.breaks[total] += 1
+
+    def add_unsat(self, index):
+        self.unsat_position[index] = len(self.unsat)
+        self.unsat.append(index)
+
+    def remove_unsat(self, index):
+        position = self.unsat_position.pop(index)
+        last = self.unsat.pop()
+        if last != index:
+            self.unsat[position] = last
+            self.unsat_position[last] = position
+
+    def flip(self, v):
+        self.flips += 1
+        value = not self.values[v]
+        self.values[v] = value
+        made_true = v if value else -v
+        true_count, true_sum, breaks = self.true_count, self.true_sum, self.breaks
+        for index in self.occurrences[made_true]:
+            true_count[index] += 1
+            true_sum[index] += v
+            if true_count[index] == 1:
+                self.remove_unsat(index)
+                breaks[v] += 1
+            elif true_count[index] == 2:
+                breaks[true_sum[index] - v] -= 1
+        for index in self.occurrences[-made_true]:
+            true_count[index] -= 1
+            true_sum[index] -= v
+            if true_count[index] == 0:
+                self.add_unsat(index)
+                breaks[v] -= 1
+            elif true_count[index] == 1:
+                breaks[true_sum[index]] += 1
+
+    def pick(self, clause, rng, noise):
+        breaks = self.breaks
+        best = None
+        best_break = None
+        for lit in clause:
+            v = abs(lit)
+            if breaks[v] == 0:
+                return v
+            if best_break is None or breaks[v] < best_break:
+                best, best_break = v, breaks[v]
+        if rng.random() < noise:
+            return abs(rng.choice(clause))
+        return best
+
+    # Đi tối đa max_flips bước từ phép gán hiện tại; trả về phép gán có ít mệnh đề sai nhất đã gặp
+    def walk(self, rng, noise=NOISE, max_flips=MAX_FLIPS):
+        best = list(self.values)
+        fewest = len(self.unsat)
+        for _ in range(max_flips):
+            if not self.unsat:
+                break
+            clause = self.clauses[self.unsat[rng.randrange(len(self.unsat))]]
+            self.flip(self.pick(clause, rng, noise))
+            if len(self.unsat) < fewest:
+                fewest = len(self.unsat)
+                best = list(self.values)
+        return best
+
+    # Trả về mô hình (list giá trị theo số hiệu biến, phần tử 0 bỏ trống) hoặc None khi hết ngân sách
+    def solve(self, seed=0, noise=NOISE, max_flips=MAX_FLIPS, restarts=RESTARTS):
+        rng = random.Random(seed)
+        for _ in range(restarts):
+            self.reset(rng)
+            for _ in range(max_flips):
+                if not self.unsat:
+                    return list(self.values)
+                clause = self.clauses[self.unsat[rng.randrange(len(self.unsat))]]
+                self.flip(self.pick(clause, rng, noise))
+            if not self.unsat:
+                return list(self.values)
+        return None
+
+# ---- Chạy nhiều hạt giống song song, lấy mô hình đầu tiên tìm được ----
+
+# Bộ giải của mỗi tiến trình con, dựng một lần trong init_worker
+WORKER = {}
+
+def init_worker(clauses, num_vars, options):
+    WORKER["solver"] = WalkSAT(clauses, num_vars)
+    WORKER["options"] = options
+
+def seed_task(seed):
+    return WORKER["solver"].solve(seed, **WORKER["options"])
+
+# Chạy các hạt giống seed, seed + 1, ... trên `workers` tiến trình; dừng mọi tiến trình khi có mô hình
+def parallel_walksat(clauses, num_vars, workers, seed=0, **options):
+    pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(clauses, num_vars, options))
+    try:
+        for model in pool.imap_unordered(seed_task, range(seed, seed + workers)):
+            if model is not None:
+                return model
+        return None
+    finally:
+        pool.terminate()
+        pool.join()
+
+def walksat(clauses, num_vars, workers=None, seed=0, noise=NOISE, max_flips=MAX_FLIPS, restarts=RESTARTS):
+    options = {"noise": noise, "max_flips": max_flips, "restarts": restarts}
+    if workers is not None and workers > 1:
+        return parallel_walksat(clauses, num_vars, workers, seed, **options)
+    return WalkSAT(clauses, num_vars).solve(seed, **options)
@@ -0,0 +1 @@
+# Bộ benchmark: bộ sinh biểu thức (generators), chạy và so sánh kết quả (run)
@@ -0,0 +1,48 @@
+# So sánh tốc độ: evaluate(**assignments) đệ quy và hàm đã biên dịch bằng compile()
+# Chạy từ thư mục gốc: python -m benchmarks.bench_compile
+import random
+import time
+from itertools import product
+
+from BTTH2_logicAI_core import Variable, Not, And, Or, Implies
+
+# Sinh ngẫu nhiên một cây biểu thức có khoảng `size` nút trên các biến cho trước
+def random_formula(variables, size, rng):
+    if size <= 1:
+        return Variable(rng.choice(variables))
+    if rng.random() < 0.2:
+        return Not(random_formula(variables, size - 1, rng))
+    op = rng.choice([And, Or, Implies])
+    left_size = rng.randint(1, size - 2) if size > 2 else 1
+    return op(random_formula(variables, left_size, rng), random_formula(variables, size - 1 - left_size, rng))
+
+def count_nodes(expr):
+    if isinstance(expr, Variable):
+        return 1
+    if isinstance(expr, Not):
+        return 1 + count_nodes(expr.child)
+    return 1 + count_nodes(expr.left) + count_nodes(expr.right)
+
+def main(n_variables=12, size=200, seed=0):
+    rng = random.Random(seed)
+    variables = [chr(ord("A") + i) for i in range(n_variables)]
+    expr = random_formula(variables, size, rng)
+    rows = list(product([True, False], repeat=n_variables))
+    print(f"Biểu thức: {count_nodes(expr)} nút, {n_variables} biến, {len(rows)} dòng")
+
+    start = time.perf_counter()
+    recursive = [expr.evaluate(**dict(zip(variables, values))) for values in rows]
+    recursive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evaluate = expr.compile(variables)
+    compiled = [evaluate(values) for values in rows]
+    compiled_time = time.perf_counter() - start
+
+    assert [bool(r) for r in recursive] == [bool(c) for c in compiled]
+    print(f"Đệ quy evaluate(**assignments): {recursive_time:.3f}s")
+    print(f"Hàm đã biên dịch compile():     {compiled_time:.3f}s")
+    print(f"Tăng tốc: {recursive_time / compiled_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Bộ sinh biểu thức cho benchmark. Mọi bộ sinh nhận seed nên cùng tham số luôn cho cùng kết quả.
+# Kết quả là chuỗi biểu thức (đầu vào của các hàm parse_expression, truth_table, find_model, ...),
+# riêng first_order trả về bộ (công thức, miền, vị từ) cho evaluate_formula.
+import random
+
+from BTTH2_logicAI_bai3 import Relation
+
+# Tỉ lệ số mệnh đề / số biến tại ngưỡng chuyển pha của k-SAT ngẫu nhiên (khó nhất cho bộ giải)
+PHASE_TRANSITION = {2: 1.0, 3: 4.26, 4: 9.93, 5: 21.12}
+
+def clause_text(literals):
+    return "(" + " ∨ ".join(literals) + ")"
+
+def conjunction(clauses):
+    return " ∧ ".join(clauses)
+
+# k-CNF ngẫu nhiên n biến; mặc định số mệnh đề ở ngưỡng chuyển pha
+def random_kcnf(n, k=3, ratio=None, seed=0):
+    rng = random.Random(seed)
+    if ratio is None:
+        ratio = PHASE_TRANSITION[k]
+    variables = [f"x{i}" for i in range(n)]
+    clauses = []
+    for _ in range(round(n * ratio)):
+        clauses.append(clause_text([("¬" if rng.random() < 0.5 else "") + name
+                                    for name in rng.sample(variables, k)]))
+    return conjunction(clauses)
+
+# Nguyên lý chuồng bồ câu: holes + 1 con bồ câu vào holes chuồng, mỗi chuồng tối đa một con (luôn vô nghiệm).
+# p{i}_{j}: bồ câu i ở chuồng j
+def pigeonhole(holes):
+    pigeons = range(holes + 1)
+    clauses = [clause_text([f"p{i}_{j}" for j in range(holes)]) for i in pigeons]
+    for j in range(holes):
+        for i in pigeons:
+            for other in range(i + 1, holes + 1):
+                clauses.append(clause_text([f"¬p{i}_{j}", f"¬p{other}_{j}"]))
+    return conjunction(clauses)
+
+# Chuỗi chẵn lẻ: s_i = s_{i-1} ⊕ x_i (viết bằng 4 mệnh đề mỗi bước), s_0 = x_0 và khẳng định s_{n-1} = parity.
+# Thỏa mãn được; phủ định của nó cùng với nó là ví dụ khó cho phép giải theo bảng chân trị
+def parity_chain(n, parity=True, seed=0):
+    rng = random.Random(seed)
+    xs = [f"x{i}" for i in range(n)]
+    rng.shuffle(xs)
+    clauses = [clause_text(["¬s0", xs[0]]), clause_text(["s0", "¬" + xs[0]])]
+    for i in range(1, n):
+        s, previous, x = f"s{i}", f"s{i - 1}", xs[i]
+        clauses.append(clause_text(["¬" + s, previous, x]))
+        clauses.append(clause_text(["¬" + s, "¬" + previous, "¬" + x]))
+        clauses.append(clause_text([s, "¬" + previous, x]))
+        clauses.append(clause_text([s, previous, "¬" + x]))
+    clauses.append(("" if parity else "¬") + f"s{n - 1}")
+    return conjunction(clauses)
+
+# A0 → (A1 → (... → An)): cây lệch phải sâu n
+def implies_chain(n):
+    return " → ".join(f"A{i}" for i in range(n + 1))
+
+# Tiền đề A0, A0 → A1, ..., A_{n-1} → A_n và kết luận A_n (suy diễn modus ponens n bước)
+def implies_premises(n):
+    return ["A0"] + [f"A{i} → A{i + 1}" for i in range(n)], f"A{n}"
+
+# Công thức vị từ trên miền {0, ..., size - 1} với quan hệ Edge ngẫu nhiên (degree cạnh mỗi đỉnh)
+def first_order(size, degree=4, seed=0):
+    rng = random.Random(seed)
+    sources = [x for x in range(size) for _ in range(degree)]
+    targets = [rng.randrange(size) for _ in sources]
+    predicates = {
+        "Edge": Relation([sources, targets]),
+        "P": lambda x: x % 3 == 0,
+        "Q": lambda x: x % 2 == 0,
+    }
+    formula = "∀x (P(x) → ∃y (Edge(x, y) ∧ (Q(y) ∨ P(y)))) ∨ ∃x ∀y (Edge(x, y) → Q(y))"
+    return formula, list(range(size)), predicates
@@ -0,0 +1,91 @@
+# Sinh tải cho dịch vụ BTTH2_logicAI_server: mở nhiều kết nối, mỗi kết nối giữ tối đa `pipeline` yêu cầu
+# đang chờ, rồi báo thông lượng và phân vị độ trễ. Chạy từ thư mục gốc khi dịch vụ đang chạy:
+#   python -m benchmarks.load --port 8765 --connections 8 --requests 20000
+#   python -m benchmarks.load --unix /tmp/logic.sock --task find_model --requests 500
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from BTTH2_logicAI_bulk import percentile
+from benchmarks.generators import random_kcnf
+
+# Các biểu thức dùng cho yêu cầu evaluate (ít biểu thức, nhiều phép gán: trường hợp gom lô có lợi)
+EXPRESSIONS = ["(A ∧ B) → (C ∨ ¬D)", "(A ∨ B) ∧ (¬A ∨ C) ∧ (¬B ∨ D)", "¬(A → B) ∨ (C ∧ D)"]
+
+def make_request(task, index, rng):
+    if task == "evaluate":
+        return {"id": index, "task": "evaluate", "expression": rng.choice(EXPRESSIONS),
+                "assignments": {name: rng.random() < 0.5 for name in "ABCD"}}
+    if task == "find_model":
+        return {"id": index, "task": "find_model", "expression": random_kcnf(40, ratio=3.5, seed=index)}
+    if task == "entail":
+        return {"id": index, "task": "entail", "premises": ["A", "A → B", "B → C"], "conclusion": "C",
+                "backend": "sat"}
+    raise ValueError(f"Không có loại yêu cầu {task!r}")
+
+async def open_connection(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+# Một kết nối gửi count yêu cầu, giữ tối đa pipeline yêu cầu chưa có phản hồi
+async def client(args, count, offset, latencies, failures):
+    reader, writer = await open_connection(args)
+    rng = random.Random(offset)
+    window = asyncio.Semaphore(args.pipeline)
+    sent = {}
+
+    async def receive():
+        for _ in range(count):
+            line = await reader.readline()
+            response = json.loads(line)
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            if not response["ok"]:
+                failures.append(response["error"])
+            window.release()
+
+    receiver = asyncio.create_task(receive())
+    for index in range(offset, offset + count):
+        await window.acquire()
+        request = make_request(args.task, index, rng)
+        sent[index] = time.perf_counter()
+        writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+
+async def run(args):
+    latencies = []
+    failures = []
+    per_connection = args.requests // args.connections
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, per_connection, i * per_connection, latencies, failures)
+                           for i in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} yêu cầu {args.task} trong {elapsed:.3f}s: {len(latencies) / elapsed:.1f} yêu cầu/s, "
+          f"lỗi: {len(failures)}")
+    print(f"Độ trễ (ms): p50 {percentile(latencies, 50) * 1e3:.2f}, p95 {percentile(latencies, 95) * 1e3:.2f}, "
+          f"p99 {percentile(latencies, 99) * 1e3:.2f}, max {latencies[-1] * 1e3 if latencies else 0:.2f}")
+
+    reader, writer = await open_connection(args)
+    writer.write(b'{"id": "metrics", "task": "metrics"}\n')
+    await writer.drain()
+    print("Số liệu của dịch vụ:", (await reader.readline()).decode("utf-8").strip())
+    writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh tải cho dịch vụ logic")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="đường dẫn Unix socket")
+    parser.add_argument("--task", default="evaluate", choices=["evaluate", "find_model", "entail"])
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20000, help="tổng số yêu cầu")
+    parser.add_argument("--pipeline", type=int, default=64, help="số yêu cầu đang chờ tối đa mỗi kết nối")
+    asyncio.run(run(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
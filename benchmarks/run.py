@@ -0,0 +1,188 @@
+# Chạy bộ benchmark cho các hàm chính, đo thời gian và bộ nhớ đỉnh, ghi kết quả ra tệp JSON
+# và so sánh với một kết quả gốc (baseline) đã lưu để phát hiện chậm đi.
+# Chạy từ thư mục gốc:
+#   python -m benchmarks.run --output results.json
+#   python -m benchmarks.run --baseline baseline.json          (mã thoát 1 nếu có trường hợp chậm đi)
+#   python -m benchmarks.run --filter find_model --repeat 5
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_bai2 import truth_table
+from BTTH2_logicAI_bai3 import evaluate_formula
+from BTTH2_logicAI_bai4 import prove_by_truth_table
+from BTTH2_logicAI_bai5 import find_model
+from benchmarks.generators import (random_kcnf, pigeonhole, parity_chain, implies_chain, implies_premises,
+                                   first_order)
+
+# Mặc định coi là chậm đi khi thời gian (hoặc bộ nhớ đỉnh) vượt quá baseline bấy nhiêu lần
+THRESHOLD = 1.25
+
+# Thời gian dưới mức này (giây) dao động quá nhiều để so sánh
+MIN_SECONDS = 0.005
+
+# Sink bỏ qua nội dung bảng chân trị, chỉ đếm số dòng
+class CountingSink:
+    def begin(self, variables):
+        self.rows = 0
+
+    def write_block(self, high_values, size, result):
+        self.rows += size
+
+    def end(self):
+        pass
+
+def check(result, expected):
+    if result != expected:
+        raise AssertionError(f"kết quả {result!r}, cần {expected!r}")
+
+def is_model(result):
+    if not isinstance(result, dict):
+        raise AssertionError(f"không tìm được mô hình: {result!r}")
+
+# ---- Các trường hợp benchmark: tên -> hàm tạo (chuẩn bị dữ liệu, không đo) trả về hàm cần đo ----
+
+def parse_case(text):
+    def run():
+        parse_expression.cache_clear()
+        parse_expression(text)
+    return run
+
+def evaluate_case(text):
+    expression = parse_expression(text)
+    names = sorted(expression.variables())
+    assignments = [{name: (row >> i) & 1 == 1 for i, name in enumerate(names)} for row in range(256)]
+    def run():
+        for values in assignments:
+            expression.evaluate(**values)
+    return run
+
+def truth_table_case(text, rows, **options):
+    def run():
+        sink = CountingSink()
+        truth_table(text, sink=sink, **options)
+        check(sink.rows, rows)
+    return run
+
+def prove_case(premises, conclusion, expected, **options):
+    def run():
+        check(prove_by_truth_table(premises, conclusion, **options), expected)
+    return run
+
+def model_case(text, satisfiable, **options):
+    def run():
+        result = find_model(text, **options)
+        if satisfiable:
+            is_model(result)
+        else:
+            check(isinstance(result, dict), False)
+    return run
+
+def formula_case(size, **options):
+    formula, domain, predicates = first_order(size)
+    def run():
+        result = evaluate_formula(formula, domain, predicates, **options)
+        if isinstance(result, str):
+            raise AssertionError(result)
+    return run
+
+def cases():
+    premises, conclusion = implies_premises(18)
+    return {
+        "parse/kcnf-3x400": lambda: parse_case(random_kcnf(400)),
+        "parse/implies-chain-500": lambda: parse_case(implies_chain(500)),
+        "evaluate/implies-chain-300": lambda: evaluate_case(implies_chain(300)),
+        "evaluate/kcnf-3x40": lambda: evaluate_case(random_kcnf(40)),
+        "truth_table/kcnf-3x20": lambda: truth_table_case(random_kcnf(20), 1 << 20),
+        "truth_table/parity-10": lambda: truth_table_case(parity_chain(10), 1 << 20),
+        "truth_table/bdd/parity-12": lambda: truth_table_case(parity_chain(12), 1 << 24, backend="bdd"),
+        "prove/enumerate/implies-18": lambda: prove_case(premises, conclusion, "Đúng"),
+        "prove/bdd/implies-18": lambda: prove_case(premises, conclusion, "Đúng", backend="bdd"),
+        "prove/sat/pigeonhole-5": lambda: prove_case([pigeonhole(5)], "⊥", "Đúng", backend="sat"),
+        "find_model/cdcl/kcnf-3x100": lambda: model_case(random_kcnf(100, ratio=4.0), True),
+        "find_model/cdcl/pigeonhole-6": lambda: model_case(pigeonhole(6), False),
+        "find_model/cdcl/parity-200": lambda: model_case(parity_chain(200), True),
+        "find_model/walksat/kcnf-3x1000": lambda: model_case(random_kcnf(1000, ratio=3.5), True, method="walksat"),
+        "find_model/enumerate/kcnf-3x16": lambda: model_case(random_kcnf(16, ratio=3.0), True, method="enumerate"),
+        "evaluate_formula/loop/fo-300": lambda: formula_case(300),
+        "evaluate_formula/vector/fo-20000": lambda: formula_case(20000, mode="vector"),
+        "evaluate_formula/plan/fo-20000": lambda: formula_case(20000, mode="vector", plan=True),
+    }
+
+# ---- Đo ----
+
+# Thời gian: lấy lần nhanh nhất trong `repeat` lần. Bộ nhớ: đo riêng một lần với tracemalloc
+# (tracemalloc làm chậm chương trình nên không đo cùng lúc với thời gian)
+def measure(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "mean_seconds": sum(times) / len(times), "peak_bytes": peak}
+
+def run_all(selected, repeat):
+    results = {}
+    for name, make in selected.items():
+        results[name] = measure(make(), repeat)
+        entry = results[name]
+        print(f"{name:40} {entry['seconds'] * 1000:10.2f} ms {entry['peak_bytes'] / 1024:12.1f} KiB", flush=True)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+# Danh sách (tên, chỉ số, giá trị gốc, giá trị mới) của các trường hợp chậm đi hoặc tốn bộ nhớ hơn
+def compare(report, baseline, threshold=THRESHOLD):
+    regressions = []
+    for name, entry in report["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        if entry["seconds"] > max(old["seconds"], MIN_SECONDS) * threshold:
+            regressions.append((name, "seconds", old["seconds"], entry["seconds"]))
+        if entry["peak_bytes"] > old["peak_bytes"] * threshold:
+            regressions.append((name, "peak_bytes", old["peak_bytes"], entry["peak_bytes"]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark các hàm logic mệnh đề và logic vị từ")
+    parser.add_argument("--filter", default="", help="chỉ chạy các trường hợp có tên chứa chuỗi này")
+    parser.add_argument("--repeat", type=int, default=3, help="số lần đo thời gian mỗi trường hợp")
+    parser.add_argument("--output", help="tệp JSON ghi kết quả")
+    parser.add_argument("--baseline", help="tệp JSON kết quả gốc để so sánh")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="tỉ lệ coi là chậm đi")
+    args = parser.parse_args(argv)
+
+    selected = {name: make for name, make in cases().items() if args.filter in name}
+    report = run_all(selected, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"CHẬM ĐI: {name} {metric}: {old:.6g} → {new:.6g} (x{new / old:.2f})")
+        if regressions:
+            return 1
+        print("Không có trường hợp nào chậm đi so với baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+# Các mô-đun BTTH2_logicAI_* nằm phẳng ở thư mục gốc: thêm thư mục gốc vào sys.path khi chạy pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
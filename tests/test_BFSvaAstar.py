@@ -0,0 +1,109 @@
+import heapq
+import random
+from array import array
+
+import pytest
+
+from BTTH1_BFSvaAstar import Graph, astar, batch_queries, bfs, bidirectional_bfs, load_graph, read_edges
+
+def random_graph(rng, n, m, directed, weighted):
+    sources = array("i", (rng.randrange(n) for _ in range(m)))
+    targets = array("i", (rng.randrange(n) for _ in range(m)))
+    weights = array("d", (rng.randint(1, 9) for _ in range(m))) if weighted else None
+    return Graph.from_edges(n, sources, targets, weights, directed)
+
+def dijkstra(graph, source, unit=False):
+    distance = {source: 0}
+    queue = [(0, source)]
+    while queue:
+        d, v = heapq.heappop(queue)
+        if d > distance[v]:
+            continue
+        targets, weights = graph.neighbors(v)
+        for i, u in enumerate(targets):
+            cost = d + (1 if unit or weights is None else weights[i])
+            if u not in distance or cost < distance[u]:
+                distance[u] = cost
+                heapq.heappush(queue, (cost, u))
+    return [distance.get(v, -1) for v in range(graph.num_vertices)]
+
+def path_cost(graph, path):
+    total = 0
+    for v, u in zip(path, path[1:]):
+        targets, weights = graph.neighbors(v)
+        costs = [1 if weights is None else weights[i] for i, x in enumerate(targets) if x == u]
+        assert costs, (v, u)
+        total += min(costs)
+    return total
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_searches_match_dijkstra(directed):
+    rng = random.Random(21)
+    for _ in range(30):
+        n = rng.randint(1, 40)
+        graph = random_graph(rng, n, rng.randint(0, 3 * n), directed, weighted=True)
+        source, target = rng.randrange(n), rng.randrange(n)
+        hops = dijkstra(graph, source, unit=True)
+        costs = dijkstra(graph, source)
+        result = bfs(graph, source)
+        assert list(result.distance) == hops
+        assert all(path is None or len(path) - 1 == hops[v]
+                   for v, path in enumerate(map(result.path, range(n))))
+        assert list(astar(graph, source).distance) == costs
+        # Heuristic nhất quán: một nửa khoảng cách thật đến đích (trên đồ thị ngược)
+        to_target = dijkstra(graph.reverse(), target)
+        heuristic = [d / 2 if d >= 0 else 0 for d in to_target]
+        found = astar(graph, source, target, heuristic)
+        assert found.cost(target) == (costs[target] if costs[target] >= 0 else None)
+        if costs[target] >= 0:
+            assert path_cost(graph, found.path(target)) == costs[target]
+        path, _ = bidirectional_bfs(graph, source, target)
+        if hops[target] < 0:
+            assert path is None
+        else:
+            assert path[0] == source and path[-1] == target
+            assert len(path) - 1 == hops[target]
+            assert path_cost(Graph(graph.offsets, graph.targets), path) == hops[target]
+
+def test_bfs_stops_at_targets():
+    graph = Graph.from_edges(6, array("i", [0, 1, 2, 3, 4]), array("i", [1, 2, 3, 4, 5]))
+    result = bfs(graph, 0, targets=[2])
+    assert result.path(2) == [0, 1, 2] and not result.reached(5)
+    assert bfs(graph, [0, 5]).cost(3) == 2
+    assert bfs(graph, 3, targets=3).expanded == 0
+
+def test_batch_queries():
+    rng = random.Random(3)
+    graph = random_graph(rng, 60, 150, directed=True, weighted=False)
+    queries = [(rng.randrange(60), rng.randrange(60)) for _ in range(80)]
+    expected = [(s, t, dijkstra(graph, s, unit=True)[t]) for s, t in queries]
+    expected = [(s, t, None if d < 0 else d) for s, t, d in expected]
+    for algorithm in ("bfs", "astar", "bidirectional"):
+        answers = batch_queries(graph, queries, algorithm)
+        assert [(s, t, cost) for s, t, cost, _ in answers] == expected
+    assert batch_queries(graph, queries, "bfs", workers=2) == batch_queries(graph, queries, "bfs")
+
+def test_files(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("# chú thích\n0 1 2.5\n1 2 1\n% khác\n2 0 4\n", encoding="utf-8")
+    for chunk_size in (5, 1 << 20):
+        graph = read_edges(str(path), directed=True, chunk_size=chunk_size)
+        assert graph.num_vertices == 3 and list(graph.targets) == [1, 2, 0] and list(graph.weights) == [2.5, 1, 4]
+    graph.save(str(tmp_path / "graph.csr"))
+    loaded = load_graph(str(tmp_path / "graph.csr"))
+    assert loaded.directed and list(loaded.offsets) == list(graph.offsets) and list(loaded.weights) == [2.5, 1, 4]
+    assert astar(loaded, 0, 2).cost(2) == 3.5
+
+    path.write_text("", encoding="utf-8")
+    assert read_edges(str(path)).num_vertices == 0
+    path.write_text("0 1 2 3\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_edges(str(path))
+    path.write_text("0 1\n1 2 3\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_edges(str(path))
+    (tmp_path / "bad.csr").write_bytes(b"NOPE" + bytes(20))
+    with pytest.raises(ValueError):
+        load_graph(str(tmp_path / "bad.csr"))
+    with pytest.raises(ValueError):
+        Graph.from_edges(2, array("i", [0]), array("i", [2]))
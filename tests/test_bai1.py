@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai1 import evaluate_batch, evaluate_expression
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def test_batch_matches_evaluate():
+    rng = random.Random(4)
+    columns = {name: [rng.random() < 0.5 for _ in range(300)] for name in "ABCD"}
+    for _ in range(50):
+        expression = parse_expression(random_formula(rng, 4))
+        results = list(evaluate_batch(expression, columns, chunk_size=64))
+        for row, result in enumerate(results):
+            assert result == expression.evaluate(**{name: column[row] for name, column in columns.items()})
+
+def test_constant_only_expression_uses_input_rows():
+    assert list(evaluate_batch("⊤", {"a": [True, False]})) == [True, True]
+    assert list(evaluate_batch("¬⊤", {"a": [True, False, True]})) == [False, False, False]
+    assert list(evaluate_batch("⊤", {}, rows=3)) == [True, True, True]
+    assert list(evaluate_batch("A ∨ ⊥", {"A": [True, False]})) == [True, False]
+
+def test_constant_only_expression_from_csv(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("A,B\n1,0\n0,0\n", encoding="utf-8")
+    assert list(evaluate_batch("⊤", str(path))) == [True, True]
+    assert list(evaluate_batch("A ∨ B", str(path))) == [True, False]
+
+def test_row_count_errors():
+    with pytest.raises(ValueError):
+        evaluate_batch("⊤", {})
+    with pytest.raises(ValueError):
+        evaluate_batch("A ∧ B", {"A": [True], "B": [True, False]})
+
+def test_evaluate_expression():
+    assert evaluate_expression("(A ∧ B) → C", {"A": True, "B": True, "C": False}) is False
@@ -0,0 +1,59 @@
+import io
+import itertools
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai2 import CSVSink, PackedBitSink, TextSink, read_packed_table, truth_table
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def expected_rows(text):
+    expression = parse_expression(text)
+    variables = sorted(expression.variables())
+    return variables, [(values, expression.evaluate(**dict(zip(variables, values))))
+                       for values in itertools.product([True, False], repeat=len(variables))]
+
+def text_table(text, **options):
+    stream = io.StringIO()
+    truth_table(text, sink=TextSink(stream), **options)
+    return stream.getvalue().splitlines()
+
+@pytest.mark.parametrize("backend", ["bits", "bdd"])
+def test_text_table_matches_evaluate(backend):
+    rng = random.Random(2)
+    for _ in range(50):
+        text = random_formula(rng, 4)
+        variables, rows = expected_rows(text)
+        lines = text_table(text, backend=backend)
+        assert lines[0].split()[:len(variables)] == variables
+        assert lines[2:] == [" ".join("T" if v else "F" for v in values + (result,))
+                             for values, result in rows]
+
+def test_constant_only_expression():
+    assert text_table("⊤")[2:] == ["T"]
+    assert text_table("¬⊤ ∨ ⊥", backend="bdd")[2:] == ["F"]
+
+def test_csv_and_packed_sinks(tmp_path):
+    # 18 biến: nhiều hơn một khối bảng chân trị
+    text = " ∧ ".join(f"(A{i} ∨ ¬A{i + 1})" for i in range(17))
+    variables, rows = expected_rows(text)
+    truth_table(text, sink=CSVSink(str(tmp_path / "table.csv")))
+    with open(tmp_path / "table.csv", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert lines[0] == ",".join(variables + ["result"])
+    assert lines[1:] == [",".join("1" if v else "0" for v in values + (result,)) for values, result in rows]
+
+    truth_table(text, sink=PackedBitSink(str(tmp_path / "table.ttb")), workers=2)
+    names, data = read_packed_table(str(tmp_path / "table.ttb"))
+    assert names == variables
+    packed = int.from_bytes(data, "little")
+    assert [bool(packed >> r & 1) for r in range(len(rows))] == [result for _, result in rows]
+
+def test_errors(tmp_path, capsys):
+    assert truth_table("A ∧").startswith("Lỗi khi phân tích biểu thức")
+    path = tmp_path / "bad.ttb"
+    path.write_bytes(b"XXXX")
+    with pytest.raises(ValueError):
+        read_packed_table(str(path))
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai3 import Relation, check_formula, evaluate_formula, load_relation, save_relation_binary
+
+VARIABLES = "xyz"
+
+# Công thức bậc nhất ngẫu nhiên với các biến tự do trong bound
+def random_formula(rng, depth, bound):
+    if depth == 0 or rng.random() < 0.2:
+        if bound and rng.random() < 0.5:
+            return f"{rng.choice('PS')}({rng.choice(bound)})"
+        if bound:
+            return f"{rng.choice(['Edge', 'Q'])}({rng.choice(bound)}, {rng.choice(bound)})"
+    kind = rng.choice(["¬", "∧", "∨", "→", "∀", "∃", "∀", "∃"])
+    if kind in "∀∃":
+        variable = rng.choice(VARIABLES)
+        return f"{kind}{variable} ({random_formula(rng, depth - 1, bound + [variable])})"
+    if not bound:
+        return random_formula(rng, depth, bound)
+    if kind == "¬":
+        return f"¬({random_formula(rng, depth - 1, bound)})"
+    return f"({random_formula(rng, depth - 1, bound)} {kind} {random_formula(rng, depth - 1, bound)})"
+
+def random_predicates(rng, size):
+    edges = {(a, b) for a in range(size) for b in range(size) if rng.random() < 0.3}
+    small = {a for a in range(size) if rng.random() < 0.5}
+    return {
+        "P": lambda a: a in small,
+        "S": lambda a: a % 3 == 0,
+        "Q": lambda a, b: (a + b) % 2 == 0,
+        "Edge": Relation([[a for a, _ in edges], [b for _, b in edges]]),
+    }
+
+def test_modes_and_plans_agree():
+    rng = random.Random(12)
+    for _ in range(150):
+        text = random_formula(rng, 4, [])
+        size = rng.randint(0, 6)
+        predicates = random_predicates(rng, size)
+        expected = check_formula(text, range(size), predicates)
+        for mode in ("loop", "vector"):
+            for plan in (False, True):
+                assert check_formula(text, range(size), predicates, mode, plan) == expected, (text, mode, plan)
+
+def test_deep_formula():
+    text = "∀x (" + " ∧ ".join(["P(x)"] * 300) + ") ∧ " + "∃x ∀y " * 5 + "Q(x, y)"
+    predicates = {"P": lambda a: a >= 0, "Q": lambda a, b: a == 0 or b > 0}
+    for mode in ("loop", "vector"):
+        assert check_formula(text, range(4), predicates, mode) is True
+        assert check_formula(text, range(-2, 2), predicates, mode, True) is False
+
+def test_relation_files(tmp_path):
+    relation = Relation([[1, 2, 2], [3, 3, 4]])
+    save_relation_binary(relation, str(tmp_path / "edge.rel"))
+    loaded = load_relation(str(tmp_path / "edge.rel"))
+    assert loaded(2, 4) and not loaded(1, 4) and len(loaded) == 3
+    (tmp_path / "edge.csv").write_text("a,b\n1,3\n2,x\n", encoding="utf-8")
+    loaded = load_relation(str(tmp_path / "edge.csv"), header=True)
+    assert loaded(2, "x") and not loaded(1, "x")
+    with pytest.raises(ValueError):
+        loaded(1)
+    (tmp_path / "bad.rel").write_bytes(b"NOPE")
+    with pytest.raises(ValueError):
+        load_relation(str(tmp_path / "bad.rel"))
+
+@pytest.mark.parametrize("text", ["∀x (P(x)", "∀x P(x) ∧", "∀x R(x)", "∀x P(y)", "∀x P(x) $"])
+@pytest.mark.parametrize("mode", ["loop", "vector"])
+def test_errors(text, mode):
+    predicates = {"P": lambda a: True}
+    assert evaluate_formula(text, range(3), predicates, mode).startswith("Lỗi khi đánh giá công thức")
+    with pytest.raises(Exception):
+        check_formula(text, range(3), predicates, mode)
@@ -0,0 +1,34 @@
+import random
+
+from BTTH2_logicAI_bai4 import prove_by_resolution, prove_by_truth_table, to_clauses
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def clauses_hold(clauses, assignments):
+    return all(any(assignments[name] == sign for name, sign in clause) for clause in clauses)
+
+def test_to_clauses_is_equivalent():
+    rng = random.Random(2)
+    for _ in range(200):
+        expression = parse_expression(random_formula(rng, 3))
+        variables = sorted(expression.variables())
+        positive = to_clauses(expression)
+        negative = to_clauses(expression, positive=False)
+        for row in range(1 << len(variables)):
+            assignments = {name: bool(row >> i & 1) for i, name in enumerate(variables)}
+            value = expression.evaluate(**assignments)
+            assert clauses_hold(positive, assignments) == value
+            assert clauses_hold(negative, assignments) == (not value)
+
+def test_resolution_agrees_with_truth_table():
+    rng = random.Random(3)
+    for _ in range(100):
+        premises = [random_formula(rng, 2) for _ in range(rng.randint(1, 3))]
+        conclusion = random_formula(rng, 2)
+        assert prove_by_resolution(premises, conclusion) == prove_by_truth_table(premises, conclusion)
+
+def test_resolution_on_deep_premise():
+    premise = " ∧ ".join(f"x{i}" for i in range(2000))
+    assert prove_by_resolution([premise], "x1999") == "Đúng"
+    assert prove_by_resolution([premise], "y") == "Sai"
@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai5 import count_models, find_model, iter_models
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def all_models(text):
+    expression = parse_expression(text)
+    variables = sorted(expression.variables())
+    return [dict(zip(variables, values)) for values in itertools.product([False, True], repeat=len(variables))
+            if expression.evaluate(**dict(zip(variables, values)))]
+
+def test_methods_agree_with_enumeration():
+    rng = random.Random(8)
+    for _ in range(150):
+        text = random_formula(rng, 4)
+        expression = parse_expression(text)
+        models = all_models(text)
+        assert count_models(text) == len(models)
+        assert sorted(map(sorted, (m.items() for m in iter_models(text)))) == \
+            sorted(map(sorted, (m.items() for m in models)))
+        assert list(iter_models(text, method="enumerate")) == models
+        if models:
+            assert expression.evaluate(**find_model(text))
+            assert find_model(text, method="enumerate") == models[0]
+        else:
+            assert isinstance(find_model(text), str)
+            assert isinstance(find_model(text, method="enumerate"), str)
+
+def test_constant_only_expression():
+    assert find_model("⊤") == {} and find_model("⊤", method="enumerate") == {}
+    assert isinstance(find_model("⊥"), str)
+    assert list(iter_models("⊤")) == [{}] and list(iter_models("⊥")) == []
+    assert count_models("¬⊥") == 1
+
+def test_deep_formula():
+    text = " ∧ ".join(f"(X{i} → X{i + 1})" for i in range(3000)) + " ∧ X0 ∧ ¬X3000"
+    assert isinstance(find_model(text), str)
+    model = find_model(text[:text.rindex(" ∧ ¬X3000")])
+    assert all(model.values())
+
+def test_walksat_and_parallel():
+    text = " ∧ ".join(f"(A{i} ∨ ¬A{i + 1} ∨ A{i + 2})" for i in range(40))
+    expression = parse_expression(text)
+    assert expression.evaluate(**find_model(text, method="walksat", seed=3))
+    assert expression.evaluate(**find_model(text, method="walksat", workers=2))
+    small = "(A ∨ B) ∧ (¬A ∨ C) ∧ " + " ∧ ".join(f"(P{i} ∨ ¬P{i + 1})" for i in range(18))
+    assert find_model(small, method="enumerate", workers=2) == find_model(small, method="enumerate")
+    assert isinstance(find_model("A ∧ ¬A", method="walksat", max_flips=50, restarts=2), str)
+
+def test_errors():
+    assert find_model("A ∨").startswith("Lỗi khi phân tích biểu thức")
+    assert count_models("(A").startswith("Lỗi khi phân tích biểu thức")
+    with pytest.raises(ValueError):
+        next(iter_models("A ∧ ∧ B"))
@@ -0,0 +1,48 @@
+import itertools
+import random
+
+import pytest
+
+from BTTH2_logicAI_bdd import BDD, FALSE, TRUE, build_bdd, count_models, equivalent, is_tautology
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def rows(expression):
+    variables = sorted(expression.variables())
+    for values in itertools.product([True, False], repeat=len(variables)):
+        yield dict(zip(variables, values))
+
+@pytest.mark.parametrize("order", ["sorted", "appearance", "frequency", "sifting"])
+def test_matches_evaluate(order):
+    rng = random.Random(4)
+    for _ in range(60):
+        expression = parse_expression(random_formula(rng, 4))
+        manager, (root,) = build_bdd([expression], order)
+        results = [expression.evaluate(**assignments) for assignments in rows(expression)]
+        assert [manager.evaluate(root, assignments) for assignments in rows(expression)] == results
+        assert count_models(expression, order) == sum(results)
+        assert is_tautology(expression, order) == all(results)
+
+def test_equivalence_and_restrict():
+    left = parse_expression("¬(A ∧ B) ∨ C")
+    right = parse_expression("(A → (B → C))")
+    assert equivalent(left, right)
+    assert not equivalent(left, parse_expression("A ∨ C"))
+    manager = BDD(["A", "B", "C"])
+    root = manager.build(left)
+    assert manager.restrict(root, "A", False) == TRUE
+    assert manager.restrict(manager.restrict(root, "A", True), "C", False) == manager.build(parse_expression("¬B"))
+
+def test_constant_only_expression():
+    manager = BDD([])
+    assert manager.build(parse_expression("⊤ ∧ ¬⊥")) == TRUE
+    assert manager.build(parse_expression("⊥")) == FALSE
+    assert count_models(parse_expression("⊤")) == 1
+
+def test_chain_has_linear_size():
+    n = 500
+    expression = parse_expression(" ∧ ".join(f"(X{i} → X{i + 1})" for i in range(n)))
+    manager, (root,) = build_bdd([expression])
+    assert manager.count(root) == n + 2
+    assert manager.size(root) <= 2 * n
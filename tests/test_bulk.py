@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from BTTH2_logicAI_bulk import run_line
+
+def run(job, timeout=None):
+    text, _, ok = run_line(json.dumps(job, ensure_ascii=False), timeout)
+    output = json.loads(text)
+    assert output["ok"] is ok
+    return output
+
+def test_results():
+    assert run({"task": "evaluate", "expression": "A → B", "assignments": {"A": True, "B": False}})["result"] is False
+    assert run({"task": "truth_table", "expression": "A ∧ B"})["result"] == {"variables": ["A", "B"], "rows": "1000"}
+    assert run({"task": "truth_table", "expression": "A ∨ B", "backend": "bdd"})["result"]["rows"] == "1110"
+    assert run({"task": "entail", "premises": ["A", "A → B"], "conclusion": "B"})["result"] == "Đúng"
+    assert run({"task": "entail", "premises": ["A"], "conclusion": "B", "method": "resolution"})["result"] == "Sai"
+    assert run({"task": "find_model", "expression": "(A ∨ B) ∧ ¬A"})["result"] == {"A": False, "B": True}
+    job = {"task": "first_order", "formula": "∀x (P(x) → ∃y Edge(x, y))", "domain": [1, 2],
+           "predicates": {"P": [1], "Edge": [[1, 2]]}}
+    assert run(job)["result"] is True
+
+@pytest.mark.parametrize("job", [
+    {"task": "evaluate", "expression": "A ∧", "assignments": {}},
+    {"task": "evaluate", "expression": "A ∧ B", "assignments": {"A": True}},
+    {"task": "truth_table", "expression": "(A ∨"},
+    {"task": "entail", "premises": ["A ∧"], "conclusion": "B"},
+    {"task": "entail", "premises": ["A"], "conclusion": "B ∨", "method": "resolution"},
+    {"task": "find_model", "expression": "¬"},
+    {"task": "first_order", "formula": "∀x Q(x)", "domain": [1], "predicates": {}},
+    {"task": "first_order", "formula": "∀x (", "domain": [1], "predicates": {}},
+    {"task": "unknown"},
+])
+def test_errors_are_failed_jobs(job, capsys):
+    output = run(dict(job, id=7))
+    assert output["ok"] is False and output["id"] == 7
+    assert capsys.readouterr().out == ""
+
+def test_timeouts_are_failed_jobs(capsys):
+    job = {"task": "first_order", "formula": "∀x ∀y ∀z ∀w (P(x) ∨ ¬P(w))", "domain": list(range(200)),
+           "predicates": {"P": [0]}}
+    output = run(job, timeout=0.2)
+    assert output["ok"] is False and "0.2" in output["error"]
+    assert output["seconds"] < 5
+    names = [f"X{i}" for i in range(24)]
+    hard = " ∧ ".join(f"({a} ↔ ¬{b})" for a, b in zip(names, names[1:])) + f" ∧ {names[0]} ∧ {names[-1]}"
+    job = {"task": "find_model", "expression": hard, "method": "enumerate"}
+    assert run(job, timeout=0.2)["ok"] is False
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,58 @@
+import gc
+import random
+
+import pytest
+
+from BTTH2_logicAI_bytecode import Corpus, SymbolTable, assemble, run, to_expression, write_corpus
+from BTTH2_logicAI_core import parse_expression
+
+from test_core import random_formula
+
+def test_assemble_matches_parser():
+    rng = random.Random(23)
+    for _ in range(200):
+        text = random_formula(rng, 5)
+        expression = parse_expression(text)
+        symbols = SymbolTable()
+        code = assemble(text, symbols)
+        assert to_expression(code, symbols.names) == expression
+        assignments = {name: rng.random() < 0.5 for name in expression.variables()}
+        values = [int(assignments[name]) for name in symbols.names]
+        assert (run(code, values) == 1) == expression.evaluate(**assignments)
+
+def test_corpus_round_trip(tmp_path):
+    rng = random.Random(5)
+    texts = [random_formula(rng, 4) for _ in range(100)] + ["⊤", "¬⊥"]
+    path = tmp_path / "corpus.lgc"
+    assert write_corpus(str(path), texts) == len(texts)
+    assignments = {name: rng.random() < 0.5 for name in "ABCDEFG"}
+    with Corpus(str(path)) as corpus:
+        assert len(corpus) == len(texts)
+        expected = [parse_expression(text).evaluate(**{name: assignments[name]
+                                                      for name in parse_expression(text).variables()})
+                    for text in texts]
+        assert list(corpus.evaluate_all(assignments)) == expected
+        assert [corpus.expression(index) for index in range(len(texts))] == [parse_expression(t) for t in texts]
+
+def test_values_only_for_used_variables(tmp_path):
+    path = tmp_path / "corpus.lgc"
+    write_corpus(str(path), ["A ∧ B", "C", "⊤"])
+    with Corpus(str(path)) as corpus:
+        assert corpus.evaluate(0, {"A": True, "B": True}) is True
+        assert corpus.evaluate(2, {}) is True
+        with pytest.raises(KeyError):
+            corpus.evaluate(1, {"A": True})
+        assert corpus.evaluate(1, {}, default=False) is False
+
+def test_close_with_live_slice(tmp_path):
+    path = tmp_path / "corpus.lgc"
+    write_corpus(str(path), ["A ∧ B"])
+    corpus = Corpus(str(path))
+    view = corpus.instructions(0)
+    with pytest.raises(BufferError):
+        corpus.close()
+    assert corpus.file.closed
+    assert len(view) == 3
+    del view
+    gc.collect()
+    corpus.close()
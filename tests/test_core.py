@@ -0,0 +1,56 @@
+import itertools
+import random
+
+from BTTH2_logicAI_core import column_masks, parse_expression
+from BTTH2_logicAI_bai1 import evaluate_expression
+from BTTH2_logicAI_bai5 import find_model
+
+DEPTH = 5000
+
+def random_formula(rng, depth):
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice("ABCD⊤⊥" if rng.random() < 0.1 else "ABCD")
+    operator = rng.choice(["¬", "∧", "∨", "→"])
+    if operator == "¬":
+        return "¬" + random_formula(rng, depth - 1)
+    return f"({random_formula(rng, depth - 1)} {operator} {random_formula(rng, depth - 1)})"
+
+def test_evaluate_compile_and_bitmask_agree():
+    rng = random.Random(0)
+    for _ in range(200):
+        expression = parse_expression(random_formula(rng, 5))
+        variables = sorted(expression.variables())
+        masks, full = column_masks(len(variables))
+        bits = expression.bitmask(dict(zip(variables, masks)), full)
+        compiled = expression.compile(variables)
+        for row, values in enumerate(itertools.product([True, False], repeat=len(variables))):
+            expected = expression.evaluate(**dict(zip(variables, values)))
+            assert compiled(values) == expected
+            assert (bits >> row & 1) == expected
+        assert parse_expression(str(expression)) is expression
+
+def test_evaluate_short_circuits():
+    assert parse_expression("A ∨ B").evaluate(A=True) is True
+    assert parse_expression("A ∧ B").evaluate(A=False) is False
+    assert parse_expression("A → B").evaluate(A=False) is True
+
+def test_deep_left_associative_chain():
+    names = [f"x{i}" for i in range(DEPTH)]
+    expression = parse_expression(" ∧ ".join(names))
+    assert expression.evaluate(**dict.fromkeys(names, True)) is True
+    assert expression.compile(names)((True,) * DEPTH) is True
+    assert expression.compile(names)((True,) * (DEPTH - 1) + (False,)) is False
+    _, full = column_masks(2)
+    assert expression.bitmask(dict.fromkeys(names, full), full) == full
+    assert str(expression).count("∧") == DEPTH - 1
+
+def test_deep_negation_chain():
+    expression = parse_expression("¬" * DEPTH + "A")
+    assert expression.evaluate(A=True) is True
+    assert str(expression) == "¬" * DEPTH + "A"
+
+def test_deep_formula_entry_points():
+    names = [f"x{i}" for i in range(2000)]
+    assert evaluate_expression(" ∧ ".join(names), dict.fromkeys(names, True)) is True
+    model = find_model(" ∨ ".join(names), method="enumerate")
+    assert isinstance(model, dict) and any(model.values())
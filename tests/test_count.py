@@ -0,0 +1,47 @@
+import itertools
+import random
+
+from BTTH2_logicAI_bai5 import count_models
+from BTTH2_logicAI_count import LEAF_VARIABLES, ModelCounter
+
+def brute_force(clauses, num_vars):
+    return sum(all(any((lit > 0) == row[abs(lit) - 1] for lit in clause) for clause in clauses)
+               for row in itertools.product([False, True], repeat=num_vars))
+
+def random_cnf(rng, num_vars, num_clauses, width=3):
+    return [tuple(rng.choice([-1, 1]) * rng.randint(1, num_vars) for _ in range(width))
+            for _ in range(num_clauses)]
+
+def test_matches_brute_force():
+    rng = random.Random(17)
+    for _ in range(300):
+        num_vars = rng.randint(1, 12)
+        clauses = random_cnf(rng, num_vars, rng.randint(0, 40), rng.randint(1, 4))
+        assert ModelCounter().count(clauses, num_vars) == brute_force(clauses, num_vars)
+
+def test_edge_cases():
+    assert ModelCounter().count([], 0) == 1
+    assert ModelCounter().count([], 5) == 32
+    assert ModelCounter().count([()], 3) == 0
+    assert ModelCounter().count([(1, -1)], 2) == 4
+    assert ModelCounter().count([(1,), (-1,)], 1) == 0
+    assert count_models("⊤") == 1 and count_models("⊥") == 0
+
+def test_branching_above_leaf_size():
+    # Chuỗi vượt ngưỡng bảng chân trị: buộc phải rẽ nhánh thay vì đếm thẳng bằng bảng chân trị
+    n = LEAF_VARIABLES + 6
+    clauses = [(-i, i + 1) for i in range(1, n)]
+    counter = ModelCounter()
+    assert counter.count(clauses, n) == n + 1
+    assert counter.decisions > 0
+
+def test_deep_formulas_do_not_recurse():
+    n = 3000
+    assert count_models(" ∨ ".join(f"X{i}" for i in range(n))) == 2 ** n - 1
+    assert count_models(" ∧ ".join(f"(X{i} → X{i + 1})" for i in range(n))) == n + 2
+
+def test_chain_splits_in_the_middle():
+    n = 800
+    counter = ModelCounter()
+    assert counter.count([(-i, i + 1) for i in range(1, n)], n) == n + 1
+    assert counter.decisions < 100
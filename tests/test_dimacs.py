@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai4 import prove_by_truth_table
+from BTTH2_logicAI_bai5 import count_models
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_count import ModelCounter
+from BTTH2_logicAI_dimacs import (export_entailment, export_formula, main, names_from_comments, read_dimacs,
+                                  solve_dimacs, write_dimacs)
+
+from test_core import random_formula
+from test_count import brute_force, random_cnf
+
+def satisfies(model, clauses):
+    return all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+@pytest.mark.parametrize("suffix", [".cnf", ".cnf.gz", ".cnf.bz2", ".cnf.xz"])
+def test_round_trip(tmp_path, suffix):
+    rng = random.Random(6)
+    clauses = random_cnf(rng, 30, 120)
+    path = str(tmp_path / f"problem{suffix}")
+    write_dimacs(path, 32, clauses, ["tạo ngẫu nhiên"])
+    for chunk_size in (7, 1 << 20):
+        cnf = read_dimacs(path, chunk_size)
+        assert list(cnf.clauses()) == [list(clause) for clause in clauses]
+        assert cnf.num_vars == 32 and cnf.declared == (32, 120) and cnf.comments == ["tạo ngẫu nhiên"]
+
+def test_free_layout(tmp_path):
+    path = tmp_path / "satlib.cnf"
+    path.write_text("c chú thích\np cnf 3 3\n 1 -2\n 0 2 3 0\n-1\n-3 0\n%\n0\n", encoding="utf-8")
+    cnf = read_dimacs(str(path))
+    assert list(cnf.clauses()) == [[1, -2], [2, 3], [-1, -3]]
+    path.write_text("p cnf 2 1\n1 2", encoding="ascii")
+    assert list(read_dimacs(str(path)).clauses()) == [[1, 2]]
+    path.write_text("", encoding="ascii")
+    cnf = read_dimacs(str(path))
+    assert len(cnf) == 0 and cnf.num_vars == 0 and solve_dimacs(cnf) is not None
+    path.write_text("p dnf 2 1\n1 2 0\n", encoding="ascii")
+    with pytest.raises(ValueError):
+        read_dimacs(str(path))
+
+def test_solve_and_count(tmp_path):
+    rng = random.Random(9)
+    path = str(tmp_path / "problem.cnf")
+    for _ in range(40):
+        clauses = random_cnf(rng, 10, rng.randint(20, 60))
+        write_dimacs(path, 10, clauses)
+        cnf = read_dimacs(path)
+        models = brute_force(clauses, 10)
+        model = solve_dimacs(cnf)
+        assert (model is not None) == (models > 0)
+        if model is not None:
+            assert satisfies(model, clauses)
+        assert ModelCounter().count(cnf.clauses(), cnf.num_vars) == models
+
+def test_export(tmp_path):
+    rng = random.Random(13)
+    path = str(tmp_path / "formula.cnf")
+    for _ in range(40):
+        text = random_formula(rng, 3)
+        export_formula(text, path)
+        cnf = read_dimacs(path)
+        names = names_from_comments(cnf.comments)
+        model = solve_dimacs(cnf)
+        assert (model is not None) == (count_models(text) > 0)
+        projected = ModelCounter().count(cnf.clauses(), cnf.num_vars)
+        assert projected << (len(parse_expression(text).variables()) - len(names)) == count_models(text)
+
+        premises = [random_formula(rng, 2), random_formula(rng, 2)]
+        conclusion = random_formula(rng, 2)
+        export_entailment(premises, conclusion, path)
+        entailed = prove_by_truth_table(premises, conclusion) == "Đúng"
+        assert (solve_dimacs(read_dimacs(path)) is None) == entailed
+
+def test_command_line(tmp_path, capsys):
+    path = str(tmp_path / "formula.cnf")
+    assert main(["export", "(A ∨ B) ∧ ¬A", "-o", path]) == 0
+    assert main(["solve", path]) == 10
+    assert "s SATISFIABLE" in capsys.readouterr().out
+    assert main(["solve", path, "--count"]) == 0
+    assert "s mc 1" in capsys.readouterr().out
+    assert main(["entail", "A, A → B", "B", "-o", path]) == 0
+    assert main(["solve", path]) == 20
+    assert "s UNSATISFIABLE" in capsys.readouterr().out
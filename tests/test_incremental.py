@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai3 import check_formula
+from BTTH2_logicAI_incremental import IncrementalChecker
+
+from test_bai3 import random_formula
+
+def current_predicates(facts):
+    predicates = {name: (lambda *values, rows=rows: values in rows) for name, rows in facts.items()}
+    predicates["S"] = lambda a: a % 3 == 0
+    predicates["Q"] = lambda a, b: (a + b) % 2 == 0
+    return predicates
+
+def test_updates_match_full_evaluation():
+    rng = random.Random(31)
+    for _ in range(60):
+        text = random_formula(rng, 4, [])
+        domain = list(range(rng.randint(0, 4)))
+        facts = {"P": {(a,) for a in domain if rng.random() < 0.5},
+                 "Edge": {(a, b) for a in domain for b in domain if rng.random() < 0.3}}
+        checker = IncrementalChecker(text, domain, {"P": set(facts["P"]), "Edge": set(facts["Edge"]),
+                                                    "S": lambda a: a % 3 == 0,
+                                                    "Q": lambda a, b: (a + b) % 2 == 0})
+        assert checker.value == check_formula(text, domain, current_predicates(facts))
+        for _ in range(12):
+            action = rng.random()
+            element = rng.randint(0, 5)
+            if action < 0.25:
+                checker.add_element(element)
+                if element not in domain:
+                    domain.append(element)
+            elif action < 0.4:
+                checker.remove_element(element)
+                if element in domain:
+                    domain.remove(element)
+            else:
+                name = rng.choice(["P", "Edge"])
+                values = (element,) if name == "P" else (element, rng.randint(0, 5))
+                holds = rng.random() < 0.5
+                checker.set_fact(name, values, holds)
+                (facts[name].add if holds else facts[name].discard)(values)
+            assert checker.value == check_formula(text, domain, current_predicates(facts)), text
+
+def test_subscribers_see_changes():
+    checker = IncrementalChecker("∀x (P(x) → ∃y (Edge(x, y) ∧ P(y)))", [1, 2], {"P": {1}, "Edge": set()})
+    seen = []
+    checker.subscribe(seen.append)
+    assert checker.value is False
+    checker.add_fact("Edge", 1, 1)
+    checker.add_fact("Edge", 2, 2)
+    checker.remove_fact("P", 1)
+    checker.remove_element(1)
+    assert seen == [True]
+    assert checker.add_element(3) is True
+
+def test_errors():
+    with pytest.raises(ValueError):
+        IncrementalChecker("∀x Edge(x, y)", [1], {"Edge": set()})
+    checker = IncrementalChecker("∀x P(x)", [1], {"P": lambda a: True})
+    with pytest.raises(ValueError):
+        checker.set_fact("P", 1)
@@ -0,0 +1,41 @@
+from BTTH2_logicAI_bai3 import Relation, evaluate_formula
+from BTTH2_logicAI_bai4 import prove_by_truth_table
+from BTTH2_logicAI_bai5 import find_model
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_profile import Profiler
+
+def test_vector_mode_records_predicates():
+    domain = list(range(20))
+    predicates = {"P": lambda x: x % 2 == 0, "Q": lambda x, y: x < y,
+                  "Edge": Relation([[1, 2, 3], [2, 3, 4]])}
+    formula = "∃x ∃y (Edge(x, y) ∧ P(y)) ∧ ∀x (P(x) → ∃y Q(x, y))"
+    expected = evaluate_formula(formula, domain, predicates)
+    with Profiler() as profiler:
+        assert evaluate_formula(formula, domain, predicates, mode="vector") == expected
+    assert profiler.predicates["P"][0] >= len(domain)
+    assert profiler.predicates["Q"][0] > 0
+    assert profiler.predicates["Edge"][0] > 0
+    assert "VectorContext.semijoin" in profiler.operators or "VectorContext.matches" in profiler.operators
+
+def test_loop_mode_counts_each_call():
+    with Profiler() as profiler:
+        assert evaluate_formula("∀x P(x)", [1, 2, 3], {"P": lambda x: x > 0}) is True
+    assert profiler.predicates["P"][0] == 3
+
+def test_compiled_paths_are_traced():
+    expression = parse_expression("(A ∧ B) → C")
+    compiled = expression.compile(["A", "B", "C"])
+    with Profiler() as profiler:
+        assert prove_by_truth_table(["A", "A → B"], "B") == "Đúng"
+        assert find_model("A ∧ ¬B", method="enumerate") == {"A": True, "B": False}
+    assert profiler.operators["Implies.evaluate"][0] > 0
+    assert profiler.operators["And.evaluate"][0] > 0
+    assert expression.compile(["A", "B", "C"]) is compiled
+
+def test_cdcl_path_is_timed():
+    with Profiler() as profiler:
+        assert prove_by_truth_table(["A", "A → B"], "B", backend="sat") == "Đúng"
+        assert find_model("A ∧ ¬B") == {"A": True, "B": False}
+    assert profiler.operators["Solver.solve"][0] >= 2
+    assert profiler.operators["CNF.add"][0] > 0
+    assert "Solver.solve" in profiler.folded()
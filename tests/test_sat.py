@@ -0,0 +1,92 @@
+import itertools
+import random
+
+from BTTH2_logicAI_core import parse_expression
+from BTTH2_logicAI_sat import CNF, Solver
+
+from test_core import random_formula
+
+def random_clauses(rng, n, count):
+    return [[rng.choice([-1, 1]) * rng.randint(1, n) for _ in range(rng.randint(1, 3))] for _ in range(count)]
+
+def brute_force(clauses, n, assumptions=()):
+    for values in itertools.product([False, True], repeat=n):
+        model = (False,) + values
+        if all(model[abs(lit)] == (lit > 0) for lit in assumptions) and \
+                all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses):
+            return True
+    return False
+
+def satisfies(solver, clauses):
+    return all(any(solver.value(abs(lit)) == (lit > 0) for lit in clause) for clause in clauses)
+
+# Bồ câu i ở chuồng j là biến i * holes + j + 1
+def pigeonhole(holes):
+    var = lambda i, j: i * holes + j + 1
+    clauses = [[var(i, j) for j in range(holes)] for i in range(holes + 1)]
+    for j in range(holes):
+        clauses += [[-var(i, j), -var(other, j)] for i in range(holes + 1) for other in range(i + 1, holes + 1)]
+    return clauses
+
+def test_solver_matches_brute_force():
+    rng = random.Random(4)
+    for _ in range(300):
+        n = rng.randint(1, 8)
+        clauses = random_clauses(rng, n, rng.randint(1, 30))
+        assumptions = [rng.choice([-1, 1]) * rng.randint(1, n) for _ in range(rng.randint(0, 2))]
+        solver = Solver()
+        for clause in clauses:
+            solver.add_clause(clause)
+        status = solver.solve(assumptions)
+        assert status == brute_force(clauses, n, assumptions)
+        if status:
+            assert satisfies(solver, clauses + [[lit] for lit in assumptions])
+
+def test_incremental_clauses_between_solves():
+    rng = random.Random(5)
+    for _ in range(50):
+        n = rng.randint(3, 8)
+        solver = Solver()
+        clauses = []
+        for _ in range(6):
+            batch = random_clauses(rng, n, rng.randint(1, 6))
+            for clause in batch:
+                solver.add_clause(clause)
+            clauses += batch
+            status = solver.solve()
+            assert status == brute_force(clauses, n)
+            if not status:
+                break
+            assert satisfies(solver, clauses)
+
+def test_tseitin_encoding_is_equisatisfiable():
+    rng = random.Random(6)
+    for _ in range(200):
+        expression = parse_expression(random_formula(rng, 3))
+        variables = sorted(expression.variables())
+        cnf = CNF()
+        cnf.add(expression)
+        solver = Solver()
+        solver.add_cnf(cnf)
+        expected = any(expression.evaluate(**dict(zip(variables, values)))
+                       for values in itertools.product([False, True], repeat=len(variables)))
+        assert solver.solve() == expected
+        if expected:
+            assert expression.evaluate(**{name: solver.value(cnf.names[name]) for name in variables})
+
+def test_conflict_limit_then_unsatisfiable():
+    solver = Solver()
+    for clause in pigeonhole(7):
+        solver.add_clause(clause)
+    assert solver.solve(conflict_limit=10) is None
+    assert solver.solve() is False
+    assert solver.solve() is False
+
+def test_large_random_instance():
+    rng = random.Random(2)
+    clauses = [[rng.choice([-1, 1]) * v for v in rng.sample(range(1, 3001), 3)] for _ in range(10500)]
+    solver = Solver()
+    for clause in clauses:
+        solver.add_clause(clause)
+    assert solver.solve(conflict_limit=50000) is True
+    assert satisfies(solver, clauses)
@@ -0,0 +1,21 @@
+import asyncio
+import json
+
+from BTTH2_logicAI_server import LogicServer
+
+def test_server_reports_errors():
+    async def scenario():
+        server = LogicServer(workers=1, timeout=5)
+        try:
+            lines = [
+                {"id": 1, "task": "evaluate", "expression": "A ∧ B", "assignments": {"A": True, "B": True}},
+                {"id": 2, "task": "evaluate", "expression": "A ∧ B", "assignments": {"A": True}},
+                {"id": 3, "task": "find_model", "expression": "A ∧"},
+                {"id": 4, "task": "first_order", "formula": "P(x)", "domain": [1], "predicates": {}},
+            ]
+            return await asyncio.gather(*(server.handle(json.dumps(job, ensure_ascii=False)) for job in lines))
+        finally:
+            server.close()
+    outputs = [json.loads(text) for text in asyncio.run(scenario())]
+    assert [output["ok"] for output in outputs] == [True, False, False, False]
+    assert outputs[0]["result"] is True
@@ -0,0 +1,55 @@
+import logging
+import random
+
+import pytest
+
+from BTTH2_logicAI_bai2 import truth_table
+from BTTH2_logicAI_bai4 import prove_by_resolution, prove_by_truth_table
+from BTTH2_logicAI_bai5 import count_models, find_model, iter_models
+from BTTH2_logicAI_core import column_masks, parse_expression
+from BTTH2_logicAI_simplify import simplify
+
+from test_core import random_formula
+
+class ListSink:
+    def begin(self, variables):
+        self.blocks = []
+
+    def write_block(self, high_values, size, result):
+        self.blocks.append((high_values, size, result))
+
+    def end(self):
+        pass
+
+def test_simplify_preserves_truth_table():
+    rng = random.Random(5)
+    for _ in range(200):
+        expression = parse_expression(random_formula(rng, 5))
+        simplified = simplify(expression)
+        variables = sorted(expression.variables())
+        masks, full = column_masks(len(variables))
+        columns = dict(zip(variables, masks))
+        assert simplified.bitmask(columns, full) == expression.bitmask(columns, full)
+
+SIMPLIFY_CALLS = [
+    lambda: truth_table("(A ∧ A) ∨ ⊥", sink=ListSink(), simplify=True),
+    lambda: prove_by_truth_table(["A ∧ A"], "A ∨ ⊥", simplify=True),
+    lambda: prove_by_resolution(["A ∧ A"], "A ∨ ⊥", simplify=True),
+    lambda: find_model("(A ∧ A) ∨ ⊥", simplify=True),
+    lambda: find_model("(A ∧ A) ∨ ⊥", method="enumerate", simplify=True),
+    lambda: list(iter_models("(A ∧ A) ∨ ⊥", simplify=True)),
+    lambda: count_models("(A ∧ A) ∨ ⊥", simplify=True),
+]
+
+@pytest.mark.parametrize("call", SIMPLIFY_CALLS)
+def test_simplify_report_is_logged_not_printed(call, caplog, capsys):
+    with caplog.at_level(logging.INFO, logger="BTTH2_logicAI_simplify"):
+        call()
+    assert any("Rút gọn" in record.getMessage() for record in caplog.records)
+    assert capsys.readouterr().out == ""
+
+def test_simplified_answers():
+    assert prove_by_truth_table(["A ∧ A"], "A ∨ ⊥", simplify=True) == "Đúng"
+    assert prove_by_resolution(["A ∧ A"], "A ∨ ⊥", simplify=True) == "Đúng"
+    assert find_model("(A ∧ A) ∨ ⊥", simplify=True) == {"A": True}
+    assert count_models("(A ∧ B) ∨ (A ∧ ¬B)", simplify=True) == 2